@@ -6,4 +6,5 @@ class AnalyticsConfig(AppConfig):
     verbose_name = 'Analytics'
     
     def ready(self):
-        import analytics.dash_apps.dash_apps
\ No newline at end of file
+        import analytics.dash_apps.dash_apps
+        import analytics.signals.signals  # noqa: F401
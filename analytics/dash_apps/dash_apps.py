@@ -1,5 +1,5 @@
+import logging
 import dash
-import uuid
 from dash import dcc, html, Input, Output
 import plotly.express as px
 import plotly.graph_objects as go
@@ -12,6 +12,9 @@ from ..services.analytics_service import MarketAnalyticsService
 
 from microservices.models import MicroService
 from mentorship_session.models import MentorshipSession
+from core.repositories.generic_relations import load_generic_objects
+
+logger = logging.getLogger(__name__)
 
 # Repositories and service
 micro_repo = MicroServiceRepository()
@@ -34,342 +37,270 @@ app.layout = html.Div([
     html.Div(id="tab-content", style={'margin': '20px'})
 ])
 
-def safe_get_object_name(model_class, object_id, default_name="Unknown"):
-    try:
-        # Make sure object_id is a valid UUID
-        if not isinstance(object_id, uuid.UUID):
-            object_id = uuid.UUID(str(object_id))
-        
-        obj = model_class.objects.get(pk=object_id)
-        
-        if model_class == MicroService:
-            return obj.title 
+
+def get_object_names(model_class, object_ids, default_name="Unknown"):
+    """Names for a column of object ids, fetched with one query."""
+    objects = load_generic_objects(model_class, object_ids)
+    names = []
+    for object_id in object_ids:
+        try:
+            obj = objects.get(model_class._meta.pk.to_python(object_id))
+        except Exception:
+            obj = None
+        if obj is None:
+            names.append(f"{default_name} (ID: {object_id})")
+        elif model_class == MicroService:
+            names.append(obj.title)
         elif model_class == MentorshipSession:
-            return obj.topic
+            names.append(obj.topic)
         else:
-            return default_name
-    except model_class.DoesNotExist:
-        return f"{default_name} (ID: {object_id})"
-    except Exception as e:
-        return f"Error (ID: {object_id})"
+            names.append(default_name)
+    return names
 
-# Callback
-@app.callback(
-    Output("tab-content", "children"),
-    Input("tabs", "value")
-)
-def render_content(tab):
-    try:
-        # Get updated data each time
-        dashboard_data = analytics_service.get_dashboard_data()
-        
-        # DEBUG: Print all dashboard data
-        print("=== DEBUG: DASHBOARD DATA ===")
-        print(f"Complete dashboard data: {dashboard_data}")
-        print("=" * 50)
 
-        # -------------------- Categories --------------------
-        if tab == "categories":
-            category_data = dashboard_data["category_distribution"]["data"]
-            print(f"DEBUG - Categories - Raw data: {category_data}")
-            print(f"DEBUG - Categories - Data type: {type(category_data)}")
-            print(f"DEBUG - Categories - Length: {len(category_data) if category_data else 0}")
-            
-            if not category_data:
-                print("DEBUG - Categories - No data to show")
-                return html.Div([
-                    html.H3("Distribution by Categories"),
-                    html.P("No category data to display.", 
-                          style={'textAlign': 'center', 'color': 'gray'})
-                ])
-            
-            df = pd.DataFrame(category_data)
-            print(f"DEBUG - Categories - DataFrame created: {df}")
-            print(f"DEBUG - Categories - DataFrame columns: {df.columns.tolist()}")
-            
-            fig = px.pie(
-                df, 
-                names="category", 
-                values="count",
-                title="Distribution of Microservices by Category",
-                hole=0.3  # Donut chart
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            return html.Div([
-                dcc.Graph(figure=fig, style={'height': '500px'})
-            ])
+def empty_figure(title, text, font_size=14, height=None):
+    """Placeholder figure shown when a chart has no data."""
+    fig = go.Figure()
+    fig.add_annotation(
+        text=text,
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, xanchor='center', yanchor='middle',
+        showarrow=False, font=dict(size=font_size)
+    )
+    fig.update_layout(
+        title=title,
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        **({'height': height} if height else {})
+    )
+    return fig
+
+
+# -------------------- Categories --------------------
+def render_categories(section):
+    category_data = section["data"]
+    if not category_data:
+        return html.Div([
+            html.H3("Distribution by Categories"),
+            html.P("No category data to display.", 
+                  style={'textAlign': 'center', 'color': 'gray'})
+        ])
+    
+    df = pd.DataFrame(category_data)
+    fig = px.pie(
+        df, 
+        names="category", 
+        values="count",
+        title="Distribution of Microservices by Category",
+        hole=0.3  # Donut chart
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return html.Div([
+        dcc.Graph(figure=fig, style={'height': '500px'})
+    ])
+
 
-        # -------------------- Prices --------------------
-        elif tab == "prices":
-            price_data = dashboard_data["price_analysis"]["data"]
-            print(f"DEBUG - Prices - Raw data: {price_data}")
-            print(f"DEBUG - Prices - Data type: {type(price_data)}")
-            print(f"DEBUG - Prices - Length: {len(price_data) if price_data else 0}")
-            
-            if not price_data:
-                print("DEBUG - Prices - No data to show")
-                return html.Div([
-                    html.H3("Price Analysis"),
-                    html.P("No price data to display.", 
-                          style={'textAlign': 'center', 'color': 'gray'})
-                ])
-            
-            df = pd.DataFrame(price_data)
-            print(f"DEBUG - Prices - DataFrame created: {df}")
-            print(f"DEBUG - Prices - DataFrame columns: {df.columns.tolist()}")
-            
-            # Bar chart for average prices
-            fig1 = px.bar(
-                df, 
-                x="category", 
-                y="avg_price",
-                title="Average Price by Category",
-                labels={'avg_price': 'Average Price ($)', 'category': 'Category'}
-            )
-            fig1.update_layout(xaxis_tickangle=-45)
-            
-            # Price range chart
-            fig2 = go.Figure()
-            for _, row in df.iterrows():
-                fig2.add_trace(go.Scatter(
-                    x=[row['category'], row['category']],
-                    y=[row['min_price'], row['max_price']],
-                    mode='lines+markers',
-                    name=f"{row['category']} (range)",
-                    line=dict(width=4),
-                    marker=dict(size=8)
-                ))
-            
-            fig2.update_layout(
-                title="Price Range by Category",
-                xaxis_title="Category",
-                yaxis_title="Price ($)",
-                xaxis_tickangle=-45
-            )
-            
-            return html.Div([
-                dcc.Graph(figure=fig1, style={'height': '400px'}),
-                dcc.Graph(figure=fig2, style={'height': '400px'})
-            ])
+# -------------------- Prices --------------------
+def render_prices(section):
+    price_data = section["data"]
+    if not price_data:
+        return html.Div([
+            html.H3("Price Analysis"),
+            html.P("No price data to display.", 
+                  style={'textAlign': 'center', 'color': 'gray'})
+        ])
+    
+    df = pd.DataFrame(price_data)
+    
+    # Bar chart for average prices
+    fig1 = px.bar(
+        df, 
+        x="category", 
+        y="avg_price",
+        title="Average Price by Category",
+        labels={'avg_price': 'Average Price ($)', 'category': 'Category'}
+    )
+    fig1.update_layout(xaxis_tickangle=-45)
+    
+    # Price range chart
+    fig2 = go.Figure()
+    for _, row in df.iterrows():
+        fig2.add_trace(go.Scatter(
+            x=[row['category'], row['category']],
+            y=[row['min_price'], row['max_price']],
+            mode='lines+markers',
+            name=f"{row['category']} (range)",
+            line=dict(width=4),
+            marker=dict(size=8)
+        ))
+    
+    fig2.update_layout(
+        title="Price Range by Category",
+        xaxis_title="Category",
+        yaxis_title="Price ($)",
+        xaxis_tickangle=-45
+    )
+    
+    return html.Div([
+        dcc.Graph(figure=fig1, style={'height': '400px'}),
+        dcc.Graph(figure=fig2, style={'height': '400px'})
+    ])
+
+
+# -------------------- Freelancers --------------------
+def render_freelancers(section):
+    freelancers_data = section["data"]
+    if not freelancers_data:
+        return html.Div([
+            html.H3("Top Freelancers"),
+            html.P("No freelancer data to display.", 
+                  style={'textAlign': 'center', 'color': 'gray'})
+        ])
+    
+    df = pd.DataFrame(freelancers_data)
+    fig = px.bar(
+        df, 
+        x="freelancer_id", 
+        y="active_services",
+        title="Top Freelancers by Active Services",
+        labels={'active_services': 'Active Services', 'freelancer_id': 'Freelancer'}
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return html.Div([
+        dcc.Graph(figure=fig, style={'height': '500px'})
+    ])
 
-        # -------------------- Freelancers --------------------
-        elif tab == "freelancers":
-            freelancers_data = dashboard_data["top_freelancers"]["data"]
-            print(f"DEBUG - Freelancers - Raw data: {freelancers_data}")
-            print(f"DEBUG - Freelancers - Data type: {type(freelancers_data)}")
-            print(f"DEBUG - Freelancers - Length: {len(freelancers_data) if freelancers_data else 0}")
-            
-            if not freelancers_data:
-                print("DEBUG - Freelancers - No data to show")
-                return html.Div([
-                    html.H3("Top Freelancers"),
-                    html.P("No freelancer data to display.", 
-                          style={'textAlign': 'center', 'color': 'gray'})
-                ])
-            
-            df = pd.DataFrame(freelancers_data)
-            print(f"DEBUG - Freelancers - DataFrame created: {df}")
-            print(f"DEBUG - Freelancers - DataFrame columns: {df.columns.tolist()}")
-            
-            fig = px.bar(
-                df, 
-                x="freelancer_id", 
-                y="active_services",
-                title="Top Freelancers by Active Services",
-                labels={'active_services': 'Active Services', 'freelancer_id': 'Freelancer'}
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            return html.Div([
-                dcc.Graph(figure=fig, style={'height': '500px'})
-            ])
 
-        # -------------------- Delivery Time --------------------
-        elif tab == "delivery":
-            delivery_stats = dashboard_data["delivery_time_stats"]
-            general = delivery_stats["general"]
-            by_category = delivery_stats["by_category"]
-            
-            print(f"DEBUG - Delivery - General stats: {general}")
-            print(f"DEBUG - Delivery - By category: {by_category}")
-            print(f"DEBUG - Delivery - General type: {type(general)}")
-            print(f"DEBUG - Delivery - By category type: {type(by_category)}")
-            print(f"DEBUG - Delivery - By category length: {len(by_category) if by_category else 0}")
-            
-            if not by_category:
-                print("DEBUG - Delivery - No category data to show")
-                fig = go.Figure()
-                fig.add_annotation(
-                    text="No delivery time data available",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                    showarrow=False, font=dict(size=16)
-                )
-                fig.update_layout(
-                    title="Average Delivery Time by Category",
-                    xaxis=dict(visible=False),
-                    yaxis=dict(visible=False)
-                )
-            else:
-                df = pd.DataFrame(by_category)
-                print(f"DEBUG - Delivery - DataFrame created: {df}")
-                print(f"DEBUG - Delivery - DataFrame columns: {df.columns.tolist()}")
-                
-                fig = px.bar(
-                    df, 
-                    x="name", 
-                    y="avg_delivery_time",
-                    title="Average Delivery Time by Category",
-                    labels={'avg_delivery_time': 'Average days', 'name': 'Category'}
-                )
-                fig.update_layout(xaxis_tickangle=-45)
-            
-            stats_cards = html.Div([
-                html.Div([
-                    html.H4("📊 General Statistics", style={'textAlign': 'center'}),
-                    html.Div([
-                        html.Div([
-                            html.H5("Average", style={'margin': '0', 'color': '#007bff'}),
-                            html.P(f"{general.get('avg_days', 0)} days", 
-                                  style={'fontSize': '24px', 'margin': '5px 0', 'fontWeight': 'bold'})
-                        ], style={'textAlign': 'center', 'padding': '15px', 'backgroundColor': '#f8f9fa', 'border-radius': '8px', 'margin': '5px'}),
-                        
-                        html.Div([
-                            html.H5("Minimum", style={'margin': '0', 'color': '#28a745'}),
-                            html.P(f"{general.get('min_days', 0)} days", 
-                                  style={'fontSize': '24px', 'margin': '5px 0', 'fontWeight': 'bold'})
-                        ], style={'textAlign': 'center', 'padding': '15px', 'backgroundColor': '#f8f9fa', 'border-radius': '8px', 'margin': '5px'}),
-                        
-                        html.Div([
-                            html.H5("Maximum", style={'margin': '0', 'color': '#dc3545'}),
-                            html.P(f"{general.get('max_days', 0)} days", 
-                                  style={'fontSize': '24px', 'margin': '5px 0', 'fontWeight': 'bold'})
-                        ], style={'textAlign': 'center', 'padding': '15px', 'backgroundColor': '#f8f9fa', 'border-radius': '8px', 'margin': '5px'})
-                    ], style={'display': 'flex', 'justifyContent': 'space-around', 'flexWrap': 'wrap'})
-                ], style={'margin': '20px 0', 'padding': '20px', 'border': '1px solid #dee2e6', 'border-radius': '10px'})
-            ])
-            
-            return html.Div([
-                dcc.Graph(figure=fig, style={'height': '400px'}),
-                stats_cards
-            ])
+# -------------------- Delivery Time --------------------
+def stat_card(label, color, value):
+    return html.Div([
+        html.H5(label, style={'margin': '0', 'color': color}),
+        html.P(f"{value} days", 
+              style={'fontSize': '24px', 'margin': '5px 0', 'fontWeight': 'bold'})
+    ], style={
+        'textAlign': 'center',
+        'padding': '15px',
+        'backgroundColor': '#f8f9fa',
+        'border-radius': '8px',
+        'margin': '5px',
+    })
 
-        # -------------------- Popular Products --------------------
-        elif tab == "products":
-            popular_data = dashboard_data["popular_products"]
-            micro_list = popular_data["microservices"]
-            mentorships_list = popular_data["mentorships"]
 
-            print(f"DEBUG - Products - Complete popular data: {popular_data}")
-            print(f"DEBUG - Products - Microservices: {micro_list}")
-            print(f"DEBUG - Products - Mentorships: {mentorships_list}")
-            print(f"DEBUG - Products - Microservices type: {type(micro_list)}")
-            print(f"DEBUG - Products - Mentorships type: {type(mentorships_list)}")
-            print(f"DEBUG - Products - Microservices length: {len(micro_list) if micro_list else 0}")
-            print(f"DEBUG - Products - Mentorships length: {len(mentorships_list) if mentorships_list else 0}")
+def render_delivery(section):
+    general = section["general"]
+    by_category = section["by_category"]
+    
+    if not by_category:
+        fig = empty_figure(
+            "Average Delivery Time by Category",
+            "No delivery time data available",
+            font_size=16
+        )
+    else:
+        df = pd.DataFrame(by_category)
+        fig = px.bar(
+            df, 
+            x="name", 
+            y="avg_delivery_time",
+            title="Average Delivery Time by Category",
+            labels={'avg_delivery_time': 'Average days', 'name': 'Category'}
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+    
+    stats_cards = html.Div([
+        html.Div([
+            html.H4("📊 General Statistics", style={'textAlign': 'center'}),
+            html.Div([
+                stat_card("Average", '#007bff', general.get('avg_days', 0)),
+                stat_card("Minimum", '#28a745', general.get('min_days', 0)),
+                stat_card("Maximum", '#dc3545', general.get('max_days', 0)),
+            ], style={
+                'display': 'flex',
+                'justifyContent': 'space-around',
+                'flexWrap': 'wrap',
+            })
+        ], style={
+            'margin': '20px 0',
+            'padding': '20px',
+            'border': '1px solid #dee2e6',
+            'border-radius': '10px',
+        })
+    ])
+    
+    return html.Div([
+        dcc.Graph(figure=fig, style={'height': '400px'}),
+        stats_cards
+    ])
 
-            # Convert to DataFrame and map names
-            micro_df = pd.DataFrame(micro_list) if micro_list else pd.DataFrame()
-            mentorships_df = pd.DataFrame(mentorships_list) if mentorships_list else pd.DataFrame()
 
-            print(f"DEBUG - Products - Microservices DataFrame: {micro_df}")
-            print(f"DEBUG - Products - Mentorships DataFrame: {mentorships_df}")
+# -------------------- Popular Products --------------------
+def product_figure(rows, model_class, label):
+    """Top 10 bar chart of cart additions for one product type."""
+    plural = f"{label}s"
+    if not rows:
+        return empty_figure(
+            f"Most Added {plural} to Cart",
+            f"No {plural.lower()} added to cart",
+            height=300
+        )
+    
+    df = pd.DataFrame(rows)
+    # Map object_id to name with one query
+    df['name'] = get_object_names(model_class, df['object_id'].tolist(), label)
+    # Limit to top 10 and sort
+    df = df.nlargest(10, 'times_added')
+    return px.bar(
+        df, 
+        x='times_added', 
+        y='name', 
+        orientation='h',
+        title=f"Top 10 Most Added {plural} to Cart",
+        labels={'times_added': 'Times Added', 'name': label}
+    )
 
-            # Map object_id to name safely
-            if not micro_df.empty:
-                print(f"DEBUG - Products - Microservices columns: {micro_df.columns.tolist()}")
-                micro_df['name'] = micro_df['object_id'].apply(
-                    lambda id: safe_get_object_name(MicroService, id, "Microservice")
-                )
-                print(f"DEBUG - Products - Microservices DataFrame with names: {micro_df}")
-                
-            if not mentorships_df.empty:
-                print(f"DEBUG - Products - Mentorships columns: {mentorships_df.columns.tolist()}")
-                mentorships_df['name'] = mentorships_df['object_id'].apply(
-                    lambda id: safe_get_object_name(MentorshipSession, id, "Mentorship")
-                )
-                print(f"DEBUG - Products - Mentorships DataFrame with names: {mentorships_df}")
 
-            # Create figures
-            if micro_df.empty:
-                print("DEBUG - Products - No microservices to show")
-                fig1 = go.Figure()
-                fig1.add_annotation(
-                    text="No microservices added to cart",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                    showarrow=False, font=dict(size=14)
-                )
-                fig1.update_layout(
-                    title="Most Added Microservices to Cart",
-                    xaxis=dict(visible=False),
-                    yaxis=dict(visible=False),
-                    height=300
-                )
-            else:
-                # Limit to top 10 and sort
-                micro_df = micro_df.nlargest(10, 'times_added')
-                print(f"DEBUG - Products - Top 10 microservices: {micro_df}")
-                fig1 = px.bar(
-                    micro_df, 
-                    x='times_added', 
-                    y='name', 
-                    orientation='h',
-                    title="Top 10 Most Added Microservices to Cart",
-                    labels={'times_added': 'Times Added', 'name': 'Microservice'}
-                )
+def render_products(section):
+    fig1 = product_figure(section["microservices"], MicroService, "Microservice")
+    fig2 = product_figure(section["mentorships"], MentorshipSession, "Mentorship")
+    return html.Div([
+        dcc.Graph(figure=fig1, style={'height': '400px'}),
+        html.Hr(),
+        dcc.Graph(figure=fig2, style={'height': '400px'})
+    ])
 
-            if mentorships_df.empty:
-                print("DEBUG - Products - No mentorships to show")
-                fig2 = go.Figure()
-                fig2.add_annotation(
-                    text="No mentorships added to cart",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                    showarrow=False, font=dict(size=14)
-                )
-                fig2.update_layout(
-                    title="Most Added Mentorships to Cart",
-                    xaxis=dict(visible=False),
-                    yaxis=dict(visible=False),
-                    height=300
-                )
-            else:
-                # Limit to top 10 and sort
-                mentorships_df = mentorships_df.nlargest(10, 'times_added')
-                print(f"DEBUG - Products - Top 10 mentorships: {mentorships_df}")
-                fig2 = px.bar(
-                    mentorships_df, 
-                    x='times_added', 
-                    y='name', 
-                    orientation='h',
-                    title="Top 10 Most Added Mentorships to Cart",
-                    labels={'times_added': 'Times Added', 'name': 'Mentorship'}
-                )
 
-            return html.Div([
-                dcc.Graph(figure=fig1, style={'height': '400px'}),
-                html.Hr(),
-                dcc.Graph(figure=fig2, style={'height': '400px'})
-            ])
+# Tab value -> (service section, renderer)
+TABS = {
+    "categories": ("category_distribution", render_categories),
+    "prices": ("price_analysis", render_prices),
+    "freelancers": ("top_freelancers", render_freelancers),
+    "delivery": ("delivery_time_stats", render_delivery),
+    "products": ("popular_products", render_products),
+}
 
-        # Default tab
-        print("DEBUG - Default tab selected")
+
+# Callback
+@app.callback(
+    Output("tab-content", "children"),
+    Input("tabs", "value")
+)
+def render_content(tab):
+    if tab not in TABS:
         return html.Div([
             html.H3("Welcome to the Dashboard"),
             html.P("Select a tab to view marketplace analytics.", 
                   style={'textAlign': 'center', 'fontSize': '16px', 'color': 'gray'})
         ])
-        
+
+    section_name, render = TABS[tab]
+    try:
+        # Only the active tab's section is computed; it is cached per section
+        return render(analytics_service.get_section(section_name))
     except Exception as e:
-        # Global error handling with more information
-        print(f"DEBUG - GLOBAL ERROR: {str(e)}")
-        print(f"DEBUG - ERROR TYPE: {type(e)}")
-        import traceback
-        print(f"DEBUG - TRACEBACK: {traceback.format_exc()}")
-        
+        logger.exception(f"Error rendering dashboard tab {tab}")
         return html.Div([
             html.H3("Error loading data", style={'color': 'red'}),
             html.P(f"An error occurred: {str(e)}", style={'color': 'red'}),
             html.P("Please check the database configuration and repositories."),
             html.P(f"Error type: {type(e).__name__}", style={'fontSize': '12px', 'color': 'gray'})
-        ])
\ No newline at end of file
+        ])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from analytics.services.rollup_service import RollupService
+
+
+class Command(BaseCommand):
+    help = "Recompute the analytics rollup tables from microservices and cart items"
+
+    def handle(self, *args, **options):
+        counts = RollupService().rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt rollups: "
+                + ", ".join(f"{count} {name}" for name, count in counts.items())
+            )
+        )
@@ -0,0 +1,171 @@
+# Generated by Django 5.2.6 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0011_user_cart_version"),
+        (
+            "microservices",
+            "0006_alter_category_options_alter_microservice_options_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryRollup",
+            fields=[
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rollup",
+                        serialize=False,
+                        to="microservices.category",
+                        verbose_name="Category",
+                    ),
+                ),
+                (
+                    "active_count",
+                    models.IntegerField(default=0, verbose_name="Active services"),
+                ),
+                (
+                    "price_sum",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        max_digits=14,
+                        verbose_name="Price sum",
+                    ),
+                ),
+                (
+                    "price_min",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Minimum price",
+                    ),
+                ),
+                (
+                    "price_max",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Maximum price",
+                    ),
+                ),
+                (
+                    "delivery_time_sum",
+                    models.BigIntegerField(default=0, verbose_name="Delivery time sum"),
+                ),
+                (
+                    "delivery_time_min",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Minimum delivery time"
+                    ),
+                ),
+                (
+                    "delivery_time_max",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Maximum delivery time"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Category rollup",
+                "verbose_name_plural": "Category rollups",
+            },
+        ),
+        migrations.CreateModel(
+            name="FreelancerRollup",
+            fields=[
+                (
+                    "freelancer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rollup",
+                        serialize=False,
+                        to="core.freelancerprofile",
+                        verbose_name="Freelancer",
+                    ),
+                ),
+                (
+                    "active_count",
+                    models.IntegerField(default=0, verbose_name="Active services"),
+                ),
+                (
+                    "total_count",
+                    models.IntegerField(default=0, verbose_name="Total services"),
+                ),
+            ],
+            options={
+                "verbose_name": "Freelancer rollup",
+                "verbose_name_plural": "Freelancer rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["-active_count"], name="analytics_f_active__c8ec17_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="CartItemRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.UUIDField(verbose_name="object id")),
+                (
+                    "times_added",
+                    models.IntegerField(default=0, verbose_name="Times added"),
+                ),
+                (
+                    "total_quantity",
+                    models.IntegerField(default=0, verbose_name="Total quantity"),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="content type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cart item rollup",
+                "verbose_name_plural": "Cart item rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "-times_added"],
+                        name="analytics_c_content_bcb0da_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id"),
+                        name="unique_cart_item_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
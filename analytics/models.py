@@ -1,3 +1,106 @@
+from decimal import Decimal
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils.translation import gettext_lazy as _
+from core.models import FreelancerProfile
+from microservices.models import Category
 
-# Create your models here.
+
+class CategoryRollup(models.Model):
+    """
+    Running totals of the active microservices in one category.
+
+    Counts and sums are kept with F() deltas from model signals; minimum
+    and maximum are recomputed for the category when its services change.
+    """
+
+    category = models.OneToOneField(
+        Category,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="rollup",
+        verbose_name=_("Category")
+    )
+    active_count = models.IntegerField(default=0, verbose_name=_("Active services"))
+    price_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name=_("Price sum"),
+    )
+    price_min = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Minimum price"),
+    )
+    price_max = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Maximum price"),
+    )
+    delivery_time_sum = models.BigIntegerField(
+        default=0, verbose_name=_("Delivery time sum")
+    )
+    delivery_time_min = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name=_("Minimum delivery time")
+    )
+    delivery_time_max = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name=_("Maximum delivery time")
+    )
+
+    class Meta:
+        verbose_name = _("Category rollup")
+        verbose_name_plural = _("Category rollups")
+
+    def __str__(self) -> str:
+        return f"{self.category_id}: {self.active_count} active"
+
+
+class FreelancerRollup(models.Model):
+    """Microservice counts of one freelancer."""
+
+    freelancer = models.OneToOneField(
+        FreelancerProfile,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="rollup",
+        verbose_name=_("Freelancer")
+    )
+    active_count = models.IntegerField(default=0, verbose_name=_("Active services"))
+    total_count = models.IntegerField(default=0, verbose_name=_("Total services"))
+
+    class Meta:
+        verbose_name = _("Freelancer rollup")
+        verbose_name_plural = _("Freelancer rollups")
+        indexes = [models.Index(fields=["-active_count"])]
+
+    def __str__(self) -> str:
+        return f"{self.freelancer_id}: {self.active_count}/{self.total_count}"
+
+
+class CartItemRollup(models.Model):
+    """How many carts hold one purchasable, and in what total quantity."""
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, verbose_name=_("content type")
+    )
+    object_id = models.UUIDField(verbose_name=_("object id"))
+    times_added = models.IntegerField(default=0, verbose_name=_("Times added"))
+    total_quantity = models.IntegerField(default=0, verbose_name=_("Total quantity"))
+
+    class Meta:
+        verbose_name = _("Cart item rollup")
+        verbose_name_plural = _("Cart item rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"], name="unique_cart_item_rollup"
+            )
+        ]
+        indexes = [models.Index(fields=["content_type", "-times_added"])]
+
+    def __str__(self) -> str:
+        return f"{self.content_type_id}/{self.object_id}: {self.times_added}"
@@ -1,8 +1,8 @@
-from django.db.models import Count, Q
 from django.db.models.query import QuerySet
 from django.contrib.contenttypes.models import ContentType
 from typing import List, Dict, Any
 from cart.models import CartItem
+from ..models import CartItemRollup
 from .base_repository import BaseRepository
 from microservices.models import MicroService
 from mentorship_session.models import MentorshipSession
@@ -11,31 +11,19 @@ class CartRepository(BaseRepository):
         return CartItem.objects.all()
     
     def get_most_added_products(self, limit: int = 10) -> List[Dict[str, Any]]:
-        microservice_content_type = ContentType.objects.get_for_model(MicroService)
-        microservices_in_cart = (
-            CartItem.objects
-            .filter(content_type=microservice_content_type)
-            .values('object_id', 'content_type')
-            .annotate(
-                times_added=Count('id'),
-                total_quantity=Count('quantity')
-            )
-            .order_by('-times_added')[:limit]
+        content_types = ContentType.objects.get_for_models(
+            MicroService, MentorshipSession
         )
         
-        mentorship_content_type = ContentType.objects.get_for_model(MentorshipSession)
-        mentorships_in_cart = (
-            CartItem.objects
-            .filter(content_type=mentorship_content_type)
-            .values('object_id', 'content_type')
-            .annotate(
-                times_added=Count('id'),
-                total_quantity=Count('quantity')
+        def most_added(model):
+            return list(
+                CartItemRollup.objects
+                .filter(content_type=content_types[model], times_added__gt=0)
+                .values('object_id', 'content_type', 'times_added', 'total_quantity')
+                .order_by('-times_added')[:limit]
             )
-            .order_by('-times_added')[:limit]
-        )
         
         return {
-            'microservices': list(microservices_in_cart),
-            'mentorships': list(mentorships_in_cart)
-        }
\ No newline at end of file
+            'microservices': most_added(MicroService),
+            'mentorships': most_added(MentorshipSession)
+        }
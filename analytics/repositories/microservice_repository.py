@@ -1,81 +1,153 @@
-from django.db.models import Count, Avg, Q, Min, Max
+from django.db import connections
+from django.db.models import (
+    DecimalField, ExpressionWrapper, F, FloatField, Max, Min, Sum, Window
+)
 from django.db.models.query import QuerySet
 from typing import List, Dict, Any
-from microservices.models import MicroService, Category
+from microservices.models import MicroService
+from ..models import CategoryRollup, FreelancerRollup
 from .base_repository import BaseRepository
 
+PRICE = DecimalField(max_digits=10, decimal_places=2)
+
 class MicroServiceRepository(BaseRepository):
+    """
+    Dashboard aggregates, read from the rollup tables kept by
+    RollupService, so each query is O(categories) or O(freelancers).
+    The category-level sections all come from get_catalog_stats.
+    """
+
     def get_all(self) -> QuerySet:
         return MicroService.objects.filter(is_active=True)
     
-    def get_distribution_by_category(self) -> List[Dict[str, Any]]:
-        return (
-            Category.objects
+    def get_catalog_stats(self) -> Dict[str, Any]:
+        """
+        Distribution, price and delivery stats for every category in one
+        query. Catalog-wide totals come from window aggregates over the same
+        rows; backends without OVER support get them summed in Python.
+        """
+        rollups = (
+            CategoryRollup.objects
+            .filter(active_count__gt=0)
             .annotate(
-                total_services=Count('microservices', filter=Q(microservices__is_active=True)),
-                percentage=Count('microservices', filter=Q(microservices__is_active=True)) * 100.0 / 
-                          MicroService.objects.filter(is_active=True).count()
+                name=F('category__name'),
+                avg_price=ExpressionWrapper(
+                    F('price_sum') / F('active_count'), output_field=PRICE
+                ),
+                avg_delivery_time=ExpressionWrapper(
+                    F('delivery_time_sum') * 1.0 / F('active_count'),
+                    output_field=FloatField()
+                ),
             )
-            .values('name', 'total_services', 'percentage')
-            .order_by('-total_services')
         )
+        fields = [
+            'name', 'active_count', 'avg_price', 'price_min', 'price_max',
+            'avg_delivery_time', 'delivery_time_sum', 'delivery_time_min',
+            'delivery_time_max',
+        ]
+        windowed = connections[rollups.db].features.supports_over_clause
+        if windowed:
+            rollups = rollups.annotate(
+                total_services=Window(Sum('active_count')),
+                total_delivery_time=Window(Sum('delivery_time_sum')),
+                min_delivery_time=Window(Min('delivery_time_min')),
+                max_delivery_time=Window(Max('delivery_time_max')),
+            )
+            fields += [
+                'total_services', 'total_delivery_time',
+                'min_delivery_time', 'max_delivery_time',
+            ]
+        rows = list(rollups.values(*fields).order_by('-active_count'))
+
+        if not rows:
+            totals = {
+                'total_services': 0, 'total_delivery_time': 0,
+                'min_delivery_time': None, 'max_delivery_time': None,
+            }
+        elif windowed:
+            totals = {key: rows[0][key] for key in fields[-4:]}
+        else:
+            totals = {
+                'total_services': sum(row['active_count'] for row in rows),
+                'total_delivery_time': sum(row['delivery_time_sum'] for row in rows),
+                'min_delivery_time': min(row['delivery_time_min'] for row in rows),
+                'max_delivery_time': max(row['delivery_time_max'] for row in rows),
+            }
+
+        total = totals['total_services']
+        categories = [
+            {
+                'name': row['name'],
+                'service_count': row['active_count'],
+                'percentage': row['active_count'] * 100.0 / total,
+                'avg_price': row['avg_price'],
+                'min_price': row['price_min'],
+                'max_price': row['price_max'],
+                'avg_delivery_time': row['avg_delivery_time'],
+            }
+            for row in rows
+        ]
+        return {
+            'categories': categories,
+            'general': {
+                'avg_delivery_time': (
+                    totals['total_delivery_time'] / total if total else None
+                ),
+                'min_delivery_time': totals['min_delivery_time'],
+                'max_delivery_time': totals['max_delivery_time'],
+            },
+        }
+
+    def get_distribution_by_category(self) -> List[Dict[str, Any]]:
+        return self.distribution_by_category(self.get_catalog_stats())
     
     def get_price_distribution_by_category(self) -> List[Dict[str, Any]]:
-        return (
-            Category.objects
-            .filter(microservices__is_active=True)
-            .annotate(
-                avg_price=Avg('microservices__price'),
-                min_price=Min('microservices__price'),
-                max_price=Max('microservices__price'),
-                service_count=Count('microservices', filter=Q(microservices__is_active=True))
-            )
-            .values('name', 'avg_price', 'min_price', 'max_price', 'service_count')
-            .order_by('-avg_price')
-        )
+        return self.price_distribution_by_category(self.get_catalog_stats())
     
     def get_delivery_time_stats(self) -> Dict[str, Any]:
-        general_stats = (
-            MicroService.objects
-            .filter(is_active=True)
-            .aggregate(
-                avg_delivery_time=Avg('delivery_time'),
-                min_delivery_time=Min('delivery_time'),
-                max_delivery_time=Max('delivery_time')
-            )
-        )
+        return self.delivery_time_stats(self.get_catalog_stats())
 
-        category_stats = (
-            Category.objects
-            .filter(microservices__is_active=True)
-            .annotate(
-                avg_delivery_time=Avg('microservices__delivery_time'),
-                service_count=Count('microservices', filter=Q(microservices__is_active=True))
-            )
-            .values('name', 'avg_delivery_time', 'service_count')
-            .order_by('avg_delivery_time')
+    # The helpers below slice one get_catalog_stats() result into the
+    # shapes of the individual getters without querying again.
+
+    @staticmethod
+    def distribution_by_category(stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'name': row['name'],
+                'total_services': row['service_count'],
+                'percentage': row['percentage'],
+            }
+            for row in stats['categories']
+        ]
+
+    @staticmethod
+    def price_distribution_by_category(stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        fields = ('name', 'avg_price', 'min_price', 'max_price', 'service_count')
+        rows = [{key: row[key] for key in fields} for row in stats['categories']]
+        return sorted(rows, key=lambda row: row['avg_price'], reverse=True)
+
+    @staticmethod
+    def delivery_time_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+        fields = ('name', 'avg_delivery_time', 'service_count')
+        category_stats = sorted(
+            ({key: row[key] for key in fields} for row in stats['categories']),
+            key=lambda row: row['avg_delivery_time'],
         )
-        
         return {
-            'general': general_stats,
-            'by_category': list(category_stats)
+            'general': stats['general'],
+            'by_category': category_stats
         }
     
     def get_most_active_freelancers(self, limit: int = 10) -> List[Dict[str, Any]]:
-        from django.db.models import Count
-        from core.models import FreelancerProfile
-        
         return (
-            FreelancerProfile.objects
+            FreelancerRollup.objects
+            .filter(active_count__gt=0)
             .annotate(
-                active_services_count=Count('microservices', filter=Q(microservices__is_active=True)),
-                total_services_count=Count('microservices')
-            )
-            .filter(active_services_count__gt=0)
-            .values(
-                'id',  # Solo el ID para anonimidad
-                'active_services_count',
-                'total_services_count'
+                id=F('freelancer_id'),  # Solo el ID para anonimidad
+                active_services_count=F('active_count'),
+                total_services_count=F('total_count')
             )
+            .values('id', 'active_services_count', 'total_services_count')
             .order_by('-active_services_count')[:limit]
-        )
\ No newline at end of file
+        )
@@ -1,5 +1,7 @@
 from typing import Dict, List, Any
 from abc import ABC, abstractmethod
+from django.conf import settings
+from .section_cache import SectionCache
 
 class AnalyticsServiceInterface(ABC):
     @abstractmethod
@@ -7,21 +9,75 @@ class AnalyticsServiceInterface(ABC):
         pass
 
 class MarketAnalyticsService(AnalyticsServiceInterface):
-    def __init__(self, microservice_repository, cart_repository):
+    """
+    Market dashboard data, one section per tab.
+
+    Each section is computed on its own and kept in a TTL cache
+    (ANALYTICS_CACHE_TTL seconds) with single-flight recomputation, so
+    switching tabs reads cached results and only the requested section's
+    aggregates ever run. The category, price and delivery sections share
+    one cached get_catalog_stats() result, so refreshing all three costs a
+    single query.
+    """
+
+    SECTIONS = (
+        'category_distribution',
+        'price_analysis',
+        'delivery_time_stats',
+        'top_freelancers',
+        'popular_products',
+    )
+    CATALOG_SECTIONS = (
+        'category_distribution', 'price_analysis', 'delivery_time_stats'
+    )
+
+    def __init__(
+        self, microservice_repository, cart_repository, cache: SectionCache = None
+    ):
         self.microservice_repository = microservice_repository
         self.cart_repository = cart_repository
+        self.cache = cache or SectionCache(
+            ttl=getattr(settings, 'ANALYTICS_CACHE_TTL', 60)
+        )
     
     def get_dashboard_data(self) -> Dict[str, Any]:
-        return {
-            'category_distribution': self._get_category_distribution(),
-            'price_analysis': self._get_price_analysis(),
-            'delivery_time_stats': self._get_delivery_time_stats(),
-            'top_freelancers': self._get_top_freelancers(),
-            'popular_products': self._get_popular_products()
-        }
+        return {name: self.get_section(name) for name in self.SECTIONS}
+
+    def get_section(self, name: str) -> Dict[str, Any]:
+        if name not in self.SECTIONS:
+            raise KeyError(name)
+        return self.cache.get_or_compute(name, getattr(self, f'_get_{name}'))
+
+    def get_category_distribution(self) -> Dict[str, Any]:
+        return self.get_section('category_distribution')
+
+    def get_price_analysis(self) -> Dict[str, Any]:
+        return self.get_section('price_analysis')
+
+    def get_delivery_time_stats(self) -> Dict[str, Any]:
+        return self.get_section('delivery_time_stats')
+
+    def get_top_freelancers(self) -> Dict[str, Any]:
+        return self.get_section('top_freelancers')
+
+    def get_popular_products(self) -> Dict[str, Any]:
+        return self.get_section('popular_products')
+
+    def invalidate(self, name: str = None) -> None:
+        """Forget one cached section, or all of them."""
+        self.cache.invalidate(name)
+        if name in self.CATALOG_SECTIONS:
+            self.cache.invalidate('catalog_stats')
+
+    def _catalog_stats(self) -> Dict[str, Any]:
+        return self.cache.get_or_compute(
+            'catalog_stats', self.microservice_repository.get_catalog_stats
+        )
     
     def _get_category_distribution(self) -> Dict[str, Any]:
-        raw_data = self.microservice_repository.get_distribution_by_category()
+        raw_data = self.microservice_repository.distribution_by_category(
+            self._catalog_stats()
+        )
         processed_data = []
         for item in raw_data:
             if item['total_services'] > 0:
@@ -38,7 +94,9 @@ class MarketAnalyticsService(AnalyticsServiceInterface):
         }
     
     def _get_price_analysis(self) -> Dict[str, Any]:
-        raw_data = self.microservice_repository.get_price_distribution_by_category()
+        raw_data = self.microservice_repository.price_distribution_by_category(
+            self._catalog_stats()
+        )
         
         processed_data = []
         for item in raw_data:
@@ -58,7 +116,9 @@ class MarketAnalyticsService(AnalyticsServiceInterface):
     
     def _get_delivery_time_stats(self) -> Dict[str, Any]:
         """Procesa estadísticas de tiempo de entrega"""
-        raw_data = self.microservice_repository.get_delivery_time_stats()
+        raw_data = self.microservice_repository.delivery_time_stats(
+            self._catalog_stats()
+        )
         
         return {
             'general': {
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from cart.models import CartItem
+from core.models import FreelancerProfile
+from microservices.models import MicroService
+from ..models import CartItemRollup, CategoryRollup, FreelancerRollup
+
+# Fields of a MicroService that feed the rollups
+SNAPSHOT_FIELDS = (
+    "category_id",
+    "freelancer_id",
+    "price",
+    "delivery_time",
+    "is_active",
+)
+
+
+class RollupService:
+    """
+    Keeps the analytics rollup tables in step with microservices and cart
+    items.
+
+    Writes apply the difference between a row's old and new contribution
+    as F() deltas, so concurrent updates never overwrite each other; only
+    category minimum/maximum values are recomputed, for the categories a
+    change touched. rebuild() recomputes every table from scratch.
+    """
+
+    # -------------------- MicroService --------------------
+    @staticmethod
+    def snapshot(service: MicroService) -> Dict[str, object]:
+        return {field: getattr(service, field) for field in SNAPSHOT_FIELDS}
+
+    def microservice_changed(
+        self, old: Optional[Dict[str, object]], new: Optional[Dict[str, object]]
+    ) -> None:
+        """Apply a microservice insert (old None), update, or delete (new None)."""
+        category_deltas = defaultdict(lambda: defaultdict(int))
+        freelancer_deltas = defaultdict(lambda: defaultdict(int))
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            freelancer = freelancer_deltas[state["freelancer_id"]]
+            freelancer["total_count"] += sign
+            if state["is_active"]:
+                freelancer["active_count"] += sign
+                category = category_deltas[state["category_id"]]
+                category["active_count"] += sign
+                category["price_sum"] += sign * (state["price"] or Decimal("0"))
+                category["delivery_time_sum"] += sign * (state["delivery_time"] or 0)
+
+        for freelancer_id, deltas in freelancer_deltas.items():
+            _apply_deltas(FreelancerRollup, {"freelancer_id": freelancer_id}, deltas)
+        touched = [
+            category_id
+            for category_id, deltas in category_deltas.items()
+            if _apply_deltas(CategoryRollup, {"category_id": category_id}, deltas)
+        ]
+        # A price or delivery time change keeps the counts but moves the bounds
+        if old and new and old["is_active"] and new["is_active"]:
+            touched.append(new["category_id"])
+        self.refresh_bounds(touched)
+
+    def refresh_bounds(self, category_ids: Iterable) -> None:
+        """Recompute min/max price and delivery time of the given categories."""
+        category_ids = set(category_ids)
+        if not category_ids:
+            return
+        bounds = {
+            row["category_id"]: row
+            for row in MicroService.objects.filter(
+                category_id__in=category_ids, is_active=True
+            )
+            .values("category_id")
+            .annotate(
+                price_min=Min("price"),
+                price_max=Max("price"),
+                delivery_time_min=Min("delivery_time"),
+                delivery_time_max=Max("delivery_time"),
+            )
+        }
+        empty = dict.fromkeys(
+            ("price_min", "price_max", "delivery_time_min", "delivery_time_max")
+        )
+        for category_id in category_ids:
+            row = bounds.get(category_id, empty)
+            CategoryRollup.objects.filter(category_id=category_id).update(
+                price_min=row["price_min"],
+                price_max=row["price_max"],
+                delivery_time_min=row["delivery_time_min"],
+                delivery_time_max=row["delivery_time_max"],
+            )
+
+    # -------------------- Cart --------------------
+    def cart_changed(self, deltas: Dict[Tuple[int, object], Tuple[int, int]]) -> None:
+        """Apply (rows_added, quantity_added) per (content_type_id, object_id)."""
+        for (content_type_id, object_id), (rows, quantity) in deltas.items():
+            _apply_deltas(
+                CartItemRollup,
+                {"content_type_id": content_type_id, "object_id": object_id},
+                {"times_added": rows, "total_quantity": quantity},
+            )
+
+    # -------------------- Rebuild --------------------
+    @transaction.atomic
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every rollup table from the source rows."""
+        active = Q(microservices__is_active=True)
+        CategoryRollup.objects.all().delete()
+        categories = CategoryRollup.objects.bulk_create(
+            CategoryRollup(
+                category_id=row["category_id"],
+                active_count=row["active_count"],
+                price_sum=row["price_sum"] or Decimal("0.00"),
+                price_min=row["price_min"],
+                price_max=row["price_max"],
+                delivery_time_sum=row["delivery_time_sum"] or 0,
+                delivery_time_min=row["delivery_time_min"],
+                delivery_time_max=row["delivery_time_max"],
+            )
+            for row in MicroService.objects.filter(is_active=True)
+            .values("category_id")
+            .annotate(
+                active_count=Count("id"),
+                price_sum=Sum("price"),
+                price_min=Min("price"),
+                price_max=Max("price"),
+                delivery_time_sum=Sum("delivery_time"),
+                delivery_time_min=Min("delivery_time"),
+                delivery_time_max=Max("delivery_time"),
+            )
+        )
+
+        FreelancerRollup.objects.all().delete()
+        freelancers = FreelancerRollup.objects.bulk_create(
+            FreelancerRollup(
+                freelancer_id=row["id"],
+                active_count=row["active_count"],
+                total_count=row["total_count"],
+            )
+            for row in FreelancerProfile.objects.annotate(
+                active_count=Count("microservices", filter=active),
+                total_count=Count("microservices"),
+            )
+            .filter(total_count__gt=0)
+            .values("id", "active_count", "total_count")
+        )
+
+        CartItemRollup.objects.all().delete()
+        cart_items = CartItemRollup.objects.bulk_create(
+            CartItemRollup(**row)
+            for row in CartItem.objects.values("content_type_id", "object_id").annotate(
+                times_added=Count("id"), total_quantity=Sum("quantity")
+            )
+        )
+        return {
+            "categories": len(categories),
+            "freelancers": len(freelancers),
+            "cart_items": len(cart_items),
+        }
+
+
+def _apply_deltas(model, key: Dict[str, object], deltas: Dict[str, object]) -> bool:
+    """Add deltas to the row identified by key, creating it if missing."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return False
+    rows = model.objects.filter(**key)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if rows.update(**updates):
+        return True
+    if any(delta < 0 for delta in deltas.values()):
+        # Nothing to take away from: the row was never built or is being deleted
+        return False
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        # Created concurrently
+        rows.update(**updates)
+    return True
@@ -0,0 +1,41 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+from cachetools import TTLCache
+
+
+class SectionCache:
+    """
+    Process-local TTL cache for dashboard sections with single-flight
+    recomputation: when an entry is missing or expired, one caller computes
+    it while concurrent callers for the same key wait for that result
+    instead of running the same aggregates again.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 64):
+        self._values = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another caller may have filled the entry while we waited
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            value = compute()
+            with self._lock:
+                self._values[key] = value
+            return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
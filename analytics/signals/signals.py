@@ -0,0 +1,68 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from analytics.services.rollup_service import SNAPSHOT_FIELDS, RollupService
+from cart.models import CartItem
+from cart.signals.events import cart_items_changed
+from microservices.models import MicroService
+
+rollups = RollupService()
+
+
+@receiver(pre_save, sender=MicroService)
+def microservice_before_save(sender, instance, **kwargs):
+    # Remember the stored state so post_save can apply the difference
+    instance._rollup_old = None
+    if not instance._state.adding:
+        instance._rollup_old = (
+            MicroService.objects.filter(pk=instance.pk).values(*SNAPSHOT_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=MicroService)
+def microservice_saved(sender, instance, **kwargs):
+    rollups.microservice_changed(
+        getattr(instance, "_rollup_old", None), RollupService.snapshot(instance)
+    )
+
+
+@receiver(post_delete, sender=MicroService)
+def microservice_deleted(sender, instance, **kwargs):
+    rollups.microservice_changed(RollupService.snapshot(instance), None)
+
+
+@receiver(pre_save, sender=CartItem)
+def cart_item_before_save(sender, instance, **kwargs):
+    instance._rollup_quantity = None
+    if not instance._state.adding:
+        instance._rollup_quantity = (
+            CartItem.objects.filter(pk=instance.pk)
+            .values_list("quantity", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=CartItem)
+def cart_item_saved(sender, instance, created, **kwargs):
+    old_quantity = getattr(instance, "_rollup_quantity", None)
+    quantity = instance.quantity
+    if not isinstance(quantity, int):
+        # Saved with an F() expression: read the stored result
+        instance.refresh_from_db(fields=["quantity"])
+        quantity = instance.quantity
+    if old_quantity is None:
+        delta = (1, quantity)
+    else:
+        delta = (0, quantity - old_quantity)
+    rollups.cart_changed({(instance.content_type_id, instance.object_id): delta})
+
+
+@receiver(post_delete, sender=CartItem)
+def cart_item_deleted(sender, instance, **kwargs):
+    rollups.cart_changed(
+        {(instance.content_type_id, instance.object_id): (-1, -instance.quantity)}
+    )
+
+
+@receiver(cart_items_changed)
+def cart_items_bulk_changed(sender, deltas, **kwargs):
+    rollups.cart_changed(deltas)
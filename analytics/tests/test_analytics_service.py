@@ -0,0 +1,141 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+from django.test import SimpleTestCase
+from analytics.dash_apps import dash_apps
+from analytics.repositories.microservice_repository import MicroServiceRepository
+from analytics.services.analytics_service import MarketAnalyticsService
+from analytics.services.section_cache import SectionCache
+
+
+class MarketAnalyticsServiceTest(SimpleTestCase):
+    """Tests for per-section, cached dashboard data"""
+
+    def setUp(self):
+        """Service over mocked repositories"""
+        self.micro_repo = Mock()
+        self.micro_repo.get_catalog_stats.return_value = {
+            'categories': [{
+                'name': 'Design', 'service_count': 2, 'percentage': 100.0,
+                'avg_price': 15, 'min_price': 10, 'max_price': 20,
+                'avg_delivery_time': 3.0,
+            }],
+            'general': {
+                'avg_delivery_time': 3.0, 'min_delivery_time': 2, 'max_delivery_time': 4
+            },
+        }
+        for helper in (
+            'distribution_by_category',
+            'price_distribution_by_category',
+            'delivery_time_stats',
+        ):
+            setattr(self.micro_repo, helper, getattr(MicroServiceRepository, helper))
+        self.cart_repo = Mock()
+        self.cart_repo.get_most_added_products.return_value = {
+            'microservices': [], 'mentorships': []
+        }
+        self.service = MarketAnalyticsService(
+            self.micro_repo, self.cart_repo, cache=SectionCache(ttl=60)
+        )
+
+    def test_section_only_runs_its_own_aggregates(self):
+        """Test that one section does not touch the other repositories"""
+        # Act
+        section = self.service.get_category_distribution()
+
+        # Assert
+        self.assertEqual(section['data'][0]['category'], 'Design')
+        self.micro_repo.get_most_active_freelancers.assert_not_called()
+        self.cart_repo.get_most_added_products.assert_not_called()
+
+    def test_catalog_sections_share_one_query(self):
+        """Test that category, price and delivery reuse one catalog stats call"""
+        # Act
+        self.service.get_category_distribution()
+        prices = self.service.get_price_analysis()
+        delivery = self.service.get_delivery_time_stats()
+
+        # Assert
+        self.micro_repo.get_catalog_stats.assert_called_once()
+        self.assertEqual(prices['data'][0]['avg_price'], 15.0)
+        self.assertEqual(delivery['general']['max_days'], 4)
+
+    def test_invalidating_a_catalog_section_refreshes_stats(self):
+        """Test that invalidating one catalog section recomputes the shared stats"""
+        # Arrange
+        self.service.get_price_analysis()
+
+        # Act
+        self.service.invalidate('price_analysis')
+        self.service.get_price_analysis()
+
+        # Assert
+        self.assertEqual(self.micro_repo.get_catalog_stats.call_count, 2)
+
+    def test_repeated_reads_are_cache_hits(self):
+        """Test that a section is computed once until invalidated"""
+        # Act
+        self.service.get_popular_products()
+        self.service.get_popular_products()
+        self.service.invalidate('popular_products')
+        self.service.get_popular_products()
+
+        # Assert
+        self.assertEqual(self.cart_repo.get_most_added_products.call_count, 2)
+
+    def test_unknown_section_is_rejected(self):
+        """Test that only declared sections can be requested"""
+        # Act / Assert
+        with self.assertRaises(KeyError):
+            self.service.get_section('invalidate')
+
+
+class SectionCacheTest(SimpleTestCase):
+    """Tests for the single-flight section cache"""
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent callers share one computation"""
+        # Arrange
+        cache = SectionCache(ttl=60)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute('k', compute))
+            )
+            for _ in range(5)
+        ]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+
+class RenderContentTest(SimpleTestCase):
+    """Tests for the dashboard tab callback"""
+
+    def test_only_active_tab_is_computed(self):
+        """Test that a tab click requests just its own section"""
+        # Arrange
+        service = Mock()
+        service.get_section.return_value = {'data': [], 'chart_type': 'bar'}
+
+        # Act
+        with patch.object(dash_apps, 'analytics_service', service):
+            dash_apps.render_content('freelancers')
+
+        # Assert
+        service.get_section.assert_called_once_with('top_freelancers')
+        service.get_dashboard_data.assert_not_called()
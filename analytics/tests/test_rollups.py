@@ -0,0 +1,221 @@
+from decimal import Decimal
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase
+from analytics.models import CartItemRollup, CategoryRollup, FreelancerRollup
+from analytics.repositories.cart_repository import CartRepository
+from analytics.repositories.microservice_repository import MicroServiceRepository
+from analytics.services.rollup_service import RollupService
+from cart.services.cart_service import CartService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+
+
+class RollupSignalsTest(TestCase):
+    """Tests for rollups maintained from model signals"""
+
+    def setUp(self):
+        """Two active microservices of one freelancer in one category"""
+        self.category = CategoryFactory()
+        self.freelancer = FreelancerProfileFactory()
+        self.cheap = self._service(price=Decimal("10.00"), delivery_time=2)
+        self.pricey = self._service(price=Decimal("30.00"), delivery_time=6)
+
+    def _service(self, **kwargs):
+        return MicroServiceFactory(
+            category=self.category,
+            freelancer=self.freelancer,
+            is_active=True,
+            image_path=None,
+            **kwargs,
+        )
+
+    def _category_rollup(self):
+        return CategoryRollup.objects.get(category=self.category)
+
+    def test_inserts_accumulate_counts_sums_and_bounds(self):
+        """Test that new services add to their category and freelancer"""
+        # Act
+        rollup = self._category_rollup()
+
+        # Assert
+        self.assertEqual(rollup.active_count, 2)
+        self.assertEqual(rollup.price_sum, Decimal("40.00"))
+        self.assertEqual((rollup.price_min, rollup.price_max), (10, 30))
+        self.assertEqual(rollup.delivery_time_sum, 8)
+        freelancer = FreelancerRollup.objects.get(freelancer=self.freelancer)
+        self.assertEqual((freelancer.active_count, freelancer.total_count), (2, 2))
+
+    def test_updates_apply_the_difference(self):
+        """Test that price changes and deactivation adjust the totals"""
+        # Act
+        self.cheap.price = Decimal("15.00")
+        self.cheap.save()
+        self.pricey.is_active = False
+        self.pricey.save()
+
+        # Assert
+        rollup = self._category_rollup()
+        self.assertEqual(rollup.active_count, 1)
+        self.assertEqual(rollup.price_sum, Decimal("15.00"))
+        self.assertEqual((rollup.price_min, rollup.price_max), (15, 15))
+        freelancer = FreelancerRollup.objects.get(freelancer=self.freelancer)
+        self.assertEqual((freelancer.active_count, freelancer.total_count), (1, 2))
+
+    def test_delete_removes_contribution(self):
+        """Test that deleting a service takes it out of the rollups"""
+        # Act
+        self.pricey.delete()
+
+        # Assert
+        rollup = self._category_rollup()
+        self.assertEqual(rollup.active_count, 1)
+        self.assertEqual(rollup.delivery_time_sum, 2)
+        self.assertEqual(rollup.delivery_time_max, 2)
+
+    def test_cart_writes_update_item_rollup(self):
+        """Test that single, repeated, bulk and removed cart adds are counted"""
+        # Arrange
+        cart = CartService()
+        first, second = UserFactory(), UserFactory()
+
+        # Act
+        cart.add_to_cart(first, self.cheap)
+        cart.add_to_cart(first, self.cheap, quantity=2)
+        cart.add_many(second, [(self.cheap, 1), (self.pricey, 4)])
+        cart.remove_from_cart(first, self.cheap)
+
+        # Assert
+        cheap = CartItemRollup.objects.get(object_id=self.cheap.id)
+        pricey = CartItemRollup.objects.get(object_id=self.pricey.id)
+        self.assertEqual((cheap.times_added, cheap.total_quantity), (1, 1))
+        self.assertEqual((pricey.times_added, pricey.total_quantity), (1, 4))
+
+    def test_rebuild_matches_incremental_state(self):
+        """Test that a rebuild reproduces the signal-maintained rollups"""
+        # Arrange
+        CartService().add_to_cart(UserFactory(), self.pricey, quantity=3)
+        self.cheap.is_active = False
+        self.cheap.save()
+        before = (
+            list(CategoryRollup.objects.values()),
+            list(FreelancerRollup.objects.values()),
+            list(
+                CartItemRollup.objects.values(
+                    "object_id", "times_added", "total_quantity"
+                )
+            ),
+        )
+
+        # Act
+        RollupService().rebuild()
+
+        # Assert
+        after = (
+            list(CategoryRollup.objects.values()),
+            list(FreelancerRollup.objects.values()),
+            list(
+                CartItemRollup.objects.values(
+                    "object_id", "times_added", "total_quantity"
+                )
+            ),
+        )
+        self.assertEqual(after, before)
+
+
+class RollupRepositoryTest(TestCase):
+    """Tests for dashboard reads served from the rollup tables"""
+
+    def setUp(self):
+        """Active and inactive services across one category"""
+        self.category = CategoryFactory()
+        freelancer = FreelancerProfileFactory()
+        for price, delivery_time, active in (
+            (10, 2, True),
+            (20, 4, True),
+            (99, 9, False),
+        ):
+            MicroServiceFactory(
+                category=self.category,
+                freelancer=freelancer,
+                price=Decimal(price),
+                delivery_time=delivery_time,
+                is_active=active,
+                image_path=None,
+            )
+        self.repository = MicroServiceRepository()
+
+    def test_price_distribution_counts_active_services(self):
+        """Test that averages and bounds ignore inactive services"""
+        # Act
+        rows = list(self.repository.get_price_distribution_by_category())
+
+        # Assert
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["name"], self.category.name)
+        self.assertEqual(float(rows[0]["avg_price"]), 15.0)
+        self.assertEqual((rows[0]["min_price"], rows[0]["max_price"]), (10, 20))
+        self.assertEqual(rows[0]["service_count"], 2)
+
+    def test_delivery_and_distribution_shapes(self):
+        """Test that delivery stats and distribution keep their keys"""
+        # Act
+        delivery = self.repository.get_delivery_time_stats()
+        distribution = self.repository.get_distribution_by_category()
+        freelancers = list(self.repository.get_most_active_freelancers())
+
+        # Assert
+        self.assertEqual(delivery["general"]["avg_delivery_time"], 3.0)
+        self.assertEqual(delivery["by_category"][0]["avg_delivery_time"], 3.0)
+        self.assertEqual(distribution[0]["percentage"], 100.0)
+        self.assertEqual(freelancers[0]["active_services_count"], 2)
+        self.assertEqual(freelancers[0]["total_services_count"], 3)
+        self.assertEqual(
+            CartRepository().get_most_added_products()["microservices"], []
+        )
+
+    def test_catalog_stats_run_in_one_query(self):
+        """Test that distribution, prices and delivery come from one query"""
+        # Arrange
+        other = CategoryFactory(name=f"{self.category.name} extra")
+        MicroServiceFactory(
+            category=other,
+            freelancer=FreelancerProfileFactory(),
+            price=Decimal(30),
+            delivery_time=8,
+            image_path=None,
+        )
+
+        # Act
+        with self.assertNumQueries(1):
+            stats = self.repository.get_catalog_stats()
+
+        # Assert
+        self.assertEqual(
+            [row["percentage"] for row in stats["categories"]],
+            [200 / 3, 100 / 3],
+        )
+        self.assertEqual(
+            stats["general"],
+            {
+                "avg_delivery_time": 14 / 3,
+                "min_delivery_time": 2,
+                "max_delivery_time": 8,
+            },
+        )
+
+    def test_catalog_stats_without_window_support(self):
+        """Test that the Python fallback matches the windowed totals"""
+        # Arrange
+        windowed = self.repository.get_catalog_stats()
+
+        # Act
+        with patch.object(
+            connection.features, "supports_over_clause", False
+        ), self.assertNumQueries(1):
+            fallback = self.repository.get_catalog_stats()
+
+        # Assert
+        self.assertEqual(fallback, windowed)
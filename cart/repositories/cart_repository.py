@@ -1,8 +1,12 @@
 # cart/repositories/cart_repository.py
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
 from core.repositories.base_repository import BaseRepository
 from cart.models import CartItem
+from cart.signals.events import cart_items_changed
+from .lookups import ObjectKey, keys_q
 
 
 class CartRepository(BaseRepository):
@@ -38,3 +42,69 @@ class CartRepository(BaseRepository):
 
     def list_by_user(self, user) -> List[CartItem]:
         return list(CartItem.objects.filter(user=user))
+
+    def filter_by_keys(self, user, keys: Iterable[ObjectKey]) -> QuerySet:
+        return CartItem.objects.filter(keys_q(keys), user=user)
+
+    def increment(self, user, obj, quantity: int) -> CartItem:
+        """Atomically add quantity to the user's item for obj, creating it if needed."""
+        content_type = ContentType.objects.get_for_model(obj)
+        items = CartItem.objects.filter(
+            user=user, content_type=content_type, object_id=obj.pk
+        )
+        if not items.update(quantity=F("quantity") + quantity):
+            try:
+                with transaction.atomic():
+                    return CartItem.objects.create(
+                        user=user, content_object=obj, quantity=quantity
+                    )
+            except IntegrityError:
+                # A concurrent request inserted the row first
+                items.update(quantity=F("quantity") + quantity)
+        cart_items_changed.send(
+            sender=CartItem, deltas={(content_type.id, obj.pk): (0, quantity)}
+        )
+        return items.get()
+
+    def bulk_increment(self, user, quantities: Dict[ObjectKey, int]) -> int:
+        """
+        Add quantities to several items in one transaction: existing rows get
+        F() increments through one bulk_update, missing rows one bulk_create.
+        Returns the number of rows created.
+        """
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    pending = dict(quantities)
+                    existing = list(
+                        self.filter_by_keys(user, pending).select_for_update()
+                    )
+                    # Rollup deltas: (rows added, quantity added) per object
+                    deltas = {}
+                    for item in existing:
+                        key = (item.content_type_id, item.object_id)
+                        quantity = pending.pop(key)
+                        item.quantity = F("quantity") + quantity
+                        deltas[key] = (0, quantity)
+                    CartItem.objects.bulk_update(existing, ["quantity"])
+                    CartItem.objects.bulk_create(
+                        CartItem(
+                            user=user,
+                            content_type_id=content_type_id,
+                            object_id=object_id,
+                            quantity=quantity,
+                        )
+                        for (content_type_id, object_id), quantity in pending.items()
+                    )
+                    deltas.update(
+                        (key, (1, quantity)) for key, quantity in pending.items()
+                    )
+                    cart_items_changed.send(sender=CartItem, deltas=deltas)
+                    return len(pending)
+            except IntegrityError:
+                if attempt:
+                    raise
+
+    def delete_by_keys(self, user, keys: Iterable[ObjectKey]) -> int:
+        deleted, _ = self.filter_by_keys(user, keys).delete()
+        return deleted
@@ -0,0 +1,22 @@
+from collections import defaultdict
+from typing import Iterable
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from core.repositories.generic_relations import ObjectKey
+
+
+def object_key(obj) -> ObjectKey:
+    return ContentType.objects.get_for_model(obj).id, obj.pk
+
+
+def keys_q(keys: Iterable[ObjectKey]) -> Q:
+    """Match any of keys with one IN clause per content type."""
+    by_type = defaultdict(set)
+    for content_type_id, object_id in keys:
+        by_type[content_type_id].add(object_id)
+    if not by_type:
+        return Q(pk__in=[])
+    q = Q()
+    for content_type_id, object_ids in by_type.items():
+        q |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+    return q
@@ -1,7 +1,9 @@
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import QuerySet
 from core.repositories.base_repository import BaseRepository
 from cart.models import WishlistItem
+from .lookups import ObjectKey, keys_q
 
 
 class WishlistRepository(BaseRepository):
@@ -33,4 +35,16 @@ class WishlistRepository(BaseRepository):
         return item
 
     def list_by_user(self, user) -> List[WishlistItem]:
-        return list(WishlistItem.objects.filter(user=user))
+        # The template branches on item.content_type; load it with the rows
+        return list(
+            WishlistItem.objects.filter(user=user).select_related("content_type")
+        )
+
+    def filter_by_keys(self, user, keys: Iterable[ObjectKey] = None) -> QuerySet:
+        """Wishlist items of user, limited to keys when given."""
+        items = WishlistItem.objects.filter(user=user)
+        return items if keys is None else items.filter(keys_q(keys))
+
+    def delete_by_keys(self, user, keys: Iterable[ObjectKey]) -> int:
+        deleted, _ = self.filter_by_keys(user, keys).delete()
+        return deleted
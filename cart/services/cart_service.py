@@ -1,36 +1,103 @@
+from collections import Counter
+from typing import Iterable, Tuple
+from django.db import transaction
 from ..repositories.cart_repository import CartRepository
+from ..repositories.lookups import object_key
 from ..repositories.wishlist_repository import WishlistRepository
+from .counter_service import CartCounterService
 
 
 class CartService:
-    def __init__(self, cart_repository: CartRepository = None):
+    def __init__(
+        self,
+        cart_repository: CartRepository = None,
+        counter_service: CartCounterService = None,
+        wishlist_repository: WishlistRepository = None,
+    ):
         self.cart_repo = cart_repository or CartRepository()
+        self.counters = counter_service or CartCounterService()
+        self.wishlist_repo = wishlist_repository or WishlistRepository()
 
     def add_to_cart(self, user, obj, quantity=1):
-        item = self.cart_repo.get_or_create(user, obj, defaults={"quantity": 0})
-        item.quantity += quantity
-        self.cart_repo.update(item, quantity=item.quantity)
+        item = self.cart_repo.increment(user, obj, quantity)
+        self.counters.invalidate(user)
 
         return item
 
     def remove_from_cart(self, user, obj):
-        item = self.cart_repo.get_or_create(user, obj)
-        return self.cart_repo.delete(item)
+        deleted = self.cart_repo.delete_by_keys(user, [object_key(obj)])
+        self.counters.invalidate(user)
+        return bool(deleted)
+
+    def add_many(self, user, items: Iterable[Tuple[object, int]]) -> int:
+        """
+        Add (obj, quantity) pairs in one transaction; repeated objects are
+        summed. Returns the number of new cart rows.
+        """
+        quantities = Counter()
+        for obj, quantity in items:
+            quantities[object_key(obj)] += quantity
+        if not quantities:
+            return 0
+        created = self.cart_repo.bulk_increment(user, quantities)
+        self.counters.invalidate(user)
+        return created
+
+    def remove_many(self, user, objs: Iterable) -> int:
+        """Remove several objects from the cart with one DELETE."""
+        deleted = self.cart_repo.delete_by_keys(user, map(object_key, objs))
+        if deleted:
+            self.counters.invalidate(user)
+        return deleted
+
+    def move_wishlist_to_cart(self, user, objs: Iterable = None) -> int:
+        """
+        Move wishlisted objects (all of them when objs is None) to the cart.
+        Objects already in the cart keep their quantity. Returns the number
+        of items moved.
+        """
+        keys = None if objs is None else [object_key(obj) for obj in objs]
+        with transaction.atomic():
+            wishlist = self.wishlist_repo.filter_by_keys(user, keys)
+            moved = list(
+                wishlist.select_for_update().values_list("content_type_id", "object_id")
+            )
+            if not moved:
+                return 0
+            in_cart = set(
+                self.cart_repo.filter_by_keys(user, moved).values_list(
+                    "content_type_id", "object_id"
+                )
+            )
+            self.cart_repo.bulk_increment(
+                user, {key: 1 for key in moved if key not in in_cart}
+            )
+            self.wishlist_repo.delete_by_keys(user, moved)
+        self.counters.invalidate(user)
+        return len(moved)
 
     def list_cart(self, user):
         return self.cart_repo.list_by_user(user)
 
 
 class WishlistService:
-    def __init__(self, wishlist_repository: WishlistRepository = None):
+    def __init__(
+        self,
+        wishlist_repository: WishlistRepository = None,
+        counter_service: CartCounterService = None,
+    ):
         self.wishlist_repo = wishlist_repository or WishlistRepository()
+        self.counters = counter_service or CartCounterService()
 
     def add_to_wishlist(self, user, obj):
-        return self.wishlist_repo.get_or_create(user, obj)
+        item = self.wishlist_repo.get_or_create(user, obj)
+        self.counters.invalidate(user)
+        return item
 
     def remove_from_wishlist(self, user, obj):
-        item = self.wishlist_repo.get_or_create(user, obj)
-        return self.wishlist_repo.delete(item)
+        deleted = self.wishlist_repo.delete_by_keys(user, [object_key(obj)])
+        self.counters.invalidate(user)
+        return bool(deleted)
 
     def list_wishlist(self, user):
         return self.wishlist_repo.list_by_user(user)
@@ -0,0 +1,61 @@
+import time
+from typing import Dict, Iterable
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Sum
+from cart.models import CartItem, WishlistItem
+
+
+class CartCounterService:
+    """
+    Cart and wishlist badge counts cached in the user's session.
+
+    Every cart or wishlist change bumps User.cart_version. A cached entry is
+    only used while it matches the current version, so changes made in other
+    worker processes, or by cleanups affecting many users, are picked up on
+    the next request. Both the session and the user row are loaded by the
+    authentication middleware anyway, so a valid entry costs no queries.
+    """
+
+    SESSION_KEY = "cart_counts"
+
+    def get_counts(self, request) -> Dict[str, int]:
+        user = request.user
+        cached = request.session.get(self.SESSION_KEY)
+        max_age = getattr(settings, "CART_COUNTS_MAX_AGE", 300)
+        if (
+            cached
+            and cached["version"] == user.cart_version
+            and time.time() - cached["at"] < max_age
+        ):
+            return {"cart_count": cached["cart"], "wishlist_count": cached["wishlist"]}
+
+        counts = self.compute(user)
+        request.session[self.SESSION_KEY] = {
+            "version": user.cart_version,
+            "at": time.time(),
+            "cart": counts["cart_count"],
+            "wishlist": counts["wishlist_count"],
+        }
+        return counts
+
+    def compute(self, user) -> Dict[str, int]:
+        cart_count = (
+            CartItem.objects.filter(user=user).aggregate(total=Sum("quantity"))["total"]
+            or 0
+        )
+        wishlist_count = WishlistItem.objects.filter(user=user).count()
+        return {"cart_count": cart_count, "wishlist_count": wishlist_count}
+
+    def invalidate(self, user) -> None:
+        """Invalidate the cached counts of user after a change."""
+        self.invalidate_users([user.pk])
+        # Keep the in-memory user current for the rest of this request
+        user.cart_version += 1
+
+    def invalidate_users(self, user_ids: Iterable) -> None:
+        user_ids = set(user_ids)
+        if user_ids:
+            get_user_model().objects.filter(pk__in=user_ids).update(
+                cart_version=F("cart_version") + 1
+            )
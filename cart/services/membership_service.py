@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from ..repositories.cart_repository import CartRepository
+from ..repositories.lookups import ObjectKey, object_key
+from ..repositories.wishlist_repository import WishlistRepository
+
+
+@dataclass(frozen=True)
+class Membership:
+    cart_item_id: Optional[object] = None
+    wishlist_item_id: Optional[object] = None
+
+    @property
+    def in_cart(self) -> bool:
+        return self.cart_item_id is not None
+
+    @property
+    def in_wishlist(self) -> bool:
+        return self.wishlist_item_id is not None
+
+
+NOT_A_MEMBER = Membership()
+
+
+class CartMembershipService:
+    """
+    Answers "is this in the user's cart / wishlist?" for one object or a page
+    of objects with one indexed values_list query per table, using the
+    (user, content_type, object_id) unique constraints.
+    """
+
+    def __init__(
+        self,
+        cart_repository: CartRepository = None,
+        wishlist_repository: WishlistRepository = None,
+    ):
+        self.cart_repo = cart_repository or CartRepository()
+        self.wishlist_repo = wishlist_repository or WishlistRepository()
+
+    def lookup(self, user, objs: Iterable) -> Dict[ObjectKey, Membership]:
+        """Memberships of objs keyed by (content_type_id, object_id)."""
+        keys = {object_key(obj) for obj in objs}
+        if not keys or not user.is_authenticated:
+            return {}
+        fields = ("content_type_id", "object_id", "id")
+        cart = {
+            (ct, pk): item_id
+            for ct, pk, item_id in self.cart_repo.filter_by_keys(
+                user, keys
+            ).values_list(*fields)
+        }
+        wishlist = {
+            (ct, pk): item_id
+            for ct, pk, item_id in self.wishlist_repo.filter_by_keys(
+                user, keys
+            ).values_list(*fields)
+        }
+        return {
+            key: Membership(cart.get(key), wishlist.get(key))
+            for key in keys
+            if key in cart or key in wishlist
+        }
+
+    def for_object(self, user, obj) -> Membership:
+        return self.lookup(user, [obj]).get(object_key(obj), NOT_A_MEMBER)
+
+    def annotate(self, user, objs: Iterable) -> list:
+        """Set `membership` on each object for list templates; returns the list."""
+        objs = list(objs)
+        memberships = self.lookup(user, objs)
+        for obj in objs:
+            obj.membership = memberships.get(object_key(obj), NOT_A_MEMBER)
+        return objs
+
+    def context(self, user, obj) -> dict:
+        """Template context used by the purchasable detail pages."""
+        membership = self.for_object(user, obj)
+        return {
+            "cart_item_id": membership.cart_item_id,
+            "wishlist_item_id": membership.wishlist_item_id,
+            "in_cart": membership.in_cart,
+            "in_wishlist": membership.in_wishlist,
+        }
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    Case,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from cart.models import CartItem
+from core.repositories.generic_relations import GenericRelationLoader
+from mentorship_session.models import MentorshipSession
+from microservices.models import MicroService
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+@dataclass(frozen=True)
+class PurchasableType:
+    """How to price one purchasable model in SQL and what to load for display."""
+
+    model: type
+    price: object
+    select_related: Tuple[str, ...] = ()
+
+
+PURCHASABLE_TYPES = (
+    PurchasableType(MicroService, F("price"), ("freelancer__user",)),
+    PurchasableType(
+        MentorshipSession,
+        ExpressionWrapper(
+            F("duration_minutes") * Value(MentorshipSession.PRICE_PER_MINUTE),
+            output_field=MONEY,
+        ),
+        ("mentor__user",),
+    ),
+)
+
+
+@dataclass
+class PricedCart:
+    items: List[CartItem] = field(default_factory=list)
+    total_quantity: int = 0
+    total: Decimal = Decimal("0.00")
+
+
+class CartPricingService:
+    """
+    Prices cart items in the database.
+
+    Each item is annotated with `unit_price` (a per-type correlated subquery
+    selected by content type) and `line_total`, totals are one aggregate,
+    and the purchased objects are loaded with one query per type. Items
+    whose object no longer exists are left out.
+    """
+
+    def __init__(self, purchasable_types: Iterable[PurchasableType] = None):
+        self.types = tuple(purchasable_types or PURCHASABLE_TYPES)
+        self._content_types = ContentType.objects.get_for_models(
+            *(t.model for t in self.types)
+        )
+        self._loader = GenericRelationLoader(
+            {t.model: t.select_related for t in self.types}
+        )
+
+    def priced_items(self, user) -> QuerySet:
+        """Cart items of user annotated with unit_price and line_total."""
+        whens = [
+            When(
+                content_type_id=self._content_types[t.model].id,
+                then=Subquery(
+                    t.model.objects.filter(pk=OuterRef("object_id"))
+                    .annotate(unit_price=t.price)
+                    .values("unit_price")[:1]
+                ),
+            )
+            for t in self.types
+        ]
+        return (
+            CartItem.objects.filter(user=user)
+            .select_related("content_type")
+            .annotate(unit_price=Case(*whens, default=None, output_field=MONEY))
+            .filter(unit_price__isnull=False)
+            .annotate(
+                line_total=ExpressionWrapper(
+                    F("unit_price") * F("quantity"), output_field=MONEY
+                )
+            )
+            .order_by("-added_at")
+        )
+
+    def totals(self, items: QuerySet) -> Dict[str, object]:
+        """Total quantity and amount of a priced_items() queryset."""
+        totals = items.aggregate(
+            total_quantity=Sum("quantity"), total=Sum("line_total")
+        )
+        return {
+            "total_quantity": totals["total_quantity"] or 0,
+            "total": totals["total"] or Decimal("0.00"),
+        }
+
+    def attach_objects(self, items: Iterable[CartItem]) -> List[CartItem]:
+        """Load the content objects of items with one query per type."""
+        return self._loader.attach(items)
+
+    def price_cart(self, user) -> PricedCart:
+        """Every priced item of user's cart with its object, plus totals."""
+        items = self.priced_items(user)
+        rows = self.attach_objects(items)
+        return PricedCart(
+            items=rows,
+            total_quantity=sum(item.quantity for item in rows),
+            total=sum((item.line_total for item in rows), Decimal("0.00")),
+        )
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by CartRepository for cart writes that bypass post_save/post_delete
+# (F() increments, bulk_update and bulk_create). `deltas` maps
+# (content_type_id, object_id) to (rows_added, quantity_added).
+cart_items_changed = Signal()
@@ -2,6 +2,7 @@ from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 from cart.models import CartItem, WishlistItem
+from cart.services.counter_service import CartCounterService
 from core.models import ClientProfile
 from mentorship_session.models import MentorshipSession
 from microservices.models import MicroService
@@ -9,8 +10,13 @@ from microservices.models import MicroService
 
 def cleanup_cart_and_wishlist(instance):
     ct = ContentType.objects.get_for_model(instance)
-    CartItem.objects.filter(content_type=ct, object_id=instance.id).delete()
-    WishlistItem.objects.filter(content_type=ct, object_id=instance.id).delete()
+    cart_items = CartItem.objects.filter(content_type=ct, object_id=instance.id)
+    wishlist_items = WishlistItem.objects.filter(content_type=ct, object_id=instance.id)
+    user_ids = set(cart_items.values_list("user_id", flat=True))
+    user_ids.update(wishlist_items.values_list("user_id", flat=True))
+    cart_items.delete()
+    wishlist_items.delete()
+    CartCounterService().invalidate_users(user_ids)
 
 
 @receiver(post_delete, sender=MentorshipSession)
@@ -28,3 +34,4 @@ def client_profile_deleted(sender, instance, **kwargs):
     user = instance.user
     CartItem.objects.filter(user=user).delete()
     WishlistItem.objects.filter(user=user).delete()
+    CartCounterService().invalidate_users([user.pk])
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from cart.models import CartItem, WishlistItem
+from cart.services.cart_service import CartService, WishlistService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+
+
+class CartServiceMutationTest(TestCase):
+    """Tests for atomic and batched cart/wishlist mutations"""
+
+    def setUp(self):
+        """Create a buyer and a few microservices"""
+        self.category = CategoryFactory()
+        self.user = UserFactory()
+        freelancer = FreelancerProfileFactory()
+        self.services = [
+            MicroServiceFactory(
+                category=self.category,
+                freelancer=freelancer,
+                price=Decimal("10.00"),
+                image_path=None,
+            )
+            for _ in range(3)
+        ]
+        self.cart = CartService()
+
+    def _quantities(self):
+        return dict(
+            CartItem.objects.filter(user=self.user).values_list("object_id", "quantity")
+        )
+
+    def test_add_to_cart_increments_in_the_database(self):
+        """Test that adding twice increments with F() instead of overwriting"""
+        # Arrange
+        obj = self.services[0]
+        self.cart.add_to_cart(self.user, obj, quantity=2)
+
+        # Act
+        item = self.cart.add_to_cart(self.user, obj, quantity=3)
+
+        # Assert
+        self.assertEqual(item.quantity, 5)
+        self.assertEqual(CartItem.objects.filter(user=self.user).count(), 1)
+
+    def test_remove_missing_item_does_not_create_rows(self):
+        """Test that removing an object not in the cart is a no-op"""
+        # Act
+        removed = self.cart.remove_from_cart(self.user, self.services[0])
+
+        # Assert
+        self.assertFalse(removed)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_add_many_merges_new_and_existing_items(self):
+        """Test that add_many increments existing rows and inserts the rest"""
+        # Arrange
+        first, second, _ = self.services
+        self.cart.add_to_cart(self.user, first)
+
+        # Act
+        created = self.cart.add_many(self.user, [(first, 2), (second, 1), (second, 1)])
+
+        # Assert
+        self.assertEqual(created, 1)
+        self.assertEqual(self._quantities(), {first.id: 3, second.id: 2})
+
+    def test_remove_many_deletes_in_one_query(self):
+        """Test that several objects are removed with one DELETE"""
+        # Arrange
+        self.cart.add_many(self.user, [(obj, 1) for obj in self.services])
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            deleted = self.cart.remove_many(self.user, self.services[:2])
+
+        # Assert
+        # Analytics rollups add their own bookkeeping; the cart rows still go
+        # in a single DELETE
+        cart_deletes = [
+            q for q in queries if q["sql"].startswith('DELETE FROM "cart_cartitem"')
+        ]
+        self.assertEqual(len(cart_deletes), 1)
+        self.assertEqual(deleted, 2)
+        self.assertEqual(list(self._quantities()), [self.services[2].id])
+
+    def test_move_wishlist_to_cart_keeps_existing_quantities(self):
+        """Test that moving the wishlist adds missing items and empties it"""
+        # Arrange
+        first, second, _ = self.services
+        wishlist = WishlistService()
+        wishlist.add_to_wishlist(self.user, first)
+        wishlist.add_to_wishlist(self.user, second)
+        self.cart.add_to_cart(self.user, first, quantity=4)
+
+        # Act
+        moved = self.cart.move_wishlist_to_cart(self.user)
+
+        # Assert
+        self.assertEqual(moved, 2)
+        self.assertEqual(self._quantities(), {first.id: 4, second.id: 1})
+        self.assertFalse(WishlistItem.objects.filter(user=self.user).exists())
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from cart.services.cart_service import CartService, WishlistService
+from cart.services.counter_service import CartCounterService
+
+User = get_user_model()
+
+
+class CartCounterServiceTest(TestCase):
+    """Tests for the session-cached cart and wishlist counters"""
+
+    def setUp(self):
+        """Create a user, a purchasable object stand-in and a request"""
+        self.user = User.objects.create_user(
+            username="buyer", email="buyer@example.com", password="x"
+        )
+        # Any model with a UUID primary key works as a generic relation target
+        self.obj = User.objects.create_user(
+            username="seller", email="seller@example.com", password="x"
+        )
+        self.request = SimpleNamespace(user=self.user, session={})
+        self.counters = CartCounterService()
+
+    def test_counts_are_served_from_session_until_invalidated(self):
+        """Test that a cached entry avoids queries and mutations refresh it"""
+        # Arrange
+        CartService().add_to_cart(self.user, self.obj, quantity=2)
+        self.counters.get_counts(self.request)
+
+        # Act
+        with self.assertNumQueries(0):
+            cached = self.counters.get_counts(self.request)
+        WishlistService().add_to_wishlist(self.user, self.obj)
+        refreshed = self.counters.get_counts(self.request)
+
+        # Assert
+        self.assertEqual(cached, {"cart_count": 2, "wishlist_count": 0})
+        self.assertEqual(refreshed, {"cart_count": 2, "wishlist_count": 1})
+
+    def test_change_from_another_process_invalidates_cache(self):
+        """Test that a version bump made elsewhere is seen on the next request"""
+        # Arrange
+        self.counters.get_counts(self.request)
+        CartService().add_to_cart(User.objects.get(pk=self.user.pk), self.obj)
+
+        # Act
+        self.request.user = User.objects.get(pk=self.user.pk)
+        counts = self.counters.get_counts(self.request)
+
+        # Assert
+        self.assertEqual(counts["cart_count"], 1)
+
+    def test_invalidate_users_bumps_versions_in_one_query(self):
+        """Test that bulk cleanups invalidate every affected user at once"""
+        # Act
+        with self.assertNumQueries(1):
+            self.counters.invalidate_users([self.user.pk, self.obj.pk])
+
+        # Assert
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.cart_version, 1)
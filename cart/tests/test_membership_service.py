@@ -0,0 +1,66 @@
+from decimal import Decimal
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from cart.repositories.lookups import object_key
+from cart.services.cart_service import CartService, WishlistService
+from cart.services.membership_service import CartMembershipService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+
+
+class CartMembershipServiceTest(TestCase):
+    """Tests for in-cart / in-wishlist membership lookups"""
+
+    def setUp(self):
+        """Create a buyer with one item in the cart and one wishlisted"""
+        self.category = CategoryFactory()
+        self.user = UserFactory()
+        freelancer = FreelancerProfileFactory()
+        self.services = [
+            MicroServiceFactory(
+                category=self.category,
+                freelancer=freelancer,
+                price=Decimal("10.00"),
+                image_path=None,
+            )
+            for _ in range(3)
+        ]
+        self.cart_item = CartService().add_to_cart(self.user, self.services[0])
+        self.wishlist_item = WishlistService().add_to_wishlist(
+            self.user, self.services[1]
+        )
+        self.membership = CartMembershipService()
+
+    def test_page_of_objects_takes_one_query_per_table(self):
+        """Test that badges for many objects cost two queries in total"""
+        # Act
+        with self.assertNumQueries(2):
+            objs = self.membership.annotate(self.user, self.services)
+
+        # Assert
+        self.assertEqual(
+            [(o.membership.in_cart, o.membership.in_wishlist) for o in objs],
+            [(True, False), (False, True), (False, False)],
+        )
+
+    def test_detail_context_exposes_item_ids(self):
+        """Test that detail pages get the ids needed by the remove forms"""
+        # Act
+        context = self.membership.context(self.user, self.services[0])
+
+        # Assert
+        self.assertEqual(context["cart_item_id"], self.cart_item.id)
+        self.assertTrue(context["in_cart"])
+        self.assertFalse(context["in_wishlist"])
+
+    def test_anonymous_user_runs_no_queries(self):
+        """Test that anonymous visitors never query the cart tables"""
+        # Act
+        with self.assertNumQueries(0):
+            result = self.membership.lookup(AnonymousUser(), self.services)
+
+        # Assert
+        self.assertEqual(result, {})
+        self.assertNotIn(object_key(self.services[2]), result)
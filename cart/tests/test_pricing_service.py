@@ -0,0 +1,99 @@
+from decimal import Decimal
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from cart.models import CartItem
+from cart.services.pricing_service import CartPricingService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from mentorship_session.factory_boy.mentorship_factory import (
+    MentorshipSessionFactory,
+)
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+
+
+class CartPricingServiceTest(TestCase):
+    """Tests for SQL-side cart pricing"""
+
+    def setUp(self):
+        """Create a buyer and helpers to fill the cart"""
+        self.category = CategoryFactory()
+        self.user = UserFactory()
+        self.freelancer = FreelancerProfileFactory()
+        self.service = CartPricingService()
+
+    def _add(self, obj, quantity=1):
+        return CartItem.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=obj.id,
+            quantity=quantity,
+        )
+
+    def _microservice(self, price):
+        return MicroServiceFactory(
+            category=self.category,
+            freelancer=self.freelancer,
+            price=Decimal(price),
+            image_path=None,
+        )
+
+    def _mentorship(self, minutes):
+        return MentorshipSessionFactory(
+            mentor=self.freelancer, duration_minutes=minutes, image_path=None
+        )
+
+    def test_prices_each_type_in_sql(self):
+        """Test that unit prices and totals match the models' pricing rules"""
+        # Arrange
+        self._add(self._microservice("40.00"), quantity=2)
+        self._add(self._mentorship(30))
+
+        # Act
+        items = self.service.priced_items(self.user)
+        totals = self.service.totals(items)
+
+        # Assert
+        self.assertEqual(
+            sorted(item.line_total for item in items),
+            [Decimal("75.00"), Decimal("80.00")],
+        )
+        self.assertEqual(totals["total"], Decimal("155.00"))
+        self.assertEqual(totals["total_quantity"], 3)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        """Test that a priced cart with its display objects takes constant queries"""
+        # Arrange
+        for i in range(5):
+            self._add(self._microservice("10.00"))
+            self._add(self._mentorship(15 + i))
+
+        # Act
+        with self.assertNumQueries(3):
+            cart = self.service.price_cart(self.user)
+            names = [
+                item.content_object.get_title() + str(item.content_object.pk)
+                for item in cart.items
+            ]
+
+        # Assert
+        self.assertEqual(len(names), 10)
+        self.assertEqual(cart.total_quantity, 10)
+
+    def test_items_of_deleted_objects_are_skipped(self):
+        """Test that dangling generic references are not priced"""
+        # Arrange
+        service = self._microservice("10.00")
+        self._add(service)
+        CartItem.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(service),
+            object_id=self.user.id,
+        )
+
+        # Act
+        cart = self.service.price_cart(self.user)
+
+        # Assert
+        self.assertEqual(len(cart.items), 1)
+        self.assertEqual(cart.total, Decimal("10.00"))
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from cart.services.cart_service import WishlistService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from mentorship_session.factory_boy.mentorship_factory import (
+    MentorshipSessionFactory,
+)
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+)
+class WishlistListViewTest(TestCase):
+    """Tests for the query cost of the wishlist page"""
+
+    def setUp(self):
+        """A logged-in buyer and a freelancer offering items"""
+        self.category = CategoryFactory()
+        self.freelancer = FreelancerProfileFactory()
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+        self.wishlist = WishlistService()
+        self.url = reverse("cart:wishlist_list")
+
+    def _add_items(self, count):
+        for _ in range(count):
+            self.wishlist.add_to_wishlist(
+                self.user,
+                MicroServiceFactory(
+                    category=self.category,
+                    freelancer=self.freelancer,
+                    price=Decimal("10.00"),
+                    image_path=None,
+                ),
+            )
+            self.wishlist.add_to_wishlist(
+                self.user,
+                MentorshipSessionFactory(mentor=self.freelancer, image_path=None),
+            )
+
+    def test_query_count_does_not_grow_with_items(self):
+        """Test that content types and objects are loaded once per page"""
+        # Arrange
+        self._add_items(1)
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.url)
+        self._add_items(3)
+
+        # Act / Assert
+        with self.assertNumQueries(len(baseline)):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context["wishlist_items"]), 8)
@@ -6,6 +6,7 @@ from .views.views import (
     WishlistListView,
     AddToWishlistView,
     RemoveFromWishlistView,
+    MoveWishlistToCartView,
 )
 
 app_name = "cart"
@@ -21,4 +22,9 @@ urlpatterns = [
         RemoveFromWishlistView.as_view(),
         name="remove_from_wishlist",
     ),
+    path(
+        "wishlist/move-to-cart/",
+        MoveWishlistToCartView.as_view(),
+        name="move_wishlist_to_cart",
+    ),
 ]
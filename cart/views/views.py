@@ -3,6 +3,8 @@ from django.shortcuts import redirect, get_object_or_404
 from django.contrib.contenttypes.models import ContentType
 from ..models import CartItem, WishlistItem
 from ..services.cart_service import CartService, WishlistService
+from ..services.pricing_service import CartPricingService
+from core.repositories.generic_relations import GenericRelationLoader
 
 
 class CartListView(ListView):
@@ -10,19 +12,18 @@ class CartListView(ListView):
     template_name = "cart/cart_list.html"
     context_object_name = "cart_items"
     paginate_by = 12
-    ordering = ["-created_at"]
 
     def get_queryset(self):
-        service = CartService()
-        return service.list_cart(self.request.user)
+        self.pricing = CartPricingService()
+        return self.pricing.priced_items(self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        cart_items = context["cart_items"]
-        context["items_quantity_total"] = sum(item.quantity for item in cart_items)
-        context["cart_total"] = sum(
-            item.content_object.get_price() * item.quantity for item in cart_items
-        )
+        # Only the current page needs its objects; totals cover the whole cart
+        context["cart_items"] = self.pricing.attach_objects(context["cart_items"])
+        totals = self.pricing.totals(self.object_list)
+        context["items_quantity_total"] = totals["total_quantity"]
+        context["cart_total"] = totals["total"]
         return context
 
 
@@ -49,6 +50,13 @@ class RemoveFromCartView(View):
         return redirect("cart:cart_list")
 
 
+class MoveWishlistToCartView(View):
+    def post(self, request, *args, **kwargs):
+        service = CartService()
+        service.move_wishlist_to_cart(user=request.user)
+        return redirect("cart:cart_list")
+
+
 class WishlistListView(ListView):
     model = WishlistItem
     template_name = "cart/wishlist_list.html"
@@ -60,6 +68,13 @@ class WishlistListView(ListView):
         service = WishlistService()
         return service.list_wishlist(self.request.user)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["wishlist_items"] = GenericRelationLoader().attach(
+            context["wishlist_items"]
+        )
+        return context
+
 
 class AddToWishlistView(View):
     def post(self, request, *args, **kwargs):
@@ -80,4 +95,4 @@ class RemoveFromWishlistView(View):
         service = WishlistService()
         item = get_object_or_404(WishlistItem, id=kwargs["pk"], user=request.user)
         service.remove_from_wishlist(user=request.user, obj=item.content_object)
-        return redirect("cart:wishlist_list")
\ No newline at end of file
+        return redirect("cart:wishlist_list")
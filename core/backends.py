@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from .profiles import PROFILE_RELATIONS
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with both profiles,
+    so role checks during the request do not query the profile tables.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related(*PROFILE_RELATIONS).get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -2,6 +2,7 @@ from django.conf import settings
 from ..interfaces.storage_interface import StorageInterface
 from ..storage.local_storage import LocalStorage
 from ..storage.gcs_storage import GCSStorage
+from ..storage.cached_storage import CachedStorage
 
 
 class StorageFactory:
@@ -18,6 +19,21 @@ class StorageFactory:
             return LocalStorage()
         elif storage_type == "gcs":
             return GCSStorage()
+        elif storage_type == "cached_gcs":
+            return CachedStorage(
+                GCSStorage(),
+                cache_dir=getattr(
+                    settings, "CACHED_GCS_DIR", "/tmp/hireloop-media-cache"
+                ),
+                max_bytes=getattr(settings, "CACHED_GCS_MAX_BYTES", 512 * 1024 * 1024),
+                exists_ttl=getattr(settings, "CACHED_GCS_EXISTS_TTL", 300),
+                serve_locally=getattr(settings, "CACHED_GCS_SERVE_LOCALLY", False),
+            )
+        elif storage_type == "cas":
+            # Imported lazily: the CAS backend keeps its index in core models
+            from ..storage.cas_storage import ContentAddressedStorage
+
+            inner_type = getattr(settings, "CAS_INNER_STORAGE_TYPE", "gcs")
+            return ContentAddressedStorage(StorageFactory.create_storage(inner_type))
         else:
             raise ValueError(f"Unsupported storage type: {storage_type}")
-
@@ -0,0 +1,12 @@
+from .breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .sessions import TimeoutSession, build_session, client_options, get_http_session
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "TimeoutSession",
+    "build_session",
+    "client_options",
+    "get_circuit_breaker",
+    "get_http_session",
+]
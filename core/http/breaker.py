@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} is temporarily unavailable")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Process-local circuit breaker for one outbound dependency.
+
+    After failure_threshold consecutive failures the breaker opens and
+    calls fail immediately for reset_timeout seconds. A single trial call
+    is then let through (half-open): success closes the breaker, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._cooled_down():
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; claims the half-open trial."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._cooled_down():
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit {self.name} opened after {self._failures} failures"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call func through the breaker; any exception counts as a failure."""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for name, configured by CIRCUIT_BREAKERS."""
+    breaker: Optional[CircuitBreaker] = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **_options(name))
+                _breakers[name] = breaker
+    return breaker
+
+
+def _options(name: str) -> dict:
+    configured = getattr(settings, "CIRCUIT_BREAKERS", {})
+    return {**configured.get("default", {}), **configured.get(name, {})}
@@ -0,0 +1,77 @@
+import threading
+from typing import Dict, Tuple
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULTS = {
+    "connect_timeout": 3.05,
+    "read_timeout": 10.0,
+    "retries": 2,
+    "backoff_factor": 0.2,
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+}
+
+
+class TimeoutSession(requests.Session):
+    """A requests Session that never waits without a timeout."""
+
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def build_session(options: dict) -> TimeoutSession:
+    """
+    Session with a persistent connection pool per host, connect/read
+    timeouts and a retry budget. Retries only cover connection errors and
+    gateway responses of idempotent requests, with exponential backoff.
+    """
+    options = {**DEFAULTS, **options}
+    session = TimeoutSession((options["connect_timeout"], options["read_timeout"]))
+    retry = Retry(
+        total=options["retries"],
+        connect=options["retries"],
+        read=options["retries"],
+        status=options["retries"],
+        backoff_factor=options["backoff_factor"],
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=options["pool_connections"],
+        pool_maxsize=options["pool_maxsize"],
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_sessions: Dict[str, TimeoutSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_http_session(name: str = "default") -> TimeoutSession:
+    """Return the process-wide session for name, configured by HTTP_CLIENTS."""
+    session = _sessions.get(name)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = build_session(client_options(name))
+                _sessions[name] = session
+    return session
+
+
+def client_options(name: str) -> dict:
+    configured = getattr(settings, "HTTP_CLIENTS", {})
+    return {**DEFAULTS, **configured.get("default", {}), **configured.get(name, {})}
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+from django.core.files.base import File
 from django.core.files.uploadedfile import UploadedFile
 
 class StorageInterface(ABC):
@@ -23,3 +25,29 @@ class StorageInterface(ABC):
     def exists(self, path: str) -> bool:
         """Check if file exists."""
         pass
+
+    @abstractmethod
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        """Check several files at once and return a path -> exists map."""
+        pass
+
+    @abstractmethod
+    def url_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Get URLs for several files and return a path -> URL map."""
+        pass
+
+    @abstractmethod
+    def delete_many(self, paths: Iterable[str]) -> int:
+        """Delete several files and return how many were removed."""
+        pass
+
+    def open(self, path: str) -> File:
+        """Open file for reading."""
+        raise NotImplementedError(f"{type(self).__name__} does not support reads")
+
+    def public_url(self, path: str) -> Optional[str]:
+        """
+        Build a URL without contacting the backend, or return None when the
+        backend cannot guarantee one (callers then fall back to exists/url).
+        """
+        return None
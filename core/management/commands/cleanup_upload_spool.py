@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.services.storage_tasks import cleanup_spool_dir
+
+
+class Command(BaseCommand):
+    help = "Delete spooled image uploads left behind by workers that exited mid-job"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age-hours",
+            type=int,
+            default=24,
+            help="Only delete spool files older than this",
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_spool_dir(max_age_seconds=options["max_age_hours"] * 3600)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} spool files"))
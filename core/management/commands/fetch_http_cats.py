@@ -0,0 +1,39 @@
+import os
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+STATUS_CODES = [
+    400, 401, 402, 403, 404, 405, 406, 408, 409, 410, 413, 414, 415, 422, 429,
+    500, 501, 502, 503, 504,
+]
+
+
+class Command(BaseCommand):
+    help = "Download http.cat error images into HTTP_CAT_IMAGE_DIR (run at build time)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        image_dir = settings.HTTP_CAT_IMAGE_DIR
+        os.makedirs(image_dir, exist_ok=True)
+        session = requests.Session()
+
+        fetched = 0
+        for status in STATUS_CODES:
+            try:
+                r = session.get(
+                    f"https://http.cat/{status}", timeout=options["timeout"]
+                )
+                r.raise_for_status()
+            except requests.RequestException as e:
+                self.stderr.write(f"Skipping {status}: {e}")
+                continue
+            with open(os.path.join(image_dir, f"{status}.jpg"), "wb") as f:
+                f.write(r.content)
+            fetched += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Saved {fetched} images to {image_dir}")
+        )
@@ -0,0 +1,180 @@
+"""
+Dependency-free Prometheus-style metrics shared across gunicorn workers.
+
+Each process accumulates counters and histograms in memory and periodically
+writes them to its own JSON file in METRICS_DIR; the /metrics endpoint sums
+the files of all processes and renders the Prometheus text format.
+"""
+
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+HELP = {
+    "hireloop_http_requests_total": (
+        "counter",
+        "HTTP responses by view, method and status.",
+    ),
+    "hireloop_http_request_duration_seconds": ("histogram", "Request latency by view."),
+    "hireloop_db_queries_per_request": (
+        "histogram",
+        "SQL queries executed per request by view.",
+    ),
+    "hireloop_db_duration_seconds": (
+        "histogram",
+        "Time spent in SQL per request by view.",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Per-process metric store that flushes to a shared directory."""
+
+    def __init__(self, directory: str, flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+        # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name: str, labels: dict, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[(name, self._labels(labels))] += amount
+
+    def observe(
+        self, name: str, labels: dict, value: float, buckets: Tuple[float, ...]
+    ) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._buckets[name] = buckets
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            # Non-cumulative here; rendering makes the buckets cumulative
+            series[bisect_left(buckets, value)] += 1
+            series[-1] += value
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Atomically write this process's metrics to its file."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            data = {
+                "counters": [[n, list(l), v] for (n, l), v in self._counters.items()],
+                "histograms": [
+                    [n, list(l), self._buckets[n], s]
+                    for (n, l), s in self._histograms.items()
+                ],
+            }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(
+            tmp_path, os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+        )
+
+    def render(self) -> str:
+        """Aggregate every process file and render the text exposition format."""
+        self.flush()
+        counters = defaultdict(float)
+        histograms = {}
+        buckets = {}
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data["counters"]:
+                counters[(name, self._labels(dict(labels)))] += value
+            for name, labels, name_buckets, series in data["histograms"]:
+                buckets[name] = tuple(name_buckets)
+                key = (name, self._labels(dict(labels)))
+                total = histograms.setdefault(key, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+
+        lines = []
+        for name, (kind, help_text) in HELP.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (n, labels), value in sorted(counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{self._format(labels)} {_number(value)}")
+            else:
+                for (n, labels), series in sorted(histograms.items()):
+                    if n == name:
+                        lines.extend(
+                            self._render_histogram(name, labels, buckets[n], series)
+                        )
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(
+        self, name: str, labels: Labels, buckets: Iterable[float], series: list
+    ):
+        cumulative = 0
+        for bound, count in zip(list(buckets) + ["+Inf"], series[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else f"{bound:g}"
+            yield f"{name}_bucket{self._format(labels + (('le', le),))} {cumulative}"
+        yield f"{name}_sum{self._format(labels)} {_number(series[-1])}"
+        yield f"{name}_count{self._format(labels)} {cumulative}"
+
+    @staticmethod
+    def _labels(labels: dict) -> Labels:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _format(labels: Labels) -> str:
+        if not labels:
+            return ""
+        pairs = (f'{k}="{_escape(v)}"' for k, v in labels)
+        return "{" + ",".join(pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the registry for this process."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(
+                    directory=getattr(settings, "METRICS_DIR", "/tmp/hireloop-metrics"),
+                    flush_interval=getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0),
+                )
+                # Keep the last counts of a worker that is shutting down
+                atexit.register(_registry.flush)
+    return _registry
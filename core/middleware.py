@@ -1,37 +1,301 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.http import HttpResponse
 import requests
+from .http import get_http_session
+from .metrics import LATENCY_BUCKETS, QUERY_COUNT_BUCKETS, get_registry
+from .nplusone import NPlusOneError, record_queries
+
+logger = logging.getLogger(__name__)
 
 """
 Middleware personalizado para health checks
 """
 
+
+class DatabaseLivenessMonitor:
+    """
+    Caches the result of a trivial DB query for `ttl` seconds. Once a result
+    exists, stale results are refreshed in a background thread while callers
+    keep getting the last known state, so probes never wait on the database.
+    """
+
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+        self._result = None  # (ok, detail)
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def status(self):
+        """Return (ok, detail) for the database."""
+        with self._lock:
+            result = self._result
+            stale = time.monotonic() - self._checked_at >= self.ttl
+            start_refresh = result is not None and stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if result is None:
+            # First probe in this process: nothing cached yet
+            return self._refresh()
+        if start_refresh:
+            threading.Thread(
+                target=self._refresh, name="db-liveness", daemon=True
+            ).start()
+        return result
+
+    def _refresh(self):
+        from django.db import connections
+
+        try:
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            result = (True, "OK")
+        except Exception as e:
+            result = (False, f"ERROR: {e}")
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+        with self._lock:
+            self._result = result
+            self._checked_at = time.monotonic()
+            self._refreshing = False
+        return result
+
+
+_db_liveness = None
+
+
+def get_db_liveness():
+    """Return the process-wide database liveness monitor."""
+    global _db_liveness
+    if _db_liveness is None:
+        _db_liveness = DatabaseLivenessMonitor(
+            ttl=getattr(settings, "HEALTH_DB_CHECK_TTL", 5.0)
+        )
+    return _db_liveness
+
+
 class HealthCheckMiddleware:
     """
-    Middleware que permite health checks desde cualquier host sin redirecciones HTTPS.
-    Debe estar ANTES de SecurityMiddleware en MIDDLEWARE.
+    Answers health checks before the rest of the middleware stack runs (no
+    ALLOWED_HOSTS, HTTPS redirect, sessions or CSRF). Debe estar PRIMERO en
+    MIDDLEWARE.
+
+    /health/ and /healthz/ report the cached database liveness; /ready/ only
+    confirms the process is serving requests.
     """
+
+    LIVENESS_PATHS = ("/health/", "/healthz/")
+    READINESS_PATHS = ("/ready/",)
+
     def __init__(self, get_response):
         self.get_response = get_response
-        self.health_check_paths = ['/health/', '/ready/', '/healthz/']
+        self.db_liveness = get_db_liveness()
 
     def __call__(self, request):
-        # Si es un health check, bypassear validaciones de seguridad
-        if request.path in self.health_check_paths:
-            # Marcar como conexión segura para evitar redirect HTTPS
-            request._secure_override = True
-            request.META['wsgi.url_scheme'] = 'https'
-            
-        response = self.get_response(request)
-        return response
+        path = request.path_info
+        if path in self.READINESS_PATHS:
+            return HttpResponse("READY", content_type="text/plain")
+        if path in self.LIVENESS_PATHS:
+            ok, detail = self.db_liveness.status()
+            return HttpResponse(
+                detail, status=200 if ok else 503, content_type="text/plain"
+            )
+        return self.get_response(request)
+
+
+class HttpCatImageCache:
+    """
+    Bounded in-memory LRU cache of http.cat images keyed by status code.
+    Images are read from HTTP_CAT_IMAGE_DIR (filled at build time by the
+    fetch_http_cats command); a missing image is fetched once from http.cat
+    with a short timeout, and failures are remembered for retry_after
+    seconds so a burst of errors never waits on the network.
+    """
+
+    REMOTE_URL = "https://http.cat/{status}"
+
+    def __init__(
+        self,
+        image_dir,
+        max_entries=32,
+        fetch_remote=True,
+        timeout=1.0,
+        retry_after=300,
+    ):
+        self.image_dir = image_dir
+        self.max_entries = max_entries
+        self.fetch_remote = fetch_remote
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._images = OrderedDict()
+        self._unavailable = {}
+        self._lock = threading.Lock()
+        self._session = get_http_session("http_cat") if fetch_remote else None
+
+    def get(self, status):
+        """Return the image bytes for status, or None if unavailable."""
+        with self._lock:
+            if status in self._images:
+                self._images.move_to_end(status)
+                return self._images[status]
+            if time.monotonic() < self._unavailable.get(status, 0):
+                return None
+
+        image = self._load_local(status) or self._load_remote(status)
+
+        with self._lock:
+            if image is None:
+                self._unavailable[status] = time.monotonic() + self.retry_after
+                return None
+            self._images[status] = image
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
+
+    def _load_local(self, status):
+        try:
+            with open(os.path.join(self.image_dir, f"{status}.jpg"), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _load_remote(self, status):
+        if not self.fetch_remote:
+            return None
+        try:
+            r = self._session.get(
+                self.REMOTE_URL.format(status=status), timeout=self.timeout
+            )
+        except requests.RequestException:
+            return None
+        return r.content if r.ok else None
+
+
+_http_cat_cache = None
+
+
+def get_http_cat_cache():
+    """Return the process-wide http.cat image cache."""
+    global _http_cat_cache
+    if _http_cat_cache is None:
+        _http_cat_cache = HttpCatImageCache(
+            image_dir=getattr(settings, "HTTP_CAT_IMAGE_DIR", ""),
+            max_entries=getattr(settings, "HTTP_CAT_CACHE_SIZE", 32),
+            fetch_remote=getattr(settings, "HTTP_CAT_FETCH_REMOTE", True),
+            timeout=getattr(settings, "HTTP_CAT_TIMEOUT", 1.0),
+        )
+    return _http_cat_cache
+
 
 class HttpCatMiddleware:
+    """
+    Replaces error responses with the matching http.cat image for browsers.
+    Clients that do not accept HTML (APIs, webhooks, asset requests) get the
+    original response untouched.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.images = get_http_cat_cache()
 
     def __call__(self, request):
         response = self.get_response(request)
-        if response.status_code >= 400:
-            url = f"https://http.cat/{response.status_code}"
-            r = requests.get(url)
-            return HttpResponse(r.content, content_type="image/jpeg", status=response.status_code)
-        return response
\ No newline at end of file
+        if response.status_code < 400 or not self._accepts_html(request):
+            return response
+
+        image = self.images.get(response.status_code)
+        if image is None:
+            return response
+        return HttpResponse(
+            image, content_type="image/jpeg", status=response.status_code
+        )
+
+    @staticmethod
+    def _accepts_html(request):
+        return "text/html" in request.headers.get("Accept", "")
+
+
+class MetricsMiddleware:
+    """
+    Records request counts, latency, SQL query counts and SQL time per URL
+    name for the /metrics endpoint. Place it near the top of MIDDLEWARE so
+    the latency covers the rest of the stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.registry = get_registry()
+
+    def __call__(self, request):
+        db_stats = {"queries": 0, "seconds": 0.0}
+
+        def record_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_stats["queries"] += 1
+                db_stats["seconds"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(record_query):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        # URL names keep label cardinality bounded, unlike raw paths
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        labels = {"view": view}
+        self.registry.inc(
+            "hireloop_http_requests_total",
+            {"view": view, "method": request.method, "status": response.status_code},
+        )
+        self.registry.observe(
+            "hireloop_http_request_duration_seconds", labels, elapsed, LATENCY_BUCKETS
+        )
+        self.registry.observe(
+            "hireloop_db_queries_per_request",
+            labels,
+            db_stats["queries"],
+            QUERY_COUNT_BUCKETS,
+        )
+        self.registry.observe(
+            "hireloop_db_duration_seconds", labels, db_stats["seconds"], LATENCY_BUCKETS
+        )
+        self.registry.maybe_flush()
+        return response
+
+
+class NPlusOneMiddleware:
+    """
+    Opt-in (NPLUSONE_ENABLED) detector for per-row queries. Requests that run
+    the same query NPLUSONE_THRESHOLD times or more are logged with the
+    template and code that issued them, or fail with NPlusOneError when
+    NPLUSONE_RAISE is set (e.g. in the test suite).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "NPLUSONE_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, "NPLUSONE_THRESHOLD", 3)
+        self.raise_errors = getattr(settings, "NPLUSONE_RAISE", False)
+
+    def __call__(self, request):
+        with record_queries(self.threshold) as recorder:
+            response = self.get_response(request)
+        if recorder.repeated:
+            report = recorder.report(f"{request.method} {request.path}")
+            if self.raise_errors:
+                raise NPlusOneError(report)
+            logger.warning(report)
+        return response
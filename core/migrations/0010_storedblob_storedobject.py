@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_alter_itemportfolio_options_alter_user_email"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                (
+                    "sha256",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="Key in the backing storage", max_length=500
+                    ),
+                ),
+                ("size", models.PositiveBigIntegerField()),
+                ("content_type", models.CharField(blank=True, max_length=100)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Stored Blob",
+                "verbose_name_plural": "Stored Blobs",
+            },
+        ),
+        migrations.CreateModel(
+            name="StoredObject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=500, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="references",
+                        to="core.storedblob",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stored Object",
+                "verbose_name_plural": "Stored Objects",
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_storedblob_storedobject"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="cart_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
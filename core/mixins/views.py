@@ -2,6 +2,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
+from ..profiles import load_profiles
 
 
 class ProfileRequiredMixin(LoginRequiredMixin):
@@ -23,7 +24,7 @@ class ProfileRequiredMixin(LoginRequiredMixin):
 
     def user_has_required_profile(self, user):
         if self.required_profile == "freelancer":
-            return hasattr(user, "freelancer_profile")
+            return load_profiles(user).has_freelancer
         elif self.required_profile == "client":
-            return hasattr(user, "client_profile")
-        return True
\ No newline at end of file
+            return load_profiles(user).has_client
+        return True
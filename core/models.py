@@ -13,6 +13,8 @@ class User(AbstractUser):
         null=True,
         help_text=_("Upload a profile image"),
     )
+    # Bumped on every cart/wishlist change; invalidates session-cached counts
+    cart_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["email"]
@@ -21,10 +23,13 @@ class User(AbstractUser):
         return self.email
 
     def get_roles(self):
+        from .profiles import load_profiles
+
+        profiles = load_profiles(self)
         roles = []
-        if hasattr(self, "freelancer_profile"):
+        if profiles.has_freelancer:
             roles.append(_("Freelancer"))
-        if hasattr(self, "client_profile"):
+        if profiles.has_client:
             roles.append(_("Client"))
         return roles
 
@@ -106,4 +111,48 @@ class ItemPortfolio(models.Model):
 
         service = PortfolioImageService()
         # image.name already contains the full path (e.g., "portfolios/portfolio_uuid_hash.jpg")
-        return service.get_image_url(self.image.name if self.image else None)
\ No newline at end of file
+        return service.get_image_url(self.image.name if self.image else None)
+
+    def get_image_set(self):
+        from .services.image_service import PortfolioImageService
+
+        service = PortfolioImageService()
+        return service.get_image_set(self.image.name if self.image else None)
+
+
+class StoredBlob(models.Model):
+    """
+    A unique piece of content in the content-addressed store, keyed by its
+    SHA-256 digest and shared by every StoredObject with the same bytes.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    path = models.CharField(max_length=500, help_text=_("Key in the backing storage"))
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Stored Blob")
+        verbose_name_plural = _("Stored Blobs")
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
+class StoredObject(models.Model):
+    """A logical storage path pointing at the blob that holds its content."""
+
+    path = models.CharField(max_length=500, unique=True)
+    blob = models.ForeignKey(
+        StoredBlob, on_delete=models.PROTECT, related_name="references"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Stored Object")
+        verbose_name_plural = _("Stored Objects")
+
+    def __str__(self):
+        return self.path
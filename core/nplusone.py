@@ -0,0 +1,137 @@
+"""
+N+1 query detection for development and tests.
+
+Queries are fingerprinted (literals and IN-lists replaced by placeholders)
+so that "SELECT ... WHERE id = 1" and "... WHERE id = 2" count as the same
+statement. A fingerprint executed at least `threshold` times in one request
+or block is reported together with the template line and the project code
+that triggered it.
+"""
+
+import os
+import re
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.db import connection
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_PROJECT_ROOT = str(settings.BASE_DIR)
+_IGNORED_DIRS = ("site-packages", "dist-packages", f"{os.sep}lib{os.sep}python")
+
+
+class NPlusOneError(AssertionError):
+    """Raised when repeated queries exceed the configured threshold."""
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a SQL statement so queries differing only in values match."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class RepeatedQuery:
+    fingerprint: str
+    count: int
+    origins: List[str] = field(default_factory=list)
+
+    def __str__(self):
+        origins = "\n".join(f"    at {origin}" for origin in self.origins)
+        return f"{self.count}x {self.fingerprint}\n{origins}"
+
+
+class QueryRecorder:
+    """Collects fingerprints and call sites of the queries it wraps."""
+
+    MAX_ORIGINS = 3
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.origins: Dict[str, List[str]] = defaultdict(list)
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        origins = self.origins[key]
+        if len(origins) < self.MAX_ORIGINS:
+            origin = _query_origin()
+            if origin not in origins:
+                origins.append(origin)
+        return execute(sql, params, many, context)
+
+    @property
+    def repeated(self) -> List[RepeatedQuery]:
+        """Fingerprints executed at least `threshold` times, worst first."""
+        return sorted(
+            (
+                RepeatedQuery(key, count, self.origins[key])
+                for key, count in self.counts.items()
+                if count >= self.threshold
+            ),
+            key=lambda query: -query.count,
+        )
+
+    def report(self, label: str = "") -> str:
+        header = f"Repeated queries in {label}" if label else "Repeated queries"
+        return header + ":\n" + "\n".join(str(query) for query in self.repeated)
+
+
+@contextmanager
+def record_queries(threshold: int = 3):
+    """Record the queries run on the default connection inside the block."""
+    recorder = QueryRecorder(threshold)
+    with connection.execute_wrapper(recorder):
+        yield recorder
+
+
+class NPlusOneAssertionsMixin:
+    """TestCase mixin to fail tests that run per-row queries."""
+
+    @contextmanager
+    def assertNoRepeatedQueries(self, threshold: int = 3):
+        with record_queries(threshold) as recorder:
+            yield recorder
+        if recorder.repeated:
+            self.fail(recorder.report())
+
+
+def _query_origin() -> str:
+    """Describe where a query came from: template line, then project code."""
+    template = None
+    code = None
+    frame = sys._getframe(2)
+    while frame and not (template and code):
+        if template is None:
+            template = _template_location(frame)
+        filename = frame.f_code.co_filename
+        if (
+            code is None
+            and filename.startswith(_PROJECT_ROOT)
+            and not any(part in filename for part in _IGNORED_DIRS)
+            and filename != __file__
+        ):
+            relative = os.path.relpath(filename, _PROJECT_ROOT)
+            code = f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return " <- ".join(part for part in (template, code) if part) or "unknown"
+
+
+def _template_location(frame) -> Optional[str]:
+    # Node.render_annotated frames carry the template origin and line
+    node = frame.f_locals.get("self")
+    token = getattr(node, "token", None)
+    origin = getattr(node, "origin", None)
+    if token is not None and origin is not None:
+        return f"{origin.template_name or origin.name}:{token.lineno}"
+    return None
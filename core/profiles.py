@@ -0,0 +1,61 @@
+"""
+Request-scoped access to a user's freelancer and client profiles.
+
+Both reverse one-to-one relations are loaded with a single joined query and
+kept in the user instance's related-object cache. request.user lives for one
+request, so every later profile check in that request is free, including
+plain `hasattr(user, "freelancer_profile")` checks.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from django.contrib.auth import get_user_model
+
+PROFILE_RELATIONS = ("freelancer_profile", "client_profile")
+
+
+@dataclass(frozen=True)
+class UserProfiles:
+    freelancer: Optional[object] = None
+    client: Optional[object] = None
+
+    @property
+    def has_freelancer(self) -> bool:
+        return self.freelancer is not None
+
+    @property
+    def has_client(self) -> bool:
+        return self.client is not None
+
+
+def load_profiles(user) -> UserProfiles:
+    """Return the profiles of user, querying at most once per user instance."""
+    if user is None or not user.is_authenticated:
+        return UserProfiles()
+
+    relations = [_relation(name) for name in PROFILE_RELATIONS]
+    missing = [relation for relation in relations if not relation.is_cached(user)]
+    if missing:
+        loaded = (
+            get_user_model()
+            ._default_manager.select_related(*(r.name for r in missing))
+            .filter(pk=user.pk)
+            .first()
+        )
+        for relation in missing:
+            value = relation.get_cached_value(loaded, None) if loaded else None
+            relation.set_cached_value(user, value)
+
+    freelancer, client = (relation.get_cached_value(user) for relation in relations)
+    return UserProfiles(freelancer=freelancer, client=client)
+
+
+def forget_profile(user, relation_name: str) -> None:
+    """Drop a cached profile, e.g. after deleting it within the request."""
+    relation = _relation(relation_name)
+    if relation.is_cached(user):
+        relation.delete_cached_value(user)
+
+
+def _relation(name: str):
+    return get_user_model()._meta.get_field(name)
@@ -1,9 +1,9 @@
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from django.db import IntegrityError
 
 from ..repositories.base_repository import BaseRepository
 from ..models import FreelancerProfile, ClientProfile, User
-from projects.models import ProjectApplication
+from projects.models import Project, ProjectApplication
 
 
 class ProfileRepository(BaseRepository):
@@ -88,3 +88,33 @@ class ProfileRepository(BaseRepository):
     ) -> List[ProjectApplication]:
         """Get all applications for a freelancer."""
         return freelancer.applications.all().order_by("-created_at")
+
+    def get_freelancer_image_paths(
+        self, freelancer: FreelancerProfile
+    ) -> Dict[str, List[str]]:
+        """Collect image paths owned by a freelancer, one query per model."""
+        return {
+            "microservices": self._non_empty(
+                freelancer.microservices.values_list("image_path", flat=True)
+            ),
+            "mentorships": self._non_empty(
+                freelancer.mentorship_sessions.values_list("image_path", flat=True)
+            ),
+            "portfolios": self._non_empty(
+                freelancer.portfolio_items.values_list("image", flat=True)
+            ),
+        }
+
+    def get_client_image_paths(self, client: ClientProfile) -> Dict[str, List[str]]:
+        """Collect image paths owned by a client."""
+        return {
+            "projects": self._non_empty(
+                Project.objects.filter(client=client).values_list(
+                    "image_path", flat=True
+                )
+            ),
+        }
+
+    @staticmethod
+    def _non_empty(values) -> List[str]:
+        return [value for value in values if value]
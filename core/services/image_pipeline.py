@@ -0,0 +1,187 @@
+import io
+import posixpath
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.translation import gettext_lazy as _
+from ..interfaces.storage_interface import StorageInterface
+
+
+@dataclass
+class ImageSet:
+    """URLs for one stored image and its renditions, ready for <img srcset>."""
+
+    src: str
+    card: str
+    detail: str
+    placeholder: Optional[str] = None
+    srcset: str = ""
+
+
+@dataclass
+class ProcessedImage:
+    """Encoded primary image plus its renditions, keyed by storage path."""
+
+    primary_path: str
+    files: Dict[str, bytes] = field(default_factory=dict)
+
+
+class ImageRenditionPipeline:
+    """
+    Builds size-limited, EXIF-free renditions of an upload with Pillow.
+
+    The primary file is a detail-size JPEG (the path stored on the model);
+    card/detail WebP renditions and a tiny placeholder are stored next to it
+    under names derived from the primary path, so no extra columns are needed.
+    """
+
+    # Marks primary files written by this pipeline; older uploads lack it
+    # and are served as-is.
+    MARKER = "-rv1"
+    RENDITIONS = {
+        "card": (480, 480),
+        "detail": (1280, 1280),
+    }
+    PLACEHOLDER_SIZE = (16, 16)
+    JPEG_QUALITY = 85
+    WEBP_QUALITY = 80
+
+    def verify(self, image_file: UploadedFile) -> None:
+        """
+        Check that the upload is a well-formed image without decoding the
+        pixel data. Raises ValueError if it is not.
+        """
+        try:
+            image_file.seek(0)
+            Image.open(image_file).verify()
+        except (
+            UnidentifiedImageError,
+            OSError,
+            SyntaxError,
+            Image.DecompressionBombError,
+        ):
+            raise ValueError(_("Invalid image file"))
+        finally:
+            image_file.seek(0)
+
+    def process(self, image_file: UploadedFile, directory: str, stem: str):
+        """
+        Decode the upload and return the encoded files to store.
+        Animated images are kept untouched (renditions would drop frames).
+        Raises ValueError if the file is not a decodable image.
+        """
+        try:
+            image_file.seek(0)
+            image = Image.open(image_file)
+            image.load()
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            raise ValueError(_("Invalid image file"))
+        finally:
+            image_file.seek(0)
+
+        if getattr(image, "is_animated", False):
+            extension = posixpath.splitext(image_file.name)[1].lower() or ".gif"
+            primary_path = f"{directory}/{stem}{extension}"
+            return ProcessedImage(primary_path, {primary_path: image_file.read()})
+
+        # Apply the EXIF orientation, then drop all metadata by re-encoding
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        primary_path = f"{directory}/{stem}{self.MARKER}.jpg"
+        files = {
+            primary_path: self._encode(
+                self._flatten(image), self.RENDITIONS["detail"], "JPEG"
+            )
+        }
+        for name, size in self.RENDITIONS.items():
+            files[self.rendition_path(primary_path, name)] = self._encode(
+                image, size, "WEBP"
+            )
+        files[self.rendition_path(primary_path, "placeholder")] = self._encode(
+            image, self.PLACEHOLDER_SIZE, "WEBP", quality=30
+        )
+        return ProcessedImage(primary_path, files)
+
+    def store(
+        self,
+        storage: StorageInterface,
+        image_file: UploadedFile,
+        directory: str,
+        stem: str,
+    ) -> str:
+        """Process the upload, save every file and return the primary path."""
+        processed = self.process(image_file, directory, stem)
+        saved_primary = processed.primary_path
+        for path, data in processed.files.items():
+            saved = storage.save(ContentFile(data, name=posixpath.basename(path)), path)
+            if path == processed.primary_path:
+                saved_primary = saved
+        return saved_primary
+
+    def has_renditions(self, image_path: Optional[str]) -> bool:
+        """Whether image_path is a primary file written by this pipeline."""
+        if not image_path or not isinstance(image_path, str):
+            return False
+        return posixpath.splitext(image_path)[0].endswith(self.MARKER)
+
+    def rendition_path(self, primary_path: str, name: str) -> str:
+        return f"{posixpath.splitext(primary_path)[0]}_{name}.webp"
+
+    def all_paths(self, image_path: str) -> List[str]:
+        """The primary path plus every rendition stored alongside it."""
+        if not self.has_renditions(image_path):
+            return [image_path]
+        names = list(self.RENDITIONS) + ["placeholder"]
+        return [image_path] + [self.rendition_path(image_path, n) for n in names]
+
+    def build_image_set(
+        self, image_path: Optional[str], urls: Dict[str, str]
+    ) -> ImageSet:
+        """Assemble an ImageSet from resolved URLs (see all_paths)."""
+        src = urls.get(image_path, "") if image_path else ""
+        if not self.has_renditions(image_path):
+            return ImageSet(src=src, card=src, detail=src)
+
+        card = urls[self.rendition_path(image_path, "card")]
+        detail = urls[self.rendition_path(image_path, "detail")]
+        return ImageSet(
+            src=src,
+            card=card,
+            detail=detail,
+            placeholder=urls[self.rendition_path(image_path, "placeholder")],
+            srcset=(
+                f"{card} {self.RENDITIONS['card'][0]}w, "
+                f"{detail} {self.RENDITIONS['detail'][0]}w"
+            ),
+        )
+
+    @staticmethod
+    def _flatten(image: Image.Image) -> Image.Image:
+        """JPEG has no alpha channel; composite transparent images on white."""
+        if image.mode != "RGBA":
+            return image
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+
+    def _encode(
+        self, image: Image.Image, size, image_format: str, quality=None
+    ) -> bytes:
+        resized = image.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        if image_format == "JPEG":
+            resized.save(
+                buffer,
+                "JPEG",
+                quality=quality or self.JPEG_QUALITY,
+                optimize=True,
+                progressive=True,
+            )
+        else:
+            resized.save(buffer, "WEBP", quality=quality or self.WEBP_QUALITY, method=4)
+        return buffer.getvalue()
@@ -1,8 +1,12 @@
 import uuid
+from typing import Dict, Iterable
 from django.core.files.uploadedfile import UploadedFile
 from django.utils.translation import gettext_lazy as _
 from ..interfaces.storage_interface import StorageInterface
 from ..factories.storage_factory import StorageFactory
+from ..storage.streaming import sniff_image_type
+from ..storage.url_resolver import ImageURLResolver
+from .image_pipeline import ImageRenditionPipeline, ImageSet
 
 
 class BaseImageService:
@@ -10,22 +14,23 @@ class BaseImageService:
 
     def __init__(self, storage: StorageInterface = None):
         self._storage = storage or StorageFactory.create_storage()
+        self._url_resolver = ImageURLResolver(self._storage)
+        self._pipeline = ImageRenditionPipeline()
 
     def upload_image(
         self, identifier: str, image_file: UploadedFile, path_prefix: str
     ) -> str:
-        """Upload image and return the saved path."""
-        # Generate unique filename
-        file_extension = image_file.name.split(".")[-1]
-        filename = f"{path_prefix}_{identifier}_{uuid.uuid4().hex}.{file_extension}"
-        path = f"{self.get_upload_directory()}/{filename}"
+        """Upload image and its renditions and return the saved path."""
+        # Generate unique file stem; the pipeline picks the extension
+        stem = f"{path_prefix}_{identifier}_{uuid.uuid4().hex}"
 
-        # Validate image
-        if not self._is_valid_image(image_file):
-            raise ValueError(_("Invalid image file"))
+        self.validate_image(image_file)
 
-        # Save image - storage returns the full path
-        full_path = self._storage.save(image_file, path)
+        # Save image - storage returns the full path of the primary file
+        full_path = self._pipeline.store(
+            self._storage, image_file, self.get_upload_directory(), stem
+        )
+        self._url_resolver.invalidate_many(self._pipeline.all_paths(full_path))
         print(f"ImageService.upload_image - Storage saved to: {full_path}")
         
         # Return the full path as saved by storage
@@ -35,17 +40,59 @@ class BaseImageService:
         """Delete image."""
         if not image_path:
             return True
-        return self._storage.delete(image_path)
+        paths = self._pipeline.all_paths(image_path)
+        if len(paths) == 1:
+            deleted = self._storage.delete(image_path)
+        else:
+            deleted = self._storage.delete_many(paths) > 0
+        self._url_resolver.invalidate_many(paths)
+        return deleted
 
     def get_image_url(self, image_path: str) -> str:
         """Get URL for image."""
-        if not image_path:
-            return self._get_default_image_url()
-
-        if self._storage.exists(image_path):
-            return self._storage.url(image_path)
+        return self._url_resolver.resolve(image_path, self._get_default_image_url())
+
+    def get_image_urls(self, image_paths: Iterable[str]) -> Dict[str, str]:
+        """Get URLs for several images in a constant number of storage calls."""
+        return self._url_resolver.resolve_many(
+            image_paths, self._get_default_image_url()
+        )
+
+    def get_image_set(self, image_path: str) -> ImageSet:
+        """Get src/srcset/placeholder URLs for an image and its renditions."""
+        image_set = self.get_image_sets([image_path]).get(image_path)
+        return image_set or self._default_image_set()
+
+    def get_image_sets(self, image_paths: Iterable[str]) -> Dict[str, ImageSet]:
+        """Get image sets for several images with O(1) storage calls."""
+        image_paths = [path for path in image_paths if path]
+        urls = self._url_resolver.resolve_many(
+            [p for path in image_paths for p in self._pipeline.all_paths(path)],
+            self._get_default_image_url(),
+        )
+        return {
+            path: self._pipeline.build_image_set(path, urls) for path in image_paths
+        }
+
+    def delete_images(self, image_paths: Iterable[str]) -> int:
+        """Delete several images and their renditions with one bulk storage call."""
+        paths = [
+            p for path in image_paths if path for p in self._pipeline.all_paths(path)
+        ]
+        if not paths:
+            return 0
+        deleted = self._storage.delete_many(paths)
+        self._url_resolver.invalidate_many(paths)
+        return deleted
+
+    def validate_image(self, image_file: UploadedFile) -> None:
+        """Check size and type without storing anything. Raises ValueError."""
+        if not self._is_valid_image(image_file):
+            raise ValueError(_("Invalid image file"))
 
-        return self._get_default_image_url()
+    def _default_image_set(self) -> ImageSet:
+        default_url = self._get_default_image_url()
+        return ImageSet(src=default_url, card=default_url, detail=default_url)
 
     def _is_valid_image(self, image_file: UploadedFile) -> bool:
         print("Validating image...")
@@ -62,6 +109,11 @@ class BaseImageService:
             print("Unsupported type")
             return False
 
+        # The declared type comes from the client; check the actual bytes too
+        if sniff_image_type(image_file) not in allowed_types:
+            print("Content does not match a supported image type")
+            return False
+
         return True
 
     def get_upload_directory(self) -> str:
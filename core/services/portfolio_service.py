@@ -5,6 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from core.models import ItemPortfolio, FreelancerProfile
 from core.repositories.portfolio_repository import PortfolioRepository
 from .image_service import PortfolioImageService
+from .storage_tasks import ImageUploadScheduler
 
 
 class PortfolioService:
@@ -16,10 +17,12 @@ class PortfolioService:
         self,
         repository: Optional[PortfolioRepository] = None,
         image_service: Optional[PortfolioImageService] = None,
+        upload_scheduler: Optional[ImageUploadScheduler] = None,
     ):
         # DIP injection of repository and image service
         self.repository = repository or PortfolioRepository()
         self.image_service = image_service or PortfolioImageService()
+        self.upload_scheduler = upload_scheduler or ImageUploadScheduler()
 
     def add_item(
         self,
@@ -44,13 +47,15 @@ class PortfolioService:
         if image:
             try:
                 # upload_portfolio_image returns the full path (e.g., "portfolios/portfolio_uuid_hash.jpg")
-                image_path = self.image_service.upload_portfolio_image(
-                    str(item.id), image
+                self.upload_scheduler.schedule(
+                    item,
+                    "image",
+                    image,
+                    upload=lambda f: self.image_service.upload_portfolio_image(
+                        str(item.id), f
+                    ),
+                    validate=self.image_service.validate_image,
                 )
-                print(f"PortfolioService.add_item - Image uploaded to: {image_path}")
-                # Save the full path returned by the storage
-                item.image.name = image_path
-                item.save()
             except ValueError as e:
                 # If image upload fails, delete the created item
                 self.repository.delete(item)
@@ -110,20 +115,23 @@ class PortfolioService:
     def update_portfolio_image(
         self, portfolio_item: ItemPortfolio, image_file: UploadedFile
     ) -> bool:
-        """Update portfolio item image."""
+        """
+        Update portfolio item image. With background uploads enabled the new
+        image is stored after the request; the old one is deleted once the
+        new one is in place.
+        """
         try:
-            # Delete old image if exists
-            if portfolio_item.image:
-                self.image_service.delete_portfolio_image(portfolio_item.image.name)
-
-            # Upload new image - returns full path (e.g., "portfolios/portfolio_uuid_hash.jpg")
-            image_path = self.image_service.upload_portfolio_image(
-                str(portfolio_item.id), image_file
+            # Upload returns the full path (e.g., "portfolios/portfolio_uuid_hash.jpg")
+            self.upload_scheduler.schedule(
+                portfolio_item,
+                "image",
+                image_file,
+                upload=lambda f: self.image_service.upload_portfolio_image(
+                    str(portfolio_item.id), f
+                ),
+                delete=self.image_service.delete_portfolio_image,
+                validate=self.image_service.validate_image,
             )
-            print(f"PortfolioService.update_portfolio_image - Image uploaded to: {image_path}")
-            # Save the full path returned by the storage
-            portfolio_item.image.name = image_path
-            portfolio_item.save()
             return True
 
         except Exception as e:
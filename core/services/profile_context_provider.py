@@ -2,6 +2,7 @@ from typing import Dict, Any
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from .profile_service import ProfileService
+from ..profiles import load_profiles
 from ..forms.profile_forms import (
     ClientProfileForm,
     FreelancerProfileForm,
@@ -30,18 +31,12 @@ class ProfileContextProvider:
             "user_profile": user,
             "profile_image_url": self.profile_service.get_user_profile_image_url(user),
             "user_roles": user.get_roles(),  # Añadir user_roles para compatibilidad con el template
-            "has_freelancer": hasattr(user, "freelancer_profile"),
-            "has_client": hasattr(user, "client_profile"),
+            "has_freelancer": profile_data["has_freelancer"],
+            "has_client": profile_data["has_client"],
             "profiles": {
-                "freelancer": (
-                    user.freelancer_profile
-                    if hasattr(user, "freelancer_profile")
-                    else None
-                ),
+                "freelancer": profile_data["freelancer"],
                 "freelancer_skills": profile_data["freelancer_skills"],
-                "client": (
-                    user.client_profile if hasattr(user, "client_profile") else None
-                ),
+                "client": profile_data["client"],
             },
             "user_portfolios": user_portfolios,
         }
@@ -55,8 +50,9 @@ class ProfileContextProvider:
 
             portfolio_repo = PortfolioRepository()
 
-            if profile_type == "freelancer" and hasattr(user, "freelancer_profile"):
-                items = portfolio_repo.list_by_freelancer(user.freelancer_profile)
+            freelancer = load_profiles(user).freelancer
+            if profile_type == "freelancer" and freelancer:
+                items = portfolio_repo.list_by_freelancer(freelancer)
                 return [item for item in items if getattr(item, "is_public", True)]
 
             return []
@@ -1,9 +1,11 @@
 from typing import Dict, Any, Optional
 from django.core.files.uploadedfile import UploadedFile
 from django.utils.translation import gettext_lazy as _
-from ..services.image_service import ProfileImageService
+from ..services.image_service import ProfileImageService, PortfolioImageService
+from ..services.storage_tasks import ImageUploadScheduler
 from ..repositories.profile_repository import ProfileRepository
 from ..models import User
+from ..profiles import forget_profile, load_profiles
 
 
 class ProfileService:
@@ -14,11 +16,13 @@ class ProfileService:
     def __init__(self, repository: ProfileRepository = None):
         self._repository = repository or ProfileRepository()
         self._image_service = ProfileImageService()
+        self._upload_scheduler = ImageUploadScheduler()
 
     def get_user_profiles(self, user: User) -> Dict[str, Any]:
         """Get all profiles for a user."""
-        freelancer_profile = self._repository.get_freelancer_profile(user)
-        client_profile = self._repository.get_client_profile(user)
+        profiles = load_profiles(user)
+        freelancer_profile = profiles.freelancer
+        client_profile = profiles.client
 
         freelancer_skills = []
         if freelancer_profile and freelancer_profile.skills:
@@ -65,8 +69,12 @@ class ProfileService:
     def delete_freelancer_profile(self, user: User) -> bool:
         """Delete freelancer profile for a user."""
         try:
-            if hasattr(user, "freelancer_profile"):
-                user.freelancer_profile.delete()
+            profile = load_profiles(user).freelancer
+            if profile:
+                image_paths = self._repository.get_freelancer_image_paths(profile)
+                profile.delete()
+                forget_profile(user, "freelancer_profile")
+                self._delete_owned_images(image_paths)
                 return True
             return False
         except Exception as e:
@@ -76,14 +84,40 @@ class ProfileService:
     def delete_client_profile(self, user: User) -> bool:
         """Delete client profile for a user."""
         try:
-            if hasattr(user, "client_profile"):
-                user.client_profile.delete()
+            profile = load_profiles(user).client
+            if profile:
+                image_paths = self._repository.get_client_image_paths(profile)
+                profile.delete()
+                forget_profile(user, "client_profile")
+                self._delete_owned_images(image_paths)
                 return True
             return False
         except Exception as e:
             print(_("Error deleting client profile: %(error)s") % {"error": e})
             return False
 
+    def _delete_owned_images(self, image_paths: Dict[str, list]) -> None:
+        """
+        Remove the images of cascaded rows with one bulk storage call per
+        kind instead of an exists+delete pair per file.
+        """
+        from microservices.services.image_service import MicroserviceImageService
+        from mentorship_session.services.image_service import MentorshipImageService
+        from projects.services.image_service import ProjectImageService
+
+        if image_paths.get("microservices"):
+            MicroserviceImageService().delete_microservice_images(
+                image_paths["microservices"]
+            )
+        if image_paths.get("mentorships"):
+            MentorshipImageService().delete_mentorship_images(
+                image_paths["mentorships"]
+            )
+        if image_paths.get("portfolios"):
+            PortfolioImageService().delete_images(image_paths["portfolios"])
+        if image_paths.get("projects"):
+            ProjectImageService().delete_project_images(image_paths["projects"])
+
     def delete_all_profiles(self, user: User) -> Dict[str, bool]:
         """Delete all profiles for a user."""
         result = {
@@ -93,22 +127,27 @@ class ProfileService:
         return result
 
     def update_user_profile_image(self, user: User, image_file: UploadedFile) -> bool:
-        """Update user profile image using DIP."""
+        """
+        Update user profile image using DIP. The upload may finish after the
+        request returns; the old image is deleted once the new one is stored.
+        """
         try:
-            # Delete old image if exists
-            if user.profile_image:
-                self._image_service.delete_profile_image(user.profile_image.name)
-
-            # Upload new image - returns only filename
             if image_file:
-                filename = self._image_service.upload_profile_image(
-                    user.id, image_file
+                self._upload_scheduler.schedule(
+                    user,
+                    "profile_image",
+                    image_file,
+                    upload=lambda f: self._image_service.upload_profile_image(
+                        user.id, f
+                    ),
+                    delete=self._image_service.delete_profile_image,
+                    validate=self._image_service.validate_image,
                 )
-                # Assign only the filename - ImageField will handle the upload_to path
-                user.profile_image.name = filename
-            else:
-                user.profile_image = None
+                return True
 
+            if user.profile_image:
+                self._image_service.delete_profile_image(user.profile_image.name)
+            user.profile_image = None
             user.save()
             return True
 
@@ -142,10 +181,10 @@ class ProfileService:
 
     def get_primary_role(self, user: User) -> Optional[str]:
         """Get primary role for user."""
-        profiles = self.get_user_profiles(user)
-        if profiles["has_freelancer"]:
+        profiles = load_profiles(user)
+        if profiles.has_freelancer:
             return "freelancer"
-        elif profiles["has_client"]:
+        elif profiles.has_client:
             return "client"
         return None
 
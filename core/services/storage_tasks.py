@@ -0,0 +1,278 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import close_old_connections, connections, models, transaction
+from .image_pipeline import ImageRenditionPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundStorageExecutor:
+    """
+    Bounded thread pool for storage transfers that should not hold a request
+    worker. When the pending queue is full, jobs run inline (back-pressure)
+    instead of piling up in memory, or are dropped when inline_when_full is
+    False (for work that a later request will schedule again).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        inline_when_full: bool = True,
+        thread_name_prefix: str = "storage",
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._inline_when_full = inline_when_full
+
+    def submit(
+        self,
+        job: Callable[[], Any],
+        description: str = "storage job",
+        on_failure: Callable[[], Any] = None,
+    ) -> bool:
+        """
+        Run job in the pool, retrying on error; on_failure runs if all fail.
+        Returns False if the queue was full and the job was dropped.
+        """
+        if not self._slots.acquire(blocking=False):
+            if not self._inline_when_full:
+                logger.warning("Queue full, skipping %s", description)
+                return False
+            logger.warning("Storage queue full, running %s inline", description)
+            self._run(job, description, on_failure, in_worker=False)
+            return True
+        self._executor.submit(self._run, job, description, on_failure, True)
+        return True
+
+    def _run(
+        self,
+        job: Callable[[], Any],
+        description: str,
+        on_failure: Optional[Callable[[], Any]],
+        in_worker: bool,
+    ) -> None:
+        if in_worker:
+            close_old_connections()
+        try:
+            for attempt in range(1, self._max_retries + 1):
+                try:
+                    job()
+                    return
+                except Exception:
+                    if attempt == self._max_retries:
+                        logger.exception(
+                            "%s failed after %d attempts", description, attempt
+                        )
+                        if on_failure:
+                            on_failure()
+                        return
+                    logger.warning(
+                        "%s failed (attempt %d), retrying", description, attempt
+                    )
+                    time.sleep(min(self._retry_delay * 2 ** (attempt - 1), 10))
+        finally:
+            if in_worker:
+                self._slots.release()
+                # Worker threads must not keep connections open between jobs
+                connections.close_all()
+
+
+_executor: Optional[BackgroundStorageExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_storage_executor() -> BackgroundStorageExecutor:
+    """Return the executor shared by this process."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BackgroundStorageExecutor(
+                    max_workers=getattr(settings, "STORAGE_ASYNC_WORKERS", 2),
+                    max_pending=getattr(settings, "STORAGE_ASYNC_MAX_PENDING", 16),
+                    max_retries=getattr(settings, "STORAGE_ASYNC_MAX_RETRIES", 3),
+                )
+    return _executor
+
+
+class SpooledUpload:
+    """A copy of an upload on local disk that outlives the request."""
+
+    def __init__(self, image_file: UploadedFile):
+        self.name = image_file.name
+        self.content_type = image_file.content_type
+        self.size = image_file.size
+        spool = tempfile.NamedTemporaryFile(
+            prefix="upload_",
+            dir=getattr(settings, "STORAGE_ASYNC_SPOOL_DIR", None),
+            delete=False,
+        )
+        with spool:
+            for chunk in image_file.chunks():
+                spool.write(chunk)
+        self.path = spool.name
+
+    def open(self) -> UploadedFile:
+        return UploadedFile(
+            file=open(self.path, "rb"),
+            name=self.name,
+            content_type=self.content_type,
+            size=self.size,
+        )
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ImageUploadScheduler:
+    """
+    Replaces the image stored in a model field, either inline or in the
+    background (STORAGE_ASYNC_UPLOADS). In background mode the request only
+    spools the bytes; the field is updated once the upload has finished and
+    the previous image is deleted afterwards, so readers never see a gap.
+    The image header and the service's own checks (validate) run before
+    spooling, so invalid files are still rejected in the request.
+    """
+
+    def __init__(self, executor: BackgroundStorageExecutor = None):
+        self._executor = executor
+        self._pipeline = ImageRenditionPipeline()
+
+    @property
+    def is_async(self) -> bool:
+        return getattr(settings, "STORAGE_ASYNC_UPLOADS", False)
+
+    def schedule(
+        self,
+        instance: models.Model,
+        field_name: str,
+        image_file: UploadedFile,
+        upload: Callable[[UploadedFile], str],
+        delete: Callable[[str], Any] = None,
+        validate: Callable[[UploadedFile], Any] = None,
+    ) -> None:
+        """
+        Upload image_file with upload() and store the returned path on
+        instance.field_name; delete() is then called with the old path.
+        validate() should raise the same error upload() would for a
+        rejected file. The instance must already be saved. Raises
+        ValueError if image_file is not a valid image.
+        """
+        old_path = self._current_path(instance, field_name)
+
+        if not self.is_async:
+            new_path = upload(image_file)
+            setattr(instance, field_name, new_path)
+            type(instance).objects.filter(pk=instance.pk).update(
+                **{field_name: new_path}
+            )
+            if old_path and delete:
+                delete(old_path)
+            return
+
+        # Only the transcode and upload are deferred; reject bad files now
+        if validate:
+            validate(image_file)
+        self._pipeline.verify(image_file)
+        spooled = SpooledUpload(image_file)
+        model = type(instance)
+        pk = instance.pk
+        # Keep the instance consistent with the database until the job runs
+        setattr(instance, field_name, old_path)
+
+        def job():
+            try:
+                with spooled.open() as spooled_file:
+                    new_path = upload(spooled_file)
+            except (ValueError, ValidationError):
+                # Failed the image service's own checks: retrying will not help
+                logger.warning(
+                    "Discarding invalid upload for %s %s", model.__name__, pk
+                )
+                spooled.discard()
+                return
+            # Only replace the value this job was scheduled against, so an
+            # older job finishing late cannot overwrite a newer image.
+            updated = (
+                model.objects.filter(pk=pk)
+                .filter(self._path_filter(field_name, old_path))
+                .update(**{field_name: new_path})
+            )
+            spooled.discard()
+            if not updated:
+                if delete:
+                    delete(new_path)
+                return
+            if old_path and delete:
+                delete(old_path)
+
+        executor = self._executor or get_storage_executor()
+        transaction.on_commit(
+            lambda: executor.submit(
+                job,
+                f"image upload for {model.__name__} {pk}",
+                on_failure=spooled.discard,
+            )
+        )
+
+    @staticmethod
+    def _current_path(instance: models.Model, field_name: str) -> Optional[str]:
+        # Read the stored value: a bound ModelForm may already have replaced
+        # the attribute on the instance with the new, uncommitted upload.
+        return (
+            type(instance)
+            .objects.filter(pk=instance.pk)
+            .values_list(field_name, flat=True)
+            .first()
+        ) or None
+
+    @staticmethod
+    def _path_filter(field_name: str, old_path: Optional[str]) -> models.Q:
+        if old_path:
+            return models.Q(**{field_name: old_path})
+        return models.Q(**{f"{field_name}__isnull": True}) | models.Q(
+            **{field_name: ""}
+        )
+
+
+def cleanup_spool_dir(max_age_seconds: int = 24 * 3600) -> int:
+    """
+    Remove spool files left behind by workers that exited mid-job.
+    Run periodically through the cleanup_upload_spool management command.
+    """
+    spool_dir = (
+        getattr(settings, "STORAGE_ASYNC_SPOOL_DIR", None) or tempfile.gettempdir()
+    )
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(spool_dir):
+        if (
+            entry.is_file()
+            and entry.name.startswith("upload_")
+            and entry.stat().st_mtime < cutoff
+        ):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # A worker finished (and discarded it) in the meantime
+                continue
+            removed += 1
+    return removed
@@ -0,0 +1,257 @@
+import hashlib
+import mmap
+import os
+import posixpath
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from cachetools import TTLCache
+from django.core.files.base import File
+from django.core.files.uploadedfile import UploadedFile
+from django.urls import reverse
+from ..interfaces.storage_interface import StorageInterface
+
+
+class DiskLRUCache:
+    """
+    Size-bounded least-recently-used cache of object bytes on local disk.
+    Entries are written to a temporary file and renamed into place, so
+    readers in other threads or worker processes never see partial files.
+    Worker processes sharing the directory share the byte budget: every
+    write re-reads entry sizes from the directory before evicting.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the local file for key, or None on a miss."""
+        filename = self._filename(key)
+        with self._lock:
+            if filename in self._entries:
+                if os.path.exists(self._file(filename)):
+                    self._entries.move_to_end(filename)
+                    return self._file(filename)
+                # Evicted by another worker process
+                self._total -= self._entries.pop(filename)
+        return None
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> str:
+        """Store the streamed content for key and return the local file."""
+        filename = self._filename(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, self._file(filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._total -= self._entries.pop(filename, 0)
+            self._entries[filename] = size
+            self._total += size
+            self._sync()
+            self._evict()
+        return self._file(filename)
+
+    def discard(self, key: str) -> None:
+        filename = self._filename(key)
+        with self._lock:
+            self._total -= self._entries.pop(filename, 0)
+        try:
+            os.remove(self._file(filename))
+        except FileNotFoundError:
+            pass
+
+    @property
+    def size(self) -> int:
+        return self._total
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            filename, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._file(filename))
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> None:
+        """Index files left by earlier processes, oldest access first."""
+        with self._lock:
+            self._sync()
+            self._evict()
+
+    def _sync(self) -> None:
+        """
+        Rebuild the index from the directory, so files written or evicted
+        by other worker processes count against the budget. Files this
+        process has not used go first in eviction order, oldest access first.
+        """
+        on_disk = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                if entry.is_file():
+                    on_disk[entry.name] = entry.stat()
+            except FileNotFoundError:
+                # Evicted by another worker process during the scan
+                continue
+
+        foreign = sorted(
+            (name for name in on_disk if name not in self._entries),
+            key=lambda name: on_disk[name].st_atime,
+        )
+        entries = OrderedDict((name, on_disk[name].st_size) for name in foreign)
+        for name in self._entries:
+            if name in on_disk:
+                entries[name] = on_disk[name].st_size
+        self._entries = entries
+        self._total = sum(entries.values())
+
+    def _filename(self, key: str) -> str:
+        extension = posixpath.splitext(key)[1].lower()
+        return hashlib.sha256(key.encode()).hexdigest() + extension
+
+    def _file(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+
+_shared_state: Dict[str, tuple] = {}
+_shared_lock = threading.Lock()
+
+
+class CachedStorage(StorageInterface):
+    """
+    Read-through disk cache tier in front of a remote storage. Reads are
+    served from memory-mapped local copies, existence checks are cached for
+    exists_ttl seconds, and writes go through to the remote storage first.
+
+    State is shared per cache directory, so every CachedStorage instance
+    in a process uses the same index and byte budget.
+    """
+
+    COPY_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        remote: StorageInterface,
+        cache_dir: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        exists_ttl: int = 300,
+        serve_locally: bool = False,
+    ):
+        self._remote = remote
+        self._serve_locally = serve_locally
+        with _shared_lock:
+            if cache_dir not in _shared_state:
+                _shared_state[cache_dir] = (
+                    DiskLRUCache(cache_dir, max_bytes),
+                    TTLCache(maxsize=8192, ttl=exists_ttl),
+                    threading.Lock(),
+                )
+        self._disk, self._exists, self._exists_lock = _shared_state[cache_dir]
+
+    @property
+    def serves_locally(self) -> bool:
+        """Whether URLs point at core:cached_media instead of the remote."""
+        return self._serve_locally
+
+    def save(self, file: UploadedFile, path: str) -> str:
+        saved_path = self._remote.save(file, path)
+        # Objects are usually read back right after upload (redirect to a
+        # page showing them), so populate the cache from the local bytes.
+        file.seek(0)
+        self._disk.put(saved_path, iter(lambda: file.read(self.COPY_CHUNK_SIZE), b""))
+        self._remember({saved_path: True})
+        return saved_path
+
+    def open(self, path: str) -> File:
+        """Open path for reading from a memory-mapped local copy."""
+        local_file = self._disk.get(path)
+        if local_file is None:
+            remote_file = self._remote.open(path)
+            try:
+                local_file = self._disk.put(path, remote_file.chunks())
+            finally:
+                remote_file.close()
+            self._remember({path: True})
+        return self._map(local_file, path)
+
+    def delete(self, path: str) -> bool:
+        deleted = self._remote.delete(path)
+        self._disk.discard(path)
+        self._remember({path: False})
+        return deleted
+
+    def delete_many(self, paths: Iterable[str]) -> int:
+        paths = [path for path in set(paths) if path]
+        deleted = self._remote.delete_many(paths)
+        for path in paths:
+            self._disk.discard(path)
+        self._remember({path: False for path in paths})
+        return deleted
+
+    def url(self, path: str) -> str:
+        return self.public_url(path) or self._remote.url(path)
+
+    def url_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        if not self._serve_locally:
+            return self._remote.url_many(paths)
+        return {path: self.public_url(path) for path in set(paths) if path}
+
+    def public_url(self, path: str) -> Optional[str]:
+        if self._serve_locally:
+            return reverse("core:cached_media", args=[path])
+        return self._remote.public_url(path)
+
+    def exists(self, path: str) -> bool:
+        return self.exists_many([path]).get(path, False)
+
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        paths = {path for path in paths if path}
+        result = {}
+        with self._exists_lock:
+            for path in paths:
+                if path in self._exists:
+                    result[path] = self._exists[path]
+        missing = [path for path in paths if path not in result]
+        for path in list(missing):
+            if self._disk.get(path):
+                result[path] = True
+                missing.remove(path)
+        if missing:
+            found = self._remote.exists_many(missing)
+            self._remember(found)
+            result.update(found)
+        return result
+
+    def _remember(self, results: Dict[str, bool]) -> None:
+        with self._exists_lock:
+            self._exists.update(results)
+
+    @staticmethod
+    def _map(local_file: str, name: str) -> File:
+        with open(local_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                # Empty files cannot be memory-mapped
+                return File(open(local_file, "rb"), name=name)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The mapping stays valid even if the file is evicted meanwhile
+        mapped_file = File(mapped, name=name)
+        mapped_file.size = size
+        return mapped_file
@@ -0,0 +1,159 @@
+import posixpath
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.core.files.base import File
+from django.core.files.uploadedfile import UploadedFile
+from ..interfaces.storage_interface import StorageInterface
+from ..models import StoredBlob, StoredObject
+from .streaming import StreamingReader
+
+
+class ContentAddressedStorage(StorageInterface):
+    """
+    Deduplicating storage wrapper. Content is written once to the inner
+    storage under its SHA-256 digest; callers keep using their own logical
+    paths, which are mapped to blobs in the database with reference counts.
+    Saving bytes that are already stored is a metadata-only write, and a
+    blob is removed from the inner storage when its last reference goes.
+
+    Paths with no mapping (files written before this backend was enabled)
+    are passed straight through to the inner storage.
+    """
+
+    BLOB_DIRECTORY = "cas"
+    HASH_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, inner: StorageInterface):
+        self._inner = inner
+
+    def save(self, file: UploadedFile, path: str) -> str:
+        """Store file under logical path and return the path."""
+        digest, size, content_type = self._digest(file)
+        # A concurrent first upload of the same content can win the insert;
+        # the retry then finds its blob and only adds a reference.
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    self._link(path, digest, size, content_type, file)
+                return path
+            except IntegrityError:
+                if attempt:
+                    raise
+
+    def delete(self, path: str) -> bool:
+        """Drop a reference; the content goes when no references remain."""
+        return self.delete_many([path]) > 0
+
+    def delete_many(self, paths: Iterable[str]) -> int:
+        paths = {path for path in paths if path}
+        if not paths:
+            return 0
+
+        with transaction.atomic():
+            references = list(
+                StoredObject.objects.select_for_update()
+                .filter(path__in=paths)
+                .values_list("path", "blob_id")
+            )
+            released = Counter(blob_id for _, blob_id in references)
+            StoredObject.objects.filter(path__in=[p for p, _ in references]).delete()
+            orphans = self._release(released)
+
+        if orphans:
+            transaction.on_commit(lambda: self._inner.delete_many(orphans))
+
+        unmapped = paths - {path for path, _ in references}
+        return len(references) + (self._inner.delete_many(unmapped) if unmapped else 0)
+
+    def url(self, path: str) -> str:
+        return self.url_many([path]).get(path, "")
+
+    def url_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Resolve logical paths to blob URLs with one query."""
+        blob_paths = self._blob_paths(paths)
+        inner_urls = self._inner.url_many(set(blob_paths.values()))
+        return {
+            path: inner_urls.get(blob_path, "")
+            for path, blob_path in blob_paths.items()
+        }
+
+    def open(self, path: str) -> File:
+        return self._inner.open(self._blob_paths([path])[path])
+
+    def exists(self, path: str) -> bool:
+        return self.exists_many([path]).get(path, False)
+
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        paths = {path for path in paths if path}
+        mapped = set(
+            StoredObject.objects.filter(path__in=paths).values_list("path", flat=True)
+        )
+        result = {path: True for path in mapped}
+        unmapped = paths - mapped
+        if unmapped:
+            result.update(self._inner.exists_many(unmapped))
+        return result
+
+    def _link(self, path, digest, size, content_type, file) -> None:
+        blob = StoredBlob.objects.select_for_update().filter(pk=digest).first()
+        if blob is None:
+            blob = StoredBlob.objects.create(
+                sha256=digest,
+                path=self._inner.save(file, self._blob_path(digest, path)),
+                size=size,
+                content_type=content_type,
+            )
+
+        previous = (
+            StoredObject.objects.select_for_update()
+            .filter(path=path)
+            .values_list("blob_id", flat=True)
+            .first()
+        )
+        if previous == digest:
+            return
+
+        StoredBlob.objects.filter(pk=digest).update(ref_count=F("ref_count") + 1)
+        StoredObject.objects.update_or_create(path=path, defaults={"blob": blob})
+        # Release the old content only once the path no longer points at it
+        if previous is not None:
+            orphans = self._release(Counter([previous]))
+            if orphans:
+                transaction.on_commit(lambda: self._inner.delete_many(orphans))
+
+    def _release(self, released: Counter) -> List[str]:
+        """Decrement blob reference counts and return paths of unused blobs."""
+        for blob_id, count in released.items():
+            StoredBlob.objects.filter(pk=blob_id).update(
+                ref_count=F("ref_count") - count
+            )
+        unused = StoredBlob.objects.filter(
+            pk__in=released, ref_count=0, references__isnull=True
+        )
+        orphans = list(unused.values_list("path", flat=True))
+        unused.delete()
+        return orphans
+
+    def _blob_paths(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Map logical paths to inner storage keys; unmapped paths map to themselves."""
+        paths = {path for path in paths if path}
+        blob_paths = {path: path for path in paths}
+        blob_paths.update(
+            StoredObject.objects.filter(path__in=paths).values_list(
+                "path", "blob__path"
+            )
+        )
+        return blob_paths
+
+    def _blob_path(self, digest: str, path: str) -> str:
+        extension = posixpath.splitext(path)[1].lower()
+        return f"{self.BLOB_DIRECTORY}/{digest[:2]}/{digest}{extension}"
+
+    def _digest(self, file: UploadedFile) -> Tuple[str, int, str]:
+        reader = StreamingReader(file, chunk_size=self.HASH_CHUNK_SIZE)
+        for _ in reader:
+            pass
+        file.seek(0)
+        return reader.sha256, reader.size, reader.content_type
@@ -1,20 +1,80 @@
+import posixpath
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+from django.conf import settings
+from django.core.files.base import File
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import UploadedFile
+from google.api_core.exceptions import GoogleAPICallError, RetryError, ServerError
+from google.cloud.storage.retry import DEFAULT_RETRY
+from requests import RequestException
+from ..http import client_options
 from ..interfaces.storage_interface import StorageInterface
+from .streaming import StreamedFile, StreamingReader
 
 
 class GCSStorage(StorageInterface):
     """Google Cloud Storage implementation using django-storages backend."""
 
+    # Google recommends at most 100 calls per JSON API batch request
+    BATCH_SIZE = 100
+    # exists_many lists at most this many objects per requested name
+    RANGE_LISTING_FACTOR = 4
+    # Resumable upload chunks must be a multiple of 256 KiB
+    CHUNK_ALIGNMENT = 256 * 1024
+
     def save(self, file: UploadedFile, path: str) -> str:
         """
         Save file to GCS.
         Returns the full path as saved in storage.
         """
-        saved_path = default_storage.save(path, file)
+        saved_path = self.save_stream(file, path).name
         print(f"GCSStorage.save - Input path: {path}, Saved path: {saved_path}")
         return saved_path
 
+    def save_stream(self, file: UploadedFile, path: str) -> StreamedFile:
+        """
+        Stream file to GCS through a resumable upload session, one chunk at a
+        time. The content hash, size limit and content type are computed in
+        the same pass; if validation fails mid-stream the session is
+        cancelled and nothing is stored.
+        """
+        chunk_size = self._chunk_size()
+        reader = StreamingReader(
+            file,
+            chunk_size=chunk_size,
+            max_size=getattr(settings, "GCS_UPLOAD_MAX_SIZE", None),
+        )
+        name = default_storage.get_available_name(path)
+        blob = default_storage.bucket.blob(name)
+
+        # Files that fit in one chunk go up in a single multipart request
+        chunks = iter(reader)
+        buffered = b""
+        for chunk in chunks:
+            buffered += chunk
+            if len(buffered) >= chunk_size:
+                break
+        else:
+            blob.upload_from_string(
+                buffered, content_type=reader.content_type, retry=DEFAULT_RETRY
+            )
+            return reader.result(name)
+
+        # Failed chunks are retried within the session instead of restarting
+        with blob.open(
+            "wb",
+            chunk_size=chunk_size,
+            content_type=reader.content_type,
+            ignore_flush=True,
+            retry=DEFAULT_RETRY,
+        ) as writer:
+            writer.write(buffered)
+            for chunk in chunks:
+                writer.write(chunk)
+        return reader.result(name)
+
     def delete(self, path: str) -> bool:
         """Delete file from GCS."""
         try:
@@ -29,12 +89,136 @@ class GCSStorage(StorageInterface):
         """Get public URL for GCS file."""
         try:
             return default_storage.url(path)
+        except (GoogleAPICallError, RequestException, RetryError):
+            # Let callers (and their circuit breaker) see that GCS is failing
+            raise
         except Exception:
             return ""
 
+    def open(self, path: str) -> File:
+        """Open file for reading."""
+        return default_storage.open(path, "rb")
+
     def exists(self, path: str) -> bool:
         """Check if file exists in GCS."""
         try:
             return default_storage.exists(path)
+        except (GoogleAPICallError, RequestException, RetryError):
+            # A transport failure is not a missing file: don't report False
+            raise
         except Exception:
             return False
+
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check existence with one bounded range listing per directory
+        instead of one metadata GET per file. The listing stops after
+        RANGE_LISTING_FACTOR objects per requested name; names it did not
+        reach (a sparse set in a busy directory) are checked with batched
+        metadata GETs.
+        """
+        paths = [path for path in set(paths) if path]
+        result = {path: False for path in paths}
+
+        by_directory = defaultdict(list)
+        for path in paths:
+            by_directory[posixpath.dirname(path)].append(path)
+
+        try:
+            unresolved = []
+            for names in by_directory.values():
+                names.sort()
+                limit = len(names) * self.RANGE_LISTING_FACTOR
+                blobs = default_storage.bucket.list_blobs(
+                    prefix=posixpath.commonprefix(names),
+                    start_offset=names[0],
+                    end_offset=names[-1] + "\x00",
+                    max_results=limit,
+                    fields="items(name),nextPageToken",
+                    timeout=self._timeout(),
+                )
+                wanted = set(names)
+                listed, last_name = 0, None
+                for blob in blobs:
+                    listed += 1
+                    last_name = blob.name
+                    if blob.name in wanted:
+                        result[blob.name] = True
+                if listed >= limit:
+                    # The range was cut short: names past it are still unknown
+                    unresolved.extend(name for name in names if name > last_name)
+            result.update(self._exists_batch(unresolved))
+        except (RequestException, ServerError, RetryError):
+            # GCS itself is failing: per-file checks would only wait longer
+            raise
+        except Exception:
+            # Fall back to per-file checks rather than reporting false negatives
+            return {path: self.exists(path) for path in paths}
+
+        return result
+
+    def _exists_batch(self, names: List[str]) -> Dict[str, bool]:
+        """Metadata GETs for names, sent in JSON API batches of BATCH_SIZE."""
+        bucket = default_storage.bucket
+        client = default_storage.client
+        result = {}
+        for start in range(0, len(names), self.BATCH_SIZE):
+            blobs = [
+                bucket.blob(name) for name in names[start : start + self.BATCH_SIZE]
+            ]
+            with client.batch(raise_exception=False):
+                for blob in blobs:
+                    blob.reload(timeout=self._timeout())
+            # Found objects get their metadata; missing ones only an error body
+            result.update({blob.name: blob.generation is not None for blob in blobs})
+        return result
+
+    def url_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Get URLs for several GCS files (built locally, no existence check)."""
+        return {
+            path: self.public_url(path) or self.url(path) for path in set(paths) if path
+        }
+
+    def delete_many(self, paths: Iterable[str]) -> int:
+        """
+        Delete files using JSON API batch requests (up to BATCH_SIZE per call).
+        Missing objects are treated as already deleted.
+        """
+        paths = sorted({path for path in paths if path})
+        if not paths:
+            return 0
+
+        bucket = default_storage.bucket
+        client = default_storage.client
+        deleted = 0
+        for start in range(0, len(paths), self.BATCH_SIZE):
+            chunk = paths[start : start + self.BATCH_SIZE]
+            try:
+                with client.batch(raise_exception=False):
+                    for path in chunk:
+                        bucket.delete_blob(path)
+                deleted += len(chunk)
+            except Exception:
+                deleted += sum(1 for path in chunk if self.delete(path))
+        return deleted
+
+    def _chunk_size(self) -> int:
+        chunk_size = getattr(settings, "GCS_UPLOAD_CHUNK_SIZE", 1024 * 1024)
+        # Round up to the alignment the resumable upload API requires
+        return -(-chunk_size // self.CHUNK_ALIGNMENT) * self.CHUNK_ALIGNMENT
+
+    def _timeout(self):
+        options = client_options("storage")
+        return (options["connect_timeout"], options["read_timeout"])
+
+    def public_url(self, path: str) -> Optional[str]:
+        """
+        Build the public object URL locally when the bucket serves unsigned
+        URLs (GS_QUERYSTRING_AUTH=False); signed URLs still need the backend.
+        """
+        if getattr(settings, "GS_QUERYSTRING_AUTH", True):
+            return None
+        base_url = settings.MEDIA_URL or (
+            f"https://storage.googleapis.com/{settings.GS_BUCKET_NAME}/"
+        )
+        return f"{base_url}{quote(path.lstrip('/'), safe='/~')}"
@@ -1,3 +1,7 @@
+import posixpath
+from collections import defaultdict
+from typing import Dict, Iterable
+from django.core.files.base import File
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import UploadedFile
 from ..interfaces.storage_interface import StorageInterface
@@ -23,6 +27,45 @@ class LocalStorage(StorageInterface):
         """Get URL for local file."""
         return default_storage.url(path)
 
+    def open(self, path: str) -> File:
+        """Open file for reading."""
+        return default_storage.open(path, "rb")
+
     def exists(self, path: str) -> bool:
         """Check if file exists locally."""
         return default_storage.exists(path)
+
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        """Check existence with a single scan of each directory involved."""
+        by_directory = defaultdict(list)
+        for path in set(paths):
+            if path:
+                by_directory[posixpath.dirname(path)].append(path)
+
+        result = {}
+        for directory, dir_paths in by_directory.items():
+            try:
+                _dirs, files = default_storage.listdir(directory)
+                present = set(files)
+            except (FileNotFoundError, NotADirectoryError):
+                present = set()
+            for path in dir_paths:
+                result[path] = posixpath.basename(path) in present
+        return result
+
+    def url_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Get URLs for several local files."""
+        return {path: default_storage.url(path) for path in set(paths) if path}
+
+    def delete_many(self, paths: Iterable[str]) -> int:
+        """Delete several local files."""
+        existing = self.exists_many(paths)
+        deleted = 0
+        for path, found in existing.items():
+            if found:
+                try:
+                    default_storage.delete(path)
+                    deleted += 1
+                except Exception:
+                    pass
+        return deleted
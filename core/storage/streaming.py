@@ -0,0 +1,91 @@
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+from django.utils.translation import gettext_lazy as _
+
+# Leading bytes of the image formats accepted by the image services
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+SNIFF_BYTES = 4096
+
+
+def sniff_content_type(header: bytes) -> Optional[str]:
+    """Detect the image type from the first bytes of a file."""
+    for signature, content_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def sniff_image_type(file: BinaryIO) -> Optional[str]:
+    """Read the head of file, detect its image type and rewind."""
+    try:
+        file.seek(0)
+        return sniff_content_type(file.read(SNIFF_BYTES))
+    finally:
+        file.seek(0)
+
+
+@dataclass
+class StreamedFile:
+    """Outcome of a streaming save."""
+
+    name: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+class StreamingReader:
+    """
+    Reads an upload once in fixed-size chunks, hashing it and enforcing
+    max_size as it goes, so memory use is bounded by chunk_size. The first
+    SNIFF_BYTES are buffered up front to detect the real content type
+    before anything is sent to storage.
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int, max_size: Optional[int] = None):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_size = max_size
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+        if hasattr(file, "seek"):
+            file.seek(0)
+        self._head = self._read(SNIFF_BYTES)
+        self.content_type = (
+            sniff_content_type(self._head)
+            or getattr(file, "content_type", None)
+            or "application/octet-stream"
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        data = self._head
+        self._head = b""
+        while data:
+            self._consume(data)
+            yield data
+            data = self._read(self._chunk_size)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def result(self, name: str) -> StreamedFile:
+        return StreamedFile(name, self.size, self.sha256, self.content_type)
+
+    def _read(self, size: int) -> bytes:
+        return self._file.read(size) or b""
+
+    def _consume(self, data: bytes) -> None:
+        self.size += len(data)
+        if self._max_size is not None and self.size > self._max_size:
+            raise ValueError(_("File is too large"))
+        self._hash.update(data)
@@ -0,0 +1,175 @@
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from cachetools import TTLCache
+from django.conf import settings
+from ..http import CircuitBreaker, get_circuit_breaker
+from ..interfaces.storage_interface import StorageInterface
+
+logger = logging.getLogger(__name__)
+
+
+class ImageURLCache:
+    """
+    Process-local TTL/LRU cache of storage path -> URL.
+    Missing paths are remembered in a separate, shorter-lived negative cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 300, negative_ttl: int = 60):
+        self._urls = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._missing = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[bool, Optional[str]]:
+        """Return (hit, url). A hit with url None means the path is known missing."""
+        with self._lock:
+            url = self._urls.get(key)
+            if url is not None:
+                return True, url
+            if key in self._missing:
+                return True, None
+            return False, None
+
+    def set(self, key, url: str) -> None:
+        with self._lock:
+            self._missing.pop(key, None)
+            self._urls[key] = url
+
+    def set_missing(self, key) -> None:
+        with self._lock:
+            self._urls.pop(key, None)
+            self._missing[key] = True
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._urls.pop(key, None)
+            self._missing.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._urls.clear()
+            self._missing.clear()
+
+
+_url_cache: Optional[ImageURLCache] = None
+_url_cache_lock = threading.Lock()
+
+
+def get_url_cache() -> ImageURLCache:
+    """Return the cache shared by every image service in this process."""
+    global _url_cache
+    if _url_cache is None:
+        with _url_cache_lock:
+            if _url_cache is None:
+                _url_cache = ImageURLCache(
+                    maxsize=getattr(settings, "IMAGE_URL_CACHE_SIZE", 1024),
+                    ttl=getattr(settings, "IMAGE_URL_CACHE_TTL", 300),
+                    negative_ttl=getattr(settings, "IMAGE_URL_NEGATIVE_CACHE_TTL", 60),
+                )
+    return _url_cache
+
+
+class ImageURLResolver:
+    """
+    Resolves storage paths to URLs without a storage round-trip per call.
+
+    Storages that can build public URLs deterministically skip the lookup
+    entirely; otherwise exists()/url() results are cached per path. Lookups
+    go through the "storage" circuit breaker: while the storage is failing,
+    uncached paths get the default URL instead of waiting on it.
+    """
+
+    def __init__(
+        self,
+        storage: StorageInterface,
+        cache: ImageURLCache = None,
+        breaker: CircuitBreaker = None,
+    ):
+        self._storage = storage
+        self._cache = cache or get_url_cache()
+        self._breaker = breaker or get_circuit_breaker("storage")
+
+    def resolve(self, path: Optional[str], default_url: str) -> str:
+        """Return the URL for path, or default_url if it is empty or missing."""
+        if not path:
+            return default_url
+
+        public_url = self._storage.public_url(path)
+        if public_url:
+            return public_url
+
+        key = self._cache_key(path)
+        hit, url = self._cache.get(key)
+        if hit:
+            return url or default_url
+
+        try:
+            url = self._breaker.call(self._lookup, path)
+        except Exception as e:
+            # Degraded storage: fall back without caching the miss
+            logger.warning(f"Image URL lookup failed for {path}: {e}")
+            return default_url
+        if url:
+            self._cache.set(key, url)
+            return url
+
+        self._cache.set_missing(key)
+        return default_url
+
+    def resolve_many(self, paths: Iterable[str], default_url: str) -> Dict[str, str]:
+        """
+        Resolve several paths with at most one exists_many/url_many pair for
+        the cache misses, so a page of images costs O(1) storage round-trips.
+        """
+        result = {}
+        misses = []
+        for path in set(paths):
+            if not path:
+                continue
+            public_url = self._storage.public_url(path)
+            if public_url:
+                result[path] = public_url
+                continue
+            hit, url = self._cache.get(self._cache_key(path))
+            if hit:
+                result[path] = url or default_url
+            else:
+                misses.append(path)
+
+        if misses:
+            try:
+                urls = self._breaker.call(self._lookup_many, misses)
+            except Exception as e:
+                logger.warning(f"Image URL lookup failed for {len(misses)} paths: {e}")
+                result.update((path, default_url) for path in misses)
+                return result
+            for path in misses:
+                url = urls.get(path)
+                if url:
+                    self._cache.set(self._cache_key(path), url)
+                    result[path] = url
+                else:
+                    self._cache.set_missing(self._cache_key(path))
+                    result[path] = default_url
+
+        return result
+
+    def _lookup(self, path: str) -> Optional[str]:
+        return self._storage.url(path) if self._storage.exists(path) else None
+
+    def _lookup_many(self, paths: list) -> Dict[str, str]:
+        existing = self._storage.exists_many(paths)
+        found = [path for path in paths if existing.get(path)]
+        return self._storage.url_many(found) if found else {}
+
+    def invalidate(self, path: Optional[str]) -> None:
+        """Forget any cached result for path (call after upload or delete)."""
+        if path:
+            self._cache.invalidate(self._cache_key(path))
+
+    def invalidate_many(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self.invalidate(path)
+
+    def _cache_key(self, path: str):
+        return (self._storage.__class__.__name__, path)
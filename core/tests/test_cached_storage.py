@@ -0,0 +1,148 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import Mock, patch
+from core.storage.cached_storage import CachedStorage, DiskLRUCache
+from core.storage.local_storage import LocalStorage
+
+
+class CachedStorageTest(TestCase):
+    """Tests for the disk cache tier using LocalStorage as the remote"""
+
+    def setUp(self):
+        """Point the default storage and the cache at throwaway directories"""
+        self.media_root = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            STORAGES={
+                "default": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": self.media_root},
+                },
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+                },
+            }
+        )
+        self.settings_override.enable()
+        self.remote = Mock(wraps=LocalStorage())
+        self.storage = CachedStorage(self.remote, cache_dir=self.cache_dir)
+        LocalStorage().save(ContentFile(b"hot image"), "projects/a.jpg")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_repeated_reads_hit_remote_once(self):
+        """Test that reads are served from the memory-mapped local copy"""
+        # Act
+        first = self.storage.open("projects/a.jpg")
+        second = self.storage.open("projects/a.jpg")
+
+        # Assert
+        self.assertEqual(first.read(), b"hot image")
+        self.assertEqual(second.read(), b"hot image")
+        self.assertEqual(second.size, 9)
+        self.remote.open.assert_called_once_with("projects/a.jpg")
+
+    def test_exists_results_are_cached(self):
+        """Test that existence checks reach the remote once per path"""
+        # Act
+        self.storage.exists("projects/a.jpg")
+        self.storage.exists("projects/missing.jpg")
+        result = self.storage.exists_many(["projects/a.jpg", "projects/missing.jpg"])
+
+        # Assert
+        self.assertEqual(
+            result, {"projects/a.jpg": True, "projects/missing.jpg": False}
+        )
+        self.assertEqual(self.remote.exists_many.call_count, 2)
+
+    def test_writes_go_through_and_deletes_evict(self):
+        """Test that saves reach the remote and deletes drop the local copy"""
+        # Act
+        saved = self.storage.save(ContentFile(b"new"), "projects/b.jpg")
+        self.storage.open(saved)
+
+        # Assert
+        self.assertTrue(LocalStorage().exists(saved))
+        self.remote.open.assert_not_called()
+
+        # Act
+        self.storage.delete(saved)
+
+        # Assert
+        self.assertFalse(LocalStorage().exists(saved))
+        self.assertFalse(self.storage.exists(saved))
+
+    def test_media_view_serves_only_the_local_cache_tier(self):
+        """Test that /media/ 404s unless cached_gcs serves locally"""
+        # Arrange
+        url = reverse("core:cached_media", args=["projects/a.jpg"])
+        serving = CachedStorage(
+            LocalStorage(), cache_dir=self.cache_dir, serve_locally=True
+        )
+
+        # Act
+        with patch(
+            "core.views.media_views.StorageFactory.create_storage",
+            return_value=self.storage,
+        ):
+            with override_settings(CACHED_GCS_SERVE_LOCALLY=False):
+                disabled = self.client.get(url)
+            with override_settings(CACHED_GCS_SERVE_LOCALLY=True):
+                not_serving = self.client.get(url)
+        with patch(
+            "core.views.media_views.StorageFactory.create_storage",
+            return_value=serving,
+        ), override_settings(CACHED_GCS_SERVE_LOCALLY=True):
+            served = self.client.get(url)
+
+        # Assert
+        self.assertEqual(disabled.status_code, 404)
+        self.assertEqual(not_serving.status_code, 404)
+        self.assertEqual(served.status_code, 200)
+        self.assertEqual(b"".join(served.streaming_content), b"hot image")
+
+
+class DiskLRUCacheTest(TestCase):
+    """Tests for the size-bounded disk cache"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the byte budget evicts the coldest entry first"""
+        # Arrange
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        cache = DiskLRUCache(cache_dir, max_bytes=10)
+        cache.put("a", [b"aaaa"])
+        cache.put("b", [b"bbbb"])
+        cache.get("a")
+
+        # Act
+        cache.put("c", [b"cccc"])
+
+        # Assert
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.size, 8)
+
+    def test_workers_sharing_a_directory_share_the_budget(self):
+        """Test that files written by another process count toward max_bytes"""
+        # Arrange
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        worker_a = DiskLRUCache(cache_dir, max_bytes=10)
+        worker_b = DiskLRUCache(cache_dir, max_bytes=10)
+        worker_a.put("a", [b"aaaaaa"])
+
+        # Act
+        worker_b.put("b", [b"bbbbbb"])
+
+        # Assert
+        self.assertIsNone(worker_a.get("a"))
+        self.assertIsNotNone(worker_b.get("b"))
+        self.assertEqual(worker_b.size, 6)
@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from core.models import StoredBlob, StoredObject
+from core.storage.cas_storage import ContentAddressedStorage
+from core.storage.local_storage import LocalStorage
+
+
+class ContentAddressedStorageTest(TestCase):
+    """Tests for deduplicated storage on top of a temporary LocalStorage"""
+
+    def setUp(self):
+        """Point the default storage at a throwaway media root"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            STORAGES={
+                "default": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": self.media_root},
+                },
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+                },
+            }
+        )
+        self.settings_override.enable()
+        self.inner = LocalStorage()
+        self.storage = ContentAddressedStorage(self.inner)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_repeat_upload_stores_content_once(self):
+        """Test that identical bytes under two paths share one blob"""
+        # Act
+        first = self.storage.save(ContentFile(b"logo"), "microservices/a.jpg")
+        second = self.storage.save(ContentFile(b"logo"), "projects/b.jpg")
+
+        # Assert
+        self.assertEqual((first, second), ("microservices/a.jpg", "projects/b.jpg"))
+        blob = StoredBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertTrue(self.inner.exists(blob.path))
+        urls = self.storage.url_many([first, second])
+        self.assertEqual(urls[first], urls[second])
+
+    def test_delete_removes_content_after_last_reference(self):
+        """Test that deletes decrement the count and drop unused content"""
+        # Arrange
+        self.storage.save(ContentFile(b"logo"), "microservices/a.jpg")
+        self.storage.save(ContentFile(b"logo"), "projects/b.jpg")
+        blob_path = StoredBlob.objects.get().path
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete("microservices/a.jpg")
+
+        # Assert
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        self.assertTrue(self.inner.exists(blob_path))
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete("projects/b.jpg")
+
+        # Assert
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(StoredObject.objects.exists())
+        self.assertFalse(self.inner.exists(blob_path))
+
+    def test_overwrite_replaces_content_and_drops_old_blob(self):
+        """Test that saving new bytes to a path repoints it and frees the old blob"""
+        # Arrange
+        self.storage.save(ContentFile(b"old logo"), "microservices/a.jpg")
+        old_blob = StoredBlob.objects.get()
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.save(ContentFile(b"new logo"), "microservices/a.jpg")
+
+        # Assert
+        new_blob = StoredBlob.objects.get()
+        self.assertNotEqual(new_blob.pk, old_blob.pk)
+        self.assertEqual(new_blob.ref_count, 1)
+        self.assertFalse(self.inner.exists(old_blob.path))
+        with self.storage.open("microservices/a.jpg") as stored:
+            self.assertEqual(stored.read(), b"new logo")
+
+    def test_unmapped_paths_fall_through_to_inner_storage(self):
+        """Test that files written before dedup was enabled still resolve"""
+        # Arrange
+        self.inner.save(ContentFile(b"legacy"), "profiles/old.jpg")
+
+        # Act / Assert
+        self.assertTrue(self.storage.exists("profiles/old.jpg"))
+        self.assertTrue(self.storage.delete("profiles/old.jpg"))
+        self.assertFalse(self.inner.exists("profiles/old.jpg"))
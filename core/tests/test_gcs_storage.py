@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+from django.test import TestCase, override_settings
+from google.api_core.exceptions import ServiceUnavailable
+from unittest.mock import patch
+from core.http import CircuitBreaker
+from core.storage.gcs_storage import GCSStorage
+from core.storage.url_resolver import ImageURLCache, ImageURLResolver
+
+
+class FakeBlob:
+    """Blob whose reload() fills in metadata only for existing objects"""
+
+    def __init__(self, name, existing):
+        self.name = name
+        self.generation = None
+        self._existing = existing
+
+    def reload(self, **kwargs):
+        if self.name in self._existing:
+            self.generation = 1
+
+
+class GCSExistsManyTest(TestCase):
+    """Tests for bulk existence checks against a mocked bucket"""
+
+    def setUp(self):
+        """Patch django-storages' default storage with a bucket of 50 objects"""
+        patcher = patch("core.storage.gcs_storage.default_storage")
+        self.default_storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.objects = [f"projects/{i:03d}.jpg" for i in range(50)]
+        bucket = self.default_storage.bucket
+        bucket.list_blobs.side_effect = self._list_blobs
+        bucket.blob.side_effect = lambda name: FakeBlob(name, set(self.objects))
+        self.storage = GCSStorage()
+
+    def _list_blobs(self, prefix, start_offset, end_offset, max_results, **kwargs):
+        names = [
+            name
+            for name in self.objects
+            if name.startswith(prefix) and start_offset <= name < end_offset
+        ]
+        return [SimpleNamespace(name=name) for name in names[:max_results]]
+
+    def test_dense_names_use_one_listing(self):
+        """Test that neighbouring names are resolved by the range listing"""
+        # Act
+        result = self.storage.exists_many(
+            ["projects/001.jpg", "projects/002.jpg", "projects/002x.jpg"]
+        )
+
+        # Assert
+        self.assertEqual(
+            result,
+            {
+                "projects/001.jpg": True,
+                "projects/002.jpg": True,
+                "projects/002x.jpg": False,
+            },
+        )
+        self.default_storage.bucket.blob.assert_not_called()
+
+    def test_sparse_names_fall_back_to_batched_gets(self):
+        """Test that the listing is capped and the rest use batch GETs"""
+        # Act
+        result = self.storage.exists_many(
+            ["projects/000.jpg", "projects/049.jpg", "projects/049x.jpg"]
+        )
+
+        # Assert
+        self.assertEqual(
+            result,
+            {
+                "projects/000.jpg": True,
+                "projects/049.jpg": True,
+                "projects/049x.jpg": False,
+            },
+        )
+        listing = self.default_storage.bucket.list_blobs.call_args.kwargs
+        self.assertEqual(listing["max_results"], 3 * GCSStorage.RANGE_LISTING_FACTOR)
+        requested = [c.args[0] for c in self.default_storage.bucket.blob.call_args_list]
+        self.assertEqual(requested, ["projects/049.jpg", "projects/049x.jpg"])
+        self.default_storage.client.batch.assert_called_once_with(raise_exception=False)
+
+
+@override_settings(GS_QUERYSTRING_AUTH=True)
+class GCSTransportErrorTest(TestCase):
+    """Tests that GCS outages surface instead of looking like missing files"""
+
+    DEFAULT_URL = "/static/core/images/default.png"
+
+    def setUp(self):
+        """Patch django-storages' default storage to fail every call"""
+        patcher = patch("core.storage.gcs_storage.default_storage")
+        self.default_storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.default_storage.exists.side_effect = ServiceUnavailable("GCS down")
+        self.default_storage.url.side_effect = ServiceUnavailable("GCS down")
+        self.storage = GCSStorage()
+
+    def test_exists_and_url_raise_transport_errors(self):
+        """Test that exists() and url() re-raise instead of returning falsy"""
+        # Act / Assert
+        with self.assertRaises(ServiceUnavailable):
+            self.storage.exists("projects/a.jpg")
+        with self.assertRaises(ServiceUnavailable):
+            self.storage.url("projects/a.jpg")
+
+    def test_failing_storage_opens_breaker_without_negative_caching(self):
+        """Test that the resolver trips the breaker and caches nothing"""
+        # Arrange
+        cache = ImageURLCache()
+        breaker = CircuitBreaker("storage", failure_threshold=1)
+        resolver = ImageURLResolver(self.storage, cache=cache, breaker=breaker)
+
+        # Act
+        url = resolver.resolve("projects/a.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(url, self.DEFAULT_URL)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(cache.get(("GCSStorage", "projects/a.jpg")), (False, None))
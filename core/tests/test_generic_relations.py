@@ -0,0 +1,92 @@
+import uuid
+from decimal import Decimal
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from cart.models import CartItem, WishlistItem
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from core.repositories.generic_relations import (
+    GenericRelationLoader,
+    load_generic_objects,
+)
+from mentorship_session.factory_boy.mentorship_factory import (
+    MentorshipSessionFactory,
+)
+from mentorship_session.models import MentorshipSession
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+from microservices.models import MicroService
+
+
+class GenericRelationLoaderTest(TestCase):
+    """Tests for batch loading of generic relation targets"""
+
+    def setUp(self):
+        """Create wishlist items pointing at two content types"""
+        self.category = CategoryFactory()
+        self.user = UserFactory()
+        freelancer = FreelancerProfileFactory()
+        self.services = [
+            MicroServiceFactory(
+                category=self.category,
+                freelancer=freelancer,
+                price=Decimal("5.00"),
+                image_path=None,
+            )
+            for _ in range(3)
+        ]
+        self.sessions = [
+            MentorshipSessionFactory(mentor=freelancer, image_path=None)
+            for _ in range(3)
+        ]
+        for obj in self.services + self.sessions:
+            WishlistItem.objects.create(user=self.user, content_object=obj)
+
+    def test_attach_runs_one_query_per_content_type(self):
+        """Test that resolving every item takes one query per type"""
+        # Arrange
+        items = list(WishlistItem.objects.filter(user=self.user))
+        loader = GenericRelationLoader({MentorshipSession: ("mentor__user",)})
+
+        # Act
+        with self.assertNumQueries(2):
+            loader.attach(items)
+            objects = [item.content_object for item in items]
+            mentors = [
+                obj.mentor.user.username
+                for obj in objects
+                if isinstance(obj, MentorshipSession)
+            ]
+
+        # Assert
+        self.assertEqual(
+            {obj.pk for obj in objects},
+            {obj.pk for obj in self.services + self.sessions},
+        )
+        self.assertEqual(len(mentors), 3)
+
+    def test_missing_targets_resolve_to_none_without_queries(self):
+        """Test that dangling references are cached as None"""
+        # Arrange
+        item = CartItem.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(MicroService),
+            object_id=uuid.uuid4(),
+        )
+
+        # Act
+        GenericRelationLoader().attach([item])
+
+        # Assert
+        with self.assertNumQueries(0):
+            self.assertIsNone(item.content_object)
+
+    def test_load_generic_objects_accepts_string_ids(self):
+        """Test that ids coming from DataFrames as strings are converted"""
+        # Act
+        objects = load_generic_objects(
+            MicroService, [str(s.pk) for s in self.services] + ["not-a-uuid"]
+        )
+
+        # Assert
+        self.assertEqual(set(objects), {s.pk for s in self.services})
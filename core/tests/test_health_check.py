@@ -0,0 +1,109 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from unittest.mock import MagicMock, patch
+from core.middleware import DatabaseLivenessMonitor, HealthCheckMiddleware
+
+
+class DatabaseLivenessMonitorTest(TestCase):
+    """Tests for the cached database liveness check"""
+
+    def test_result_is_cached_within_ttl(self):
+        """Test that repeated checks inside the TTL do not query the database"""
+        # Arrange
+        monitor = DatabaseLivenessMonitor(ttl=60)
+
+        # Act
+        first = monitor.status()
+        with self.assertNumQueries(0):
+            second = monitor.status()
+
+        # Assert
+        self.assertEqual(first, (True, "OK"))
+        self.assertEqual(second, (True, "OK"))
+
+    def test_stale_result_is_served_while_refreshing_in_background(self):
+        """Test that an expired result triggers a background refresh"""
+        # Arrange
+        monitor = DatabaseLivenessMonitor(ttl=0)
+        monitor._result = (False, "ERROR: down")
+
+        # Act
+        with patch("core.middleware.threading.Thread") as thread:
+            result = monitor.status()
+            monitor.status()
+
+        # Assert
+        self.assertEqual(result, (False, "ERROR: down"))
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    def test_database_error_is_reported(self):
+        """Test that a failing query produces an error result"""
+        # Arrange
+        monitor = DatabaseLivenessMonitor(ttl=60)
+
+        # Act
+        with patch("django.db.connections") as connections:
+            connections.__getitem__.return_value.cursor.side_effect = Exception(
+                "connection refused"
+            )
+            ok, detail = monitor.status()
+
+        # Assert
+        self.assertFalse(ok)
+        self.assertIn("connection refused", detail)
+
+
+class HealthCheckMiddlewareTest(TestCase):
+    """Tests for probes answered by the first middleware"""
+
+    def setUp(self):
+        """Build the middleware with a stubbed liveness monitor"""
+        self.factory = RequestFactory()
+        self.get_response = MagicMock(return_value=HttpResponse("app"))
+        self.middleware = HealthCheckMiddleware(self.get_response)
+        self.middleware.db_liveness = MagicMock()
+
+    def test_liveness_paths_use_cached_status(self):
+        """Test that /health/ and /healthz/ answer without calling the view"""
+        # Arrange
+        self.middleware.db_liveness.status.return_value = (True, "OK")
+
+        # Act
+        responses = [
+            self.middleware(self.factory.get(path))
+            for path in ("/health/", "/healthz/")
+        ]
+
+        # Assert
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.get_response.assert_not_called()
+
+    def test_liveness_reports_database_outage(self):
+        """Test that a cached database failure returns 503"""
+        # Arrange
+        self.middleware.db_liveness.status.return_value = (False, "ERROR: down")
+
+        # Act
+        response = self.middleware(self.factory.get("/health/"))
+
+        # Assert
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.content, b"ERROR: down")
+
+    def test_readiness_skips_database(self):
+        """Test that /ready/ does not consult the database"""
+        # Act
+        response = self.middleware(self.factory.get("/ready/"))
+
+        # Assert
+        self.assertEqual(response.content, b"READY")
+        self.middleware.db_liveness.status.assert_not_called()
+
+    def test_other_paths_pass_through(self):
+        """Test that normal requests reach the rest of the stack"""
+        # Act
+        response = self.middleware(self.factory.get("/projects/"))
+
+        # Assert
+        self.assertEqual(response.content, b"app")
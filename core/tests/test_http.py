@@ -0,0 +1,83 @@
+from unittest.mock import Mock, patch
+from django.test import TestCase
+from core.http import CircuitBreaker, CircuitOpenError, build_session
+
+
+class CircuitBreakerTest(TestCase):
+    """Unit tests for the outbound circuit breaker"""
+
+    def setUp(self):
+        """Breaker that opens after two failures"""
+        self.breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+        self.failing = Mock(side_effect=ConnectionError("down"))
+
+    def _trip(self):
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(self.failing)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that calls fail fast once the threshold is reached"""
+        # Act
+        self._trip()
+
+        # Assert
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(self.failing)
+        self.assertEqual(self.failing.call_count, 2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    @patch("core.http.breaker.time.monotonic")
+    def test_half_open_trial_closes_on_success(self, monotonic):
+        """Test that one trial call after the timeout closes the breaker"""
+        # Arrange
+        monotonic.return_value = 100.0
+        self._trip()
+        monotonic.return_value = 131.0
+
+        # Act
+        result = self.breaker.call(lambda: "ok")
+
+        # Assert
+        self.assertEqual(result, "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    @patch("core.http.breaker.time.monotonic")
+    def test_half_open_allows_a_single_trial(self, monotonic):
+        """Test that concurrent callers wait for the trial call's result"""
+        # Arrange
+        monotonic.return_value = 100.0
+        self._trip()
+        monotonic.return_value = 131.0
+
+        # Act
+        first, second = self.breaker.allow(), self.breaker.allow()
+
+        # Assert
+        self.assertEqual((first, second), (True, False))
+
+
+class BuildSessionTest(TestCase):
+    """Unit tests for pooled outbound sessions"""
+
+    def test_default_timeout_is_applied(self):
+        """Test that requests without a timeout get the configured one"""
+        # Arrange
+        session = build_session({"connect_timeout": 1.5, "read_timeout": 4})
+
+        # Act
+        with patch("requests.Session.request") as request:
+            session.get("https://example.com/")
+
+        # Assert
+        self.assertEqual(request.call_args.kwargs["timeout"], (1.5, 4))
+
+    def test_adapter_pools_and_retries(self):
+        """Test that the mounted adapter carries the pool size and retry budget"""
+        # Act
+        session = build_session({"retries": 3, "pool_maxsize": 7})
+
+        # Assert
+        adapter = session.get_adapter("https://example.com/")
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 3)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from unittest.mock import Mock
+from core.middleware import HttpCatImageCache, HttpCatMiddleware
+
+
+class HttpCatMiddlewareTest(TestCase):
+    """Tests for serving error images from the local cache"""
+
+    def setUp(self):
+        """Bundle a 404 image and build the middleware around a 404 view"""
+        self.image_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.image_dir, True)
+        with open(os.path.join(self.image_dir, "404.jpg"), "wb") as f:
+            f.write(b"cat-404")
+        self.factory = RequestFactory()
+        self.middleware = HttpCatMiddleware(
+            lambda request: HttpResponse("missing", status=404)
+        )
+        self.middleware.images = HttpCatImageCache(self.image_dir)
+        self.middleware.images._session = Mock()
+
+    def test_browser_gets_bundled_image_without_network(self):
+        """Test that HTML clients get the cached image and no outbound call"""
+        # Arrange
+        request = self.factory.get("/nope/", HTTP_ACCEPT="text/html,*/*")
+
+        # Act
+        first = self.middleware(request)
+        second = self.middleware(request)
+
+        # Assert
+        self.assertEqual(first.status_code, 404)
+        self.assertEqual(first["Content-Type"], "image/jpeg")
+        self.assertEqual(second.content, b"cat-404")
+        self.middleware.images._session.get.assert_not_called()
+
+    def test_non_html_client_gets_original_response(self):
+        """Test that API clients skip the image lookup entirely"""
+        # Arrange
+        request = self.factory.get("/api/", HTTP_ACCEPT="application/json")
+
+        # Act
+        response = self.middleware(request)
+
+        # Assert
+        self.assertEqual(response.content, b"missing")
+        self.middleware.images._session.get.assert_not_called()
+
+    def test_unavailable_image_is_not_refetched(self):
+        """Test that a failed remote fetch is remembered"""
+        # Arrange
+        self.middleware.images._session.get.return_value = Mock(ok=False)
+
+        # Act
+        first = self.middleware.images.get(418)
+        second = self.middleware.images.get(418)
+
+        # Assert
+        self.assertIsNone(first)
+        self.assertIsNone(second)
+        self.middleware.images._session.get.assert_called_once()
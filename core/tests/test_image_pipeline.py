@@ -0,0 +1,77 @@
+import io
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from PIL import Image
+from core.services.image_pipeline import ImageRenditionPipeline
+
+
+class ImageRenditionPipelineTest(TestCase):
+    """Unit tests for the upload-time rendition pipeline"""
+
+    def setUp(self):
+        self.pipeline = ImageRenditionPipeline()
+
+    def _upload(
+        self, size=(2000, 1000), image_format="JPEG", mode="RGB", **save_kwargs
+    ):
+        buffer = io.BytesIO()
+        Image.new(mode, size, "red").save(buffer, image_format, **save_kwargs)
+        return SimpleUploadedFile(
+            f"photo.{image_format.lower()}",
+            buffer.getvalue(),
+            content_type=f"image/{image_format.lower()}",
+        )
+
+    def test_process_builds_size_limited_renditions(self):
+        """Test that every rendition fits its bounding box"""
+        # Act
+        processed = self.pipeline.process(self._upload(), "projects", "project_1_abc")
+
+        # Assert
+        primary = processed.primary_path
+        self.assertEqual(primary, "projects/project_1_abc-rv1.jpg")
+        card = Image.open(
+            io.BytesIO(processed.files["projects/project_1_abc-rv1_card.webp"])
+        )
+        detail = Image.open(io.BytesIO(processed.files[primary]))
+        placeholder = Image.open(
+            io.BytesIO(processed.files["projects/project_1_abc-rv1_placeholder.webp"])
+        )
+        self.assertEqual(card.size, (480, 240))
+        self.assertEqual(detail.size, (1280, 640))
+        self.assertLessEqual(max(placeholder.size), 16)
+
+    def test_process_strips_exif(self):
+        """Test that EXIF metadata is not carried into the stored files"""
+        # Arrange
+        exif = Image.Exif()
+        exif[0x010F] = "CameraMaker"
+        upload = self._upload(exif=exif.tobytes())
+
+        # Act
+        processed = self.pipeline.process(upload, "profiles", "profile_1_abc")
+
+        # Assert
+        for data in processed.files.values():
+            self.assertNotIn(b"CameraMaker", data)
+
+    def test_process_rejects_non_images(self):
+        """Test that undecodable uploads raise ValueError"""
+        # Arrange
+        upload = SimpleUploadedFile("x.jpg", b"not an image", content_type="image/jpeg")
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            self.pipeline.process(upload, "profiles", "profile_1_abc")
+
+    def test_image_set_for_legacy_path_has_no_srcset(self):
+        """Test that uploads predating the pipeline are served as-is"""
+        # Act
+        image_set = self.pipeline.build_image_set(
+            "projects/old.jpg", {"projects/old.jpg": "https://cdn/old.jpg"}
+        )
+
+        # Assert
+        self.assertEqual(image_set.card, "https://cdn/old.jpg")
+        self.assertEqual(image_set.srcset, "")
+        self.assertIsNone(image_set.placeholder)
@@ -0,0 +1,124 @@
+from django.test import TestCase
+from unittest.mock import Mock
+from core.http import CircuitBreaker
+from core.storage.url_resolver import ImageURLCache, ImageURLResolver
+
+
+class ImageURLResolverTest(TestCase):
+    """Unit tests for the cached image URL resolver"""
+
+    DEFAULT_URL = "/static/core/images/default.png"
+
+    def setUp(self):
+        """Setup mocked storage and an isolated cache"""
+        self.mock_storage = Mock()
+        self.mock_storage.public_url.return_value = None
+        self.mock_storage.exists.return_value = True
+        self.mock_storage.url.return_value = "https://cdn.example.com/a.jpg"
+        self.breaker = CircuitBreaker("storage", failure_threshold=1)
+        self.resolver = ImageURLResolver(
+            self.mock_storage, cache=ImageURLCache(), breaker=self.breaker
+        )
+
+    def test_resolve_hits_storage_once_per_path(self):
+        """Test that repeated lookups of the same path are served from cache"""
+        # Act
+        first = self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+        second = self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(first, "https://cdn.example.com/a.jpg")
+        self.assertEqual(second, first)
+        self.mock_storage.exists.assert_called_once_with("profiles/a.jpg")
+        self.mock_storage.url.assert_called_once_with("profiles/a.jpg")
+
+    def test_missing_path_is_negatively_cached(self):
+        """Test that a missing file returns the default without re-checking"""
+        # Arrange
+        self.mock_storage.exists.return_value = False
+
+        # Act
+        first = self.resolver.resolve("profiles/missing.jpg", self.DEFAULT_URL)
+        second = self.resolver.resolve("profiles/missing.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(first, self.DEFAULT_URL)
+        self.assertEqual(second, self.DEFAULT_URL)
+        self.mock_storage.exists.assert_called_once()
+        self.mock_storage.url.assert_not_called()
+
+    def test_invalidate_forces_new_lookup(self):
+        """Test that invalidate drops the cached entry for a path"""
+        # Arrange
+        self.mock_storage.exists.return_value = False
+        self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+        self.mock_storage.exists.return_value = True
+
+        # Act
+        self.resolver.invalidate("profiles/a.jpg")
+        result = self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(result, "https://cdn.example.com/a.jpg")
+        self.assertEqual(self.mock_storage.exists.call_count, 2)
+
+    def test_public_url_skips_storage_lookup(self):
+        """Test that deterministic public URLs bypass exists/url entirely"""
+        # Arrange
+        self.mock_storage.public_url.return_value = "https://public/a.jpg"
+
+        # Act
+        result = self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(result, "https://public/a.jpg")
+        self.mock_storage.exists.assert_not_called()
+
+    def test_empty_path_returns_default(self):
+        """Test that an empty path never touches storage"""
+        # Act
+        result = self.resolver.resolve(None, self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(result, self.DEFAULT_URL)
+        self.mock_storage.public_url.assert_not_called()
+
+    def test_resolve_many_batches_cache_misses(self):
+        """Test that resolve_many issues one bulk lookup for uncached paths"""
+        # Arrange
+        self.resolver.resolve("profiles/a.jpg", self.DEFAULT_URL)
+        self.mock_storage.exists_many.return_value = {
+            "profiles/b.jpg": True,
+            "profiles/c.jpg": False,
+        }
+        self.mock_storage.url_many.return_value = {
+            "profiles/b.jpg": "https://cdn.example.com/b.jpg"
+        }
+
+        # Act
+        result = self.resolver.resolve_many(
+            ["profiles/a.jpg", "profiles/b.jpg", "profiles/c.jpg"], self.DEFAULT_URL
+        )
+
+        # Assert
+        self.assertEqual(result["profiles/a.jpg"], "https://cdn.example.com/a.jpg")
+        self.assertEqual(result["profiles/b.jpg"], "https://cdn.example.com/b.jpg")
+        self.assertEqual(result["profiles/c.jpg"], self.DEFAULT_URL)
+        missing = self.mock_storage.exists_many.call_args.args[0]
+        self.assertCountEqual(missing, ["profiles/b.jpg", "profiles/c.jpg"])
+        self.mock_storage.url_many.assert_called_once_with(["profiles/b.jpg"])
+
+    def test_failing_storage_falls_back_to_default(self):
+        """Test that storage errors trip the breaker and skip later lookups"""
+        # Arrange
+        self.mock_storage.exists_many.side_effect = TimeoutError("GCS timeout")
+
+        # Act
+        first = self.resolver.resolve_many(["projects/a.jpg"], self.DEFAULT_URL)
+        second = self.resolver.resolve("projects/b.jpg", self.DEFAULT_URL)
+
+        # Assert
+        self.assertEqual(first, {"projects/a.jpg": self.DEFAULT_URL})
+        self.assertEqual(second, self.DEFAULT_URL)
+        self.mock_storage.exists.assert_not_called()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from core.storage.local_storage import LocalStorage
+
+
+class LocalStorageBulkTest(TestCase):
+    """Tests for LocalStorage bulk operations against a temporary directory"""
+
+    def setUp(self):
+        """Point the default storage at a throwaway media root"""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            STORAGES={
+                "default": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": self.media_root},
+                },
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+                },
+            }
+        )
+        self.settings_override.enable()
+        self.storage = LocalStorage()
+        self.storage.save(ContentFile(b"a"), "profiles/a.jpg")
+        self.storage.save(ContentFile(b"b"), "portfolios/b.jpg")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_exists_many_reports_each_path(self):
+        """Test that exists_many covers several directories in one call"""
+        # Act
+        result = self.storage.exists_many(
+            ["profiles/a.jpg", "portfolios/b.jpg", "profiles/missing.jpg", "none/c.jpg"]
+        )
+
+        # Assert
+        self.assertEqual(
+            result,
+            {
+                "profiles/a.jpg": True,
+                "portfolios/b.jpg": True,
+                "profiles/missing.jpg": False,
+                "none/c.jpg": False,
+            },
+        )
+
+    def test_delete_many_removes_existing_files(self):
+        """Test that delete_many counts only files that were present"""
+        # Act
+        deleted = self.storage.delete_many(
+            ["profiles/a.jpg", "portfolios/b.jpg", "profiles/missing.jpg"]
+        )
+
+        # Assert
+        self.assertEqual(deleted, 2)
+        self.assertFalse(self.storage.exists("profiles/a.jpg"))
+        self.assertFalse(self.storage.exists("portfolios/b.jpg"))
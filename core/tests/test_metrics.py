@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import ResolverMatch
+from core.metrics import LATENCY_BUCKETS, MetricsRegistry
+from core.middleware import MetricsMiddleware
+
+
+class MetricsRegistryTest(TestCase):
+    """Tests for file-backed metric aggregation across processes"""
+
+    def setUp(self):
+        """Create a registry in a throwaway directory"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.registry = MetricsRegistry(self.directory)
+
+    def test_render_sums_all_worker_files(self):
+        """Test that counters and histograms from other workers are added"""
+        # Arrange
+        labels = {"view": "core:login"}
+        self.registry.inc("hireloop_http_requests_total", labels)
+        self.registry.observe(
+            "hireloop_http_request_duration_seconds", labels, 0.02, LATENCY_BUCKETS
+        )
+        other_worker = {
+            "counters": [["hireloop_http_requests_total", [["view", "core:login"]], 2]],
+            "histograms": [
+                [
+                    "hireloop_http_request_duration_seconds",
+                    [["view", "core:login"]],
+                    list(LATENCY_BUCKETS),
+                    [0] * 11 + [1, 20.0],
+                ]
+            ],
+        }
+        with open(os.path.join(self.directory, "metrics_99999.json"), "w") as f:
+            json.dump(other_worker, f)
+
+        # Act
+        output = self.registry.render()
+
+        # Assert
+        self.assertIn('hireloop_http_requests_total{view="core:login"} 3', output)
+        self.assertIn(
+            "hireloop_http_request_duration_seconds_bucket"
+            '{view="core:login",le="0.025"} 1',
+            output,
+        )
+        self.assertIn(
+            "hireloop_http_request_duration_seconds_bucket"
+            '{view="core:login",le="+Inf"} 2',
+            output,
+        )
+        self.assertIn(
+            'hireloop_http_request_duration_seconds_sum{view="core:login"} 20.02',
+            output,
+        )
+
+
+class MetricsMiddlewareTest(TestCase):
+    """Tests for per-request metric collection"""
+
+    def test_records_status_and_query_count_by_url_name(self):
+        """Test that SQL queries run by the view are counted"""
+        # Arrange
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+
+        def view(request):
+            request.resolver_match = ResolverMatch(view, (), {}, url_name="demo")
+            list(get_user_model().objects.all())
+            list(get_user_model().objects.all())
+            return HttpResponse(status=201)
+
+        middleware = MetricsMiddleware(view)
+        middleware.registry = MetricsRegistry(directory)
+
+        # Act
+        middleware(RequestFactory().post("/demo/"))
+
+        # Assert
+        output = middleware.registry.render()
+        self.assertIn(
+            'hireloop_http_requests_total{method="POST",status="201",view="demo"} 1',
+            output,
+        )
+        self.assertIn(
+            'hireloop_db_queries_per_request_bucket{view="demo",le="2"} 1', output
+        )
+        self.assertIn(
+            'hireloop_db_queries_per_request_bucket{view="demo",le="1"} 0', output
+        )
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from core.middleware import NPlusOneMiddleware
+from core.nplusone import NPlusOneAssertionsMixin, NPlusOneError, fingerprint
+
+User = get_user_model()
+
+
+class NPlusOneDetectorTest(NPlusOneAssertionsMixin, TestCase):
+    """Tests for repeated-query detection"""
+
+    def setUp(self):
+        """Create a few users to query one by one"""
+        self.users = [
+            User.objects.create(username=f"user{i}", email=f"user{i}@example.com")
+            for i in range(3)
+        ]
+
+    def per_row_view(self, request):
+        for user in self.users:
+            User.objects.filter(pk=user.pk).exists()
+        return HttpResponse("ok")
+
+    def test_fingerprint_ignores_literal_values(self):
+        """Test that queries differing only in values share a fingerprint"""
+        # Act / Assert
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a' LIMIT 21"),
+            fingerprint("SELECT * FROM t WHERE id = 2 AND name = 'b''c' LIMIT 21"),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+        )
+
+    def test_assertion_fails_on_per_row_queries(self):
+        """Test that the helper fails and names the offending code"""
+        # Act
+        with self.assertRaises(AssertionError) as ctx:
+            with self.assertNoRepeatedQueries(threshold=3):
+                self.per_row_view(None)
+
+        # Assert
+        self.assertIn("3x SELECT", str(ctx.exception))
+        self.assertIn("test_nplusone.py", str(ctx.exception))
+
+    def test_assertion_passes_for_batched_queries(self):
+        """Test that a single batched query is not flagged"""
+        # Act / Assert
+        with self.assertNoRepeatedQueries(threshold=2):
+            list(User.objects.filter(pk__in=[u.pk for u in self.users]))
+
+    @override_settings(NPLUSONE_ENABLED=True, NPLUSONE_RAISE=True)
+    def test_middleware_raises_when_enabled(self):
+        """Test that the middleware fails requests over the threshold"""
+        # Arrange
+        middleware = NPlusOneMiddleware(self.per_row_view)
+
+        # Act / Assert
+        with self.assertRaises(NPlusOneError):
+            middleware(RequestFactory().get("/cart/"))
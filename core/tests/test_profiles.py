@@ -0,0 +1,82 @@
+from django.contrib.auth import BACKEND_SESSION_KEY, SESSION_KEY
+from django.test import TestCase
+from django.urls import reverse
+from core.backends import ProfileModelBackend
+from core.models import FreelancerProfile, User
+from core.profiles import forget_profile, load_profiles
+from core.services.profile_service import ProfileService
+
+
+class ProfileLoaderTest(TestCase):
+    """Tests for the request-scoped profile loader"""
+
+    def setUp(self):
+        """Create a user with only a freelancer profile"""
+        self.user = User.objects.create_user(
+            username="ana", email="ana@example.com", password="x"
+        )
+        self.freelancer = FreelancerProfile.objects.create(user=self.user)
+
+    def test_backend_loads_profiles_with_the_user(self):
+        """Test that the session user comes with both profile relations cached"""
+        # Act
+        with self.assertNumQueries(1):
+            user = ProfileModelBackend().get_user(self.user.pk)
+
+        # Assert
+        with self.assertNumQueries(0):
+            self.assertEqual(load_profiles(user).freelancer, self.freelancer)
+            self.assertFalse(hasattr(user, "client_profile"))
+            self.assertEqual(len(user.get_roles()), 1)
+
+    def test_loader_queries_once_per_user_instance(self):
+        """Test that repeated profile checks on one user reuse a joined query"""
+        # Arrange
+        user = User.objects.get(pk=self.user.pk)
+        service = ProfileService()
+
+        # Act / Assert
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                service.get_user_profiles(user)
+            self.assertEqual(service.get_primary_role(user), "freelancer")
+
+    def test_forget_profile_reflects_deletion(self):
+        """Test that a deleted profile is not served from the cache"""
+        # Arrange
+        user = User.objects.get(pk=self.user.pk)
+        load_profiles(user).freelancer.delete()
+
+        # Act
+        forget_profile(user, "freelancer_profile")
+
+        # Assert
+        self.assertFalse(load_profiles(user).has_freelancer)
+
+
+class UserRegisterViewTest(TestCase):
+    """Tests for signing up through the registration view"""
+
+    def test_registration_logs_the_user_in(self):
+        """Test that a new user is redirected with an authenticated session"""
+        # Act
+        response = self.client.post(
+            reverse("core:register"),
+            {
+                "username": "newuser",
+                "email": "new@example.com",
+                "password1": "s3cure-Passw0rd",
+                "password2": "s3cure-Passw0rd",
+            },
+        )
+
+        # Assert
+        self.assertRedirects(
+            response, reverse("core:profile_detail"), fetch_redirect_response=False
+        )
+        user = User.objects.get(username="newuser")
+        self.assertEqual(self.client.session[SESSION_KEY], str(user.pk))
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "core.backends.ProfileModelBackend",
+        )
@@ -0,0 +1,193 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from unittest.mock import Mock
+from core.models import User
+from core.services.image_service import ProfileImageService
+from core.services.storage_tasks import (
+    BackgroundStorageExecutor,
+    ImageUploadScheduler,
+)
+
+
+class ImageUploadSchedulerTest(TestCase):
+    """Tests for replacing model images inline and in the background"""
+
+    def setUp(self):
+        """Create a user with an existing image and an inline executor"""
+        self.user = User.objects.create(
+            username="alice",
+            email="alice@example.com",
+            profile_image="profiles/old.jpg",
+        )
+        self.executor = Mock()
+        self.executor.submit.side_effect = lambda job, *args, **kwargs: job()
+        self.scheduler = ImageUploadScheduler(executor=self.executor)
+        self.upload = Mock(return_value="profiles/new.jpg")
+        self.delete = Mock()
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, "JPEG")
+        self.image_bytes = buffer.getvalue()
+        self.image_file = SimpleUploadedFile(
+            "new.jpg", self.image_bytes, content_type="image/jpeg"
+        )
+
+    @override_settings(STORAGE_ASYNC_UPLOADS=False)
+    def test_sync_mode_replaces_image_immediately(self):
+        """Test that the inline path stores the new path and deletes the old one"""
+        # Act
+        self.scheduler.schedule(
+            self.user, "profile_image", self.image_file, self.upload, self.delete
+        )
+
+        # Assert
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, "profiles/new.jpg")
+        self.delete.assert_called_once_with("profiles/old.jpg")
+        self.executor.submit.assert_not_called()
+
+    @override_settings(STORAGE_ASYNC_UPLOADS=True)
+    def test_async_mode_finalizes_after_commit(self):
+        """Test that the background job uploads the spooled copy after commit"""
+        # Arrange
+        spooled = {}
+
+        def upload(f):
+            spooled["path"] = f.file.name
+            spooled["data"] = f.read()
+            return "profiles/new.jpg"
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scheduler.schedule(
+                self.user, "profile_image", self.image_file, upload, self.delete
+            )
+            self.executor.submit.assert_not_called()
+
+        # Assert
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, "profiles/new.jpg")
+        self.assertEqual(spooled["data"], self.image_bytes)
+        self.assertFalse(os.path.exists(spooled["path"]))
+        self.delete.assert_called_once_with("profiles/old.jpg")
+
+    @override_settings(STORAGE_ASYNC_UPLOADS=True)
+    def test_superseded_job_discards_its_upload(self):
+        """Test that a job does not overwrite an image replaced in the meantime"""
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scheduler.schedule(
+                self.user, "profile_image", self.image_file, self.upload, self.delete
+            )
+            User.objects.filter(pk=self.user.pk).update(
+                profile_image="profiles/newer.jpg"
+            )
+
+        # Assert
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, "profiles/newer.jpg")
+        self.delete.assert_called_once_with("profiles/new.jpg")
+
+    @override_settings(STORAGE_ASYNC_UPLOADS=True)
+    def test_async_mode_rejects_invalid_image_in_request(self):
+        """Test that a non-image fails before anything is spooled or queued"""
+        # Arrange
+        image_file = SimpleUploadedFile(
+            "new.jpg", b"not-an-image", content_type="image/jpeg"
+        )
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError):
+                self.scheduler.schedule(
+                    self.user, "profile_image", image_file, self.upload, self.delete
+                )
+
+        # Assert
+        self.assertEqual(callbacks, [])
+        self.upload.assert_not_called()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, "profiles/old.jpg")
+
+    @override_settings(STORAGE_ASYNC_UPLOADS=True)
+    def test_async_mode_runs_service_checks_in_request(self):
+        """Test that the service's size/type checks run before spooling"""
+        # Arrange
+        image_file = SimpleUploadedFile(
+            "new.jpg", self.image_bytes, content_type="application/pdf"
+        )
+        image_service = ProfileImageService(storage=Mock())
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError):
+                self.scheduler.schedule(
+                    self.user,
+                    "profile_image",
+                    image_file,
+                    self.upload,
+                    self.delete,
+                    validate=image_service.validate_image,
+                )
+
+        # Assert
+        self.assertEqual(callbacks, [])
+        self.upload.assert_not_called()
+
+
+class BackgroundStorageExecutorTest(TestCase):
+    """Tests for the bounded storage thread pool"""
+
+    def test_full_queue_runs_inline_with_retries(self):
+        """Test that a job runs in the caller's thread when no slot is free"""
+        # Arrange
+        executor = BackgroundStorageExecutor(
+            max_workers=1, max_pending=1, retry_delay=0
+        )
+        release = threading.Event()
+        executor.submit(release.wait)
+        threads = []
+
+        def flaky():
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                raise IOError("transient")
+
+        # Act
+        executor.submit(flaky)
+        release.set()
+
+        # Assert
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+
+class CleanupUploadSpoolCommandTest(TestCase):
+    """Tests for the cleanup_upload_spool management command"""
+
+    def test_removes_only_stale_spool_files(self):
+        """Test that old upload_ files are deleted and everything else kept"""
+        # Arrange
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, True)
+        stale = os.path.join(spool_dir, "upload_stale")
+        fresh = os.path.join(spool_dir, "upload_fresh")
+        other = os.path.join(spool_dir, "unrelated")
+        for path in (stale, fresh, other):
+            open(path, "wb").close()
+        two_days_ago = time.time() - 2 * 24 * 3600
+        os.utime(stale, (two_days_ago, two_days_ago))
+        os.utime(other, (two_days_ago, two_days_ago))
+
+        # Act
+        with override_settings(STORAGE_ASYNC_SPOOL_DIR=spool_dir):
+            call_command("cleanup_upload_spool", stdout=io.StringIO())
+
+        # Assert
+        self.assertEqual(sorted(os.listdir(spool_dir)), ["unrelated", "upload_fresh"])
@@ -0,0 +1,96 @@
+import hashlib
+import io
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from unittest.mock import MagicMock, patch
+from core.storage.gcs_storage import GCSStorage
+from core.storage.streaming import StreamingReader, sniff_image_type
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+class StreamingReaderTest(TestCase):
+    """Tests for single-pass hashing, size limits and type sniffing"""
+
+    def test_sniff_detects_real_type_regardless_of_declared_type(self):
+        """Test that sniffing uses magic bytes, not the client content type"""
+        # Arrange
+        png = SimpleUploadedFile("a.jpg", PNG_HEADER + b"x", content_type="image/jpeg")
+        webp = SimpleUploadedFile("a.webp", b"RIFF\x00\x00\x00\x00WEBPVP8 ")
+        text = SimpleUploadedFile("a.png", b"<html>", content_type="image/png")
+
+        # Act / Assert
+        self.assertEqual(sniff_image_type(png), "image/png")
+        self.assertEqual(sniff_image_type(webp), "image/webp")
+        self.assertIsNone(sniff_image_type(text))
+        self.assertEqual(png.tell(), 0)
+
+    def test_reader_hashes_in_bounded_chunks(self):
+        """Test that chunks never exceed the sniff/chunk size and the hash matches"""
+        # Arrange
+        data = PNG_HEADER + b"a" * 20000
+        reader = StreamingReader(io.BytesIO(data), chunk_size=4096)
+
+        # Act
+        chunks = list(reader)
+
+        # Assert
+        self.assertEqual(b"".join(chunks), data)
+        self.assertLessEqual(max(len(c) for c in chunks), 4096)
+        self.assertEqual(reader.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(reader.content_type, "image/png")
+
+    def test_reader_rejects_oversized_stream(self):
+        """Test that max_size is enforced on bytes read, not the declared size"""
+        # Arrange
+        reader = StreamingReader(
+            io.BytesIO(b"a" * 10000), chunk_size=4096, max_size=5000
+        )
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            list(reader)
+
+
+@override_settings(GCS_UPLOAD_CHUNK_SIZE=256 * 1024, GCS_UPLOAD_MAX_SIZE=None)
+class GCSStreamingSaveTest(TestCase):
+    """Tests for GCSStorage streaming saves with a mocked bucket"""
+
+    def setUp(self):
+        """Patch django-storages' default storage"""
+        patcher = patch("core.storage.gcs_storage.default_storage")
+        self.default_storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.default_storage.get_available_name.side_effect = lambda name: name
+        self.blob = MagicMock()
+        self.default_storage.bucket.blob.return_value = self.blob
+
+    def test_small_file_uses_single_request(self):
+        """Test that files within one chunk skip the resumable session"""
+        # Arrange
+        upload = SimpleUploadedFile("a.png", PNG_HEADER + b"small")
+
+        # Act
+        result = GCSStorage().save_stream(upload, "projects/a.png")
+
+        # Assert
+        self.blob.upload_from_string.assert_called_once()
+        self.blob.open.assert_not_called()
+        self.assertEqual(result.name, "projects/a.png")
+        self.assertEqual(result.content_type, "image/png")
+
+    def test_large_file_streams_through_resumable_session(self):
+        """Test that large files are written chunk by chunk"""
+        # Arrange
+        data = PNG_HEADER + b"a" * (600 * 1024)
+        writer = self.blob.open.return_value.__enter__.return_value
+
+        # Act
+        result = GCSStorage().save_stream(io.BytesIO(data), "projects/big.png")
+
+        # Assert
+        self.assertEqual(self.blob.open.call_args.kwargs["chunk_size"], 256 * 1024)
+        written = b"".join(call.args[0] for call in writer.write.call_args_list)
+        self.assertEqual(written, data)
+        self.assertEqual(result.sha256, hashlib.sha256(data).hexdigest())
+        self.blob.upload_from_string.assert_not_called()
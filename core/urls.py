@@ -9,6 +9,7 @@ from core.views.profile_views import (
     PublicProfileDetailView,
 )
 from core.views.image_views import ProfileImageUpdateView, ProfileImageDeleteView
+from core.views.media_views import CachedMediaView
 from core.views.portfolio_views import (
     PortfolioCreateView,
     PortfolioImageUpdateView,
@@ -61,5 +62,7 @@ urlpatterns = [
         PublicProfileDetailView.as_view(),
         name="public_profile_detail",
     ),
+    # Images served from the cached_gcs disk cache
+    path("media/<path:path>", CachedMediaView.as_view(), name="cached_media"),
 ]
 
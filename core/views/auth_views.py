@@ -16,7 +16,8 @@ class UserRegisterView(CreateView):
 
     def form_valid(self, form):
         user = form.save()
-        login(self.request, user)
+        # Several backends are configured, so login() must be told which one
+        login(self.request, user, backend="core.backends.ProfileModelBackend")
         return redirect(self.success_url)
 
 
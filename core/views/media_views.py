@@ -0,0 +1,36 @@
+import mimetypes
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.views.generic import View
+from ..factories.storage_factory import StorageFactory
+from ..storage.cached_storage import CachedStorage
+
+
+class CachedMediaView(View):
+    """
+    Serve stored images from the local disk cache tier (cached_gcs).
+    Anything else 404s, so the route never proxies the bucket directly.
+    """
+
+    # Stored names are unique per upload, so responses never change
+    CACHE_CONTROL = "public, max-age=604800, immutable"
+
+    def get(self, request, path, *args, **kwargs):
+        if path.startswith("/") or ".." in path.split("/"):
+            raise Http404
+        if not getattr(settings, "CACHED_GCS_SERVE_LOCALLY", False):
+            raise Http404
+        storage = StorageFactory.create_storage()
+        if not (isinstance(storage, CachedStorage) and storage.serves_locally):
+            raise Http404
+        if not storage.exists(path):
+            raise Http404
+        try:
+            image_file = storage.open(path)
+        except (FileNotFoundError, NotImplementedError):
+            raise Http404
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        response = FileResponse(image_file, content_type=content_type)
+        response["Cache-Control"] = self.CACHE_CONTROL
+        return response
@@ -9,6 +9,7 @@ from ..services.profile_service import ProfileService
 from ..services.action_dispatcher import ActionDispatcher
 from ..services.profile_context_provider import ProfileContextProvider
 from ..models import User
+from ..profiles import load_profiles
 
 class FreelancerProfileCreateView(BaseProfileCreateView):
     """Create Freelancer Profile - Single Responsibility Principle."""
@@ -23,7 +24,7 @@ class FreelancerProfileCreateView(BaseProfileCreateView):
         return service.create_freelancer_profile(user, validated_data)
 
     def user_has_profile(self, user):
-        return hasattr(user, "freelancer_profile")
+        return load_profiles(user).has_freelancer
 
 class ClientProfileCreateView(BaseProfileCreateView):
     """Create Client Profile - Single Responsibility Principle."""
@@ -38,7 +39,7 @@ class ClientProfileCreateView(BaseProfileCreateView):
         return service.create_client_profile(user, validated_data)
 
     def user_has_profile(self, user):
-        return hasattr(user, "client_profile")
+        return load_profiles(user).has_client
 
 class ProfileDetailView(LoginRequiredMixin, TemplateView):
     """
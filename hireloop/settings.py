@@ -80,6 +80,20 @@ SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
 STRIPE_PUBLIC_KEY = os.getenv("STRIPE_PUBLIC_KEY", "")
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+# Apply webhook events in a background worker after acknowledging Stripe.
+STRIPE_WEBHOOK_ASYNC = True
+# Create Stripe Products/Prices for purchased items in the background and
+# reference them by ID in later checkouts instead of inline price_data.
+STRIPE_CACHE_PRICES = True
+# Pool for background Stripe calls; jobs are skipped, not run inline, when full
+STRIPE_ASYNC_WORKERS = 2
+STRIPE_ASYNC_MAX_PENDING = 32
+# Checkout Sessions live at least this long (Stripe requires 30 min to 24 h).
+# Sessions for an unchanged cart are reused until REUSE_MARGIN before expiry.
+CHECKOUT_SESSION_TTL = int(os.getenv("CHECKOUT_SESSION_TTL", 30 * 60))
+CHECKOUT_SESSION_WINDOW = 10 * 60
+CHECKOUT_SESSION_REUSE_MARGIN = 2 * 60
 
 # ==============================================================================
 # LOGGING
@@ -141,6 +155,8 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "core.middleware.HealthCheckMiddleware",  # PRIMERO - permite health checks
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.NPlusOneMiddleware",  # solo activo con NPLUSONE_ENABLED
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -274,12 +290,133 @@ GS_DEFAULT_ACL = None
 GS_QUERYSTRING_AUTH = False  # URLs públicas sin firma
 MEDIA_URL = f'https://storage.googleapis.com/{GS_BUCKET_NAME}/'
 
+# "local", "gcs", "cached_gcs" (GCS behind a local disk cache) or "cas"
+# (content-addressed dedup over CAS_INNER_STORAGE_TYPE)
 PROFILE_STORAGE_TYPE = "gcs"
+CAS_INNER_STORAGE_TYPE = "gcs"
+
+# cached_gcs: per-pod LRU disk cache of objects read from GCS. With
+# CACHED_GCS_SERVE_LOCALLY image URLs point at core:cached_media, which
+# serves memory-mapped copies from the cache instead of GCS.
+CACHED_GCS_DIR = os.getenv("CACHED_GCS_DIR", "/tmp/hireloop-media-cache")
+# The byte budget is shared by every worker process using CACHED_GCS_DIR.
+CACHED_GCS_MAX_BYTES = 512 * 1024 * 1024
+CACHED_GCS_EXISTS_TTL = 300  # seconds
+CACHED_GCS_SERVE_LOCALLY = False
+
+# Uploads are streamed to GCS in chunks of this size (rounded up to 256 KiB)
+# through a resumable session, so memory per upload is bounded by the chunk.
+GCS_UPLOAD_CHUNK_SIZE = 1024 * 1024
+GCS_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # enforced on the bytes actually read
+
+# ==============================================================================
+# IMAGE URL CACHE
+# ==============================================================================
+# Process-local cache of storage path -> URL used by the image services.
+# Keep IMAGE_URL_CACHE_TTL below the signed URL lifetime if GS_QUERYSTRING_AUTH
+# is enabled; with public URLs the cache is bypassed entirely.
+
+IMAGE_URL_CACHE_SIZE = 2048
+IMAGE_URL_CACHE_TTL = 300  # seconds
+IMAGE_URL_NEGATIVE_CACHE_TTL = 60  # seconds
+
+# ==============================================================================
+# BACKGROUND STORAGE UPLOADS
+# ==============================================================================
+# When enabled, image uploads are spooled to local disk and pushed to storage
+# by a small per-process thread pool after the request's transaction commits.
+# The model's image field is updated when the upload finishes.
+
+STORAGE_ASYNC_UPLOADS = os.getenv("STORAGE_ASYNC_UPLOADS", "True") == "True"
+STORAGE_ASYNC_WORKERS = 2
+STORAGE_ASYNC_MAX_PENDING = 16  # beyond this, uploads run inline
+STORAGE_ASYNC_MAX_RETRIES = 3
+STORAGE_ASYNC_SPOOL_DIR = None  # system temp dir
+# Spool files orphaned by a crashed worker are removed by
+# `manage.py cleanup_upload_spool`; schedule it daily (cron or similar).
+
+# ==============================================================================
+# CART COUNTERS
+# ==============================================================================
+# Header cart/wishlist counts are cached in the session and invalidated through
+# User.cart_version; CART_COUNTS_MAX_AGE bounds staleness after changes made
+# outside the cart services (admin, shell).
+
+CART_COUNTS_MAX_AGE = 300  # seconds
+
+# ==============================================================================
+# HEALTH CHECKS
+# ==============================================================================
+# /health/, /healthz/ and /ready/ are answered by HealthCheckMiddleware. The
+# database check is cached for HEALTH_DB_CHECK_TTL seconds and refreshed in a
+# background thread, so probes do not hold a worker waiting on the database.
+
+HEALTH_DB_CHECK_TTL = float(os.getenv("HEALTH_DB_CHECK_TTL", "5"))
+
+# ==============================================================================
+# METRICS
+# ==============================================================================
+# Each worker writes its metrics to METRICS_DIR at most every
+# METRICS_FLUSH_INTERVAL seconds; /metrics sums the files of all workers.
+
+METRICS_DIR = os.getenv("METRICS_DIR", "/tmp/hireloop-metrics")
+METRICS_FLUSH_INTERVAL = 1.0  # seconds
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# ==============================================================================
+# N+1 QUERY DETECTION
+# ==============================================================================
+# Development/test aid: report requests that run the same query (ignoring
+# parameter values) NPLUSONE_THRESHOLD times or more. With NPLUSONE_RAISE the
+# request fails instead, so the test suite catches regressions.
+
+NPLUSONE_ENABLED = os.getenv("NPLUSONE_ENABLED", "False") == "True"
+NPLUSONE_THRESHOLD = int(os.getenv("NPLUSONE_THRESHOLD", "3"))
+NPLUSONE_RAISE = os.getenv("NPLUSONE_RAISE", "False") == "True"
+
+# ==============================================================================
+# OUTBOUND HTTP
+# ==============================================================================
+# core.http keeps one pooled requests Session per dependency. Options are
+# merged over "default"; timeouts are (connect, read) seconds and retries
+# only cover idempotent requests. Stripe retries with its own idempotency
+# keys (STRIPE_MAX_NETWORK_RETRIES), so its session does not.
+
+HTTP_CLIENTS = {
+    "default": {"connect_timeout": 3.05, "read_timeout": 10, "retries": 2},
+    "stripe": {"read_timeout": 20, "retries": 0, "pool_maxsize": 20},
+    "storage": {"read_timeout": 5},
+    "http_cat": {"connect_timeout": 1.0, "read_timeout": 1.0, "retries": 0},
+}
+STRIPE_MAX_NETWORK_RETRIES = 2
+
+# A breaker opens after failure_threshold consecutive failures and lets one
+# trial call through every reset_timeout seconds: meanwhile checkout shows
+# "payments temporarily unavailable" and images fall back to the default.
+CIRCUIT_BREAKERS = {
+    "default": {"failure_threshold": 5, "reset_timeout": 30},
+    "storage": {"failure_threshold": 3},
+}
+
+# ==============================================================================
+# HTTP CAT ERROR PAGES
+# ==============================================================================
+# HttpCatMiddleware serves error images from this directory (filled by
+# `manage.py fetch_http_cats` at build time) through a small in-memory LRU.
+# Missing images are fetched from http.cat once, with a short timeout.
+
+HTTP_CAT_IMAGE_DIR = BASE_DIR / "core" / "http_cats"
+HTTP_CAT_CACHE_SIZE = 32
+HTTP_CAT_FETCH_REMOTE = True
+HTTP_CAT_TIMEOUT = 1.0  # seconds
 
 # ==============================================================================
 # DJANGO PLOTLY DASH
 # ==============================================================================
 
+# Market dashboard sections are cached per process for this many seconds.
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 60))
+
 PLOTLY_COMPONENTS = [
     'dash_core_components',
     'dash_html_components',
@@ -300,4 +437,11 @@ STATICFILES_FINDERS = [
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "core.User"
+# ProfileModelBackend loads the session user with both profiles in one query.
+# ModelBackend stays listed so sessions created before it keep working.
+AUTHENTICATION_BACKENDS = [
+    "core.backends.ProfileModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
 X_FRAME_OPTIONS = "SAMEORIGIN"
+
@@ -5,10 +5,11 @@ from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse, JsonResponse
-from django.db import connection
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache
 from core.views.landing_view import landing_page
+from core.metrics import get_registry
+from core.middleware import get_db_liveness
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -18,15 +19,12 @@ def health_check(request):
     Returns 200 if the application is healthy.
     
     Este endpoint no valida ALLOWED_HOSTS para permitir health checks internos.
+    Normalmente HealthCheckMiddleware responde antes de llegar aquí; la vista
+    queda como respaldo y usa el mismo estado de base de datos cacheado.
     """
-    try:
-        # Verifica conexión a la base de datos
-        connection.ensure_connection()
-        
-        # Retorna texto plano para evitar procesamiento JSON innecesario
-        return HttpResponse("OK", status=200, content_type="text/plain")
-    except Exception as e:
-        return HttpResponse(f"ERROR: {str(e)}", status=503, content_type="text/plain")
+    ok, detail = get_db_liveness().status()
+    # Retorna texto plano para evitar procesamiento JSON innecesario
+    return HttpResponse(detail, status=200 if ok else 503, content_type="text/plain")
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -37,6 +35,23 @@ def readiness_check(request):
     """
     return HttpResponse("READY", status=200, content_type="text/plain")
 
+
+@csrf_exempt
+@never_cache
+@require_http_methods(["GET"])
+def metrics(request):
+    """
+    Prometheus text-format metrics aggregated across all worker processes.
+    If METRICS_TOKEN is set, scrapers must send it as a bearer token.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=403)
+    return HttpResponse(
+        get_registry().render(), content_type="text/plain; version=0.0.4"
+    )
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("core/", include("core.urls", namespace="core")),
@@ -54,7 +69,9 @@ urlpatterns = [
     path("api/", include("microservices.api.urls")),
 
     path("health/", health_check, name="root_health_check"),
+    path("healthz/", health_check, name="root_healthz_check"),
     path("ready/", readiness_check, name="root_readiness_check"),
+    path("metrics", metrics, name="metrics"),
     path("i18n/", include("django.conf.urls.i18n")),
 ]
 
@@ -84,4 +84,9 @@ class MentorshipSession(models.Model):
 
     def get_image_path(self) -> str:
         image_service = MentorshipImageService()
-        return image_service.get_image_url(self.image_path)
\ No newline at end of file
+        return image_service.get_image_url(self.image_path)
+
+    def get_image_set(self):
+        """Return card/detail/placeholder URLs for srcset-capable templates."""
+        image_service = MentorshipImageService()
+        return image_service.get_image_set(self.image_path)
@@ -1,39 +1,49 @@
+import posixpath
 import uuid
+from typing import Dict, Iterable
 from django.core.files.uploadedfile import UploadedFile
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from core.interfaces.storage_interface import StorageInterface
 from core.factories.storage_factory import StorageFactory
+from core.storage.streaming import sniff_image_type
+from core.storage.url_resolver import ImageURLResolver
+from core.services.image_pipeline import ImageRenditionPipeline, ImageSet
 
 
 class MentorshipImageService:
     def __init__(self, storage: StorageInterface = None):
         self.storage: StorageInterface = storage or StorageFactory.create_storage()
+        self._url_resolver = ImageURLResolver(self.storage)
+        self._pipeline = ImageRenditionPipeline()
 
     def upload_mentorship_image(
         self, mentorship_id: uuid.UUID, image_file: UploadedFile
     ) -> str:
-        ext = image_file.name.split(".")[-1]
-        filename = f"mentorship_{mentorship_id}_{uuid.uuid4().hex}.{ext}"
-        path = f"mentorships/{filename}"
+        stem = f"mentorship_{mentorship_id}_{uuid.uuid4().hex}"
+        self.validate_image(image_file)
+        # Storage saves with full path, but return only filename for ImageField
+        full_path = self._pipeline.store(self.storage, image_file, "mentorships", stem)
+        self._url_resolver.invalidate_many(self._pipeline.all_paths(full_path))
+        return posixpath.basename(full_path)
+
+    def validate_image(self, image_file: UploadedFile) -> None:
+        """Check size and type without storing anything. Raises ValidationError."""
         if not self._is_valid_image(image_file):
             raise ValidationError(_("Invalid image file"))
-        # Storage saves with full path, but return only filename for ImageField
-        self.storage.save(image_file, path)
-        return filename
 
     def delete_mentorship_image(self, image_path: str) -> None:
         """Delete mentorship image from storage."""
         if not image_path:
             return
         
-        # If it's just a filename, prepend the mentorships directory
-        if '/' not in image_path:
-            full_path = f"mentorships/{image_path}"
+        paths = self._pipeline.all_paths(self._full_path(image_path))
+        if len(paths) == 1:
+            deleted = self.storage.delete(paths[0])
         else:
-            full_path = image_path
-        
-        return self.storage.delete(full_path)
+            deleted = self.storage.delete_many(paths) > 0
+        self._url_resolver.invalidate_many(paths)
+        return deleted
 
     def get_image_url(self, image_path: str) -> str:
         """
@@ -45,21 +55,71 @@ class MentorshipImageService:
         if not image_path:
             return self._get_default_image_url()
         
-        # If it's just a filename, prepend the mentorships directory
+        full_path = self._full_path(image_path)
+        return self._url_resolver.resolve(full_path, self._get_default_image_url())
+
+    def get_image_urls(self, image_paths: Iterable[str]) -> Dict[str, str]:
+        """
+        Get URLs for several images in a constant number of storage calls.
+        Returns a map keyed by the image_path values passed in.
+        """
+        full_paths = {path: self._full_path(path) for path in image_paths if path}
+        urls = self._url_resolver.resolve_many(
+            full_paths.values(), self._get_default_image_url()
+        )
+        return {path: urls[full_path] for path, full_path in full_paths.items()}
+
+    def get_image_set(self, image_path: str) -> ImageSet:
+        """Get src/srcset/placeholder URLs for a mentorship image."""
+        image_set = self.get_image_sets([image_path]).get(image_path)
+        if image_set:
+            return image_set
+        default_url = self._get_default_image_url()
+        return ImageSet(src=default_url, card=default_url, detail=default_url)
+
+    def get_image_sets(self, image_paths: Iterable[str]) -> Dict[str, ImageSet]:
+        """
+        Get image sets for several images in a constant number of storage calls.
+        Returns a map keyed by the image_path values passed in.
+        """
+        full_paths = {path: self._full_path(path) for path in image_paths if path}
+        urls = self._url_resolver.resolve_many(
+            [p for full in full_paths.values() for p in self._pipeline.all_paths(full)],
+            self._get_default_image_url(),
+        )
+        return {
+            path: self._pipeline.build_image_set(full_path, urls)
+            for path, full_path in full_paths.items()
+        }
+
+    def delete_mentorship_images(self, image_paths: Iterable[str]) -> int:
+        """Delete several mentorship images and their renditions in one bulk call."""
+        paths = [
+            p
+            for path in image_paths
+            if path
+            for p in self._pipeline.all_paths(self._full_path(path))
+        ]
+        if not paths:
+            return 0
+        deleted = self.storage.delete_many(paths)
+        self._url_resolver.invalidate_many(paths)
+        return deleted
+
+    def _full_path(self, image_path: str) -> str:
+        """Prepend the mentorships directory when image_path is just a filename."""
         if '/' not in image_path:
-            full_path = f"mentorships/{image_path}"
-        else:
-            full_path = image_path
-        
-        if self.storage.exists(full_path):
-            return self.storage.url(full_path)
-        return self._get_default_image_url()
+            return f"mentorships/{image_path}"
+        return image_path
 
     def _is_valid_image(self, image_file: UploadedFile) -> bool:
         if image_file.size > 5 * 1024 * 1024:
             return False
         allowed_types = ["image/jpeg", "image/png", "image/gif"]
-        return image_file.content_type in allowed_types
+        return (
+            image_file.content_type in allowed_types
+            and sniff_image_type(image_file) in allowed_types
+        )
 
     def _get_default_image_url(self) -> str:
         return "/static/core/images/default_mentorship.png"
\ No newline at end of file
@@ -13,6 +13,7 @@ from django.utils.translation import gettext_lazy as _
 from core.mixins.views import ProfileRequiredMixin
 from core.mixins.search import SearchFilterMixin
 from core.models import FreelancerProfile
+from core.services.storage_tasks import ImageUploadScheduler
 from ..models import MentorshipSession
 from ..forms.mentorship_form import (
     MentorshipSessionCreateForm,
@@ -21,7 +22,7 @@ from ..forms.mentorship_form import (
 from ..repositories.mentorship_repository import MentorshipRepository
 from ..services.mentorship_service import MentorshipService
 from ..services.image_service import MentorshipImageService
-from cart.services.cart_service import CartService, WishlistService
+from cart.services.membership_service import CartMembershipService
 
 mentorship_service = MentorshipService(repository=MentorshipRepository())
 
@@ -35,6 +36,7 @@ class MentorshipSessionListView(SearchFilterMixin, ListView):
     price_field = None  # Deshabilitamos el filtro de precio porque usamos anotación
     paginate_by = 12
     ordering = ["-created_at"]
+    img_service = MentorshipImageService()
 
     def get_queryset(self):
         # Primero obtenemos el queryset base y aplicamos la anotación
@@ -68,6 +70,10 @@ class MentorshipSessionListView(SearchFilterMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Resolve the page's image URLs in one batch so each card hits the cache
+        self.img_service.get_image_sets(s.image_path for s in context["sessions"])
+        # In-cart / wishlisted badges for the whole page in one query per table
+        CartMembershipService().annotate(self.request.user, context["sessions"])
         context["session_content_type_id"] = ContentType.objects.get_for_model(
             MentorshipSession
         ).id
@@ -109,48 +115,7 @@ class MentorshipSessionDetailView(DetailView):
         item = self.object
         context["is_owner"] = item.mentor.user == user
 
-        if user.is_authenticated:
-            cart_service = CartService()
-            wishlist_service = WishlistService()
-
-            cart_items = cart_service.list_cart(user)
-            wishlist_items = wishlist_service.list_wishlist(user)
-            ct = ContentType.objects.get_for_model(item)
-
-            cart_item = next(
-                (
-                    ci
-                    for ci in cart_items
-                    if ci.content_type_id == ct.id and ci.object_id == item.id
-                ),
-                None,
-            )
-            wishlist_item = next(
-                (
-                    wi
-                    for wi in wishlist_items
-                    if wi.content_type_id == ct.id and wi.object_id == item.id
-                ),
-                None,
-            )
-
-            context.update(
-                {
-                    "cart_item": cart_item,
-                    "wishlist_item": wishlist_item,
-                    "in_cart": bool(cart_item),
-                    "in_wishlist": bool(wishlist_item),
-                }
-            )
-        else:
-            context.update(
-                {
-                    "cart_item": None,
-                    "wishlist_item": None,
-                    "in_cart": False,
-                    "in_wishlist": False,
-                }
-            )
+        context.update(CartMembershipService().context(user, item))
 
         return context
 
@@ -161,6 +126,7 @@ class MentorshipSessionCreateView(ProfileRequiredMixin, CreateView):
     form_class = MentorshipSessionCreateForm
     template_name = "mentorship_session/create_mentorship_session.html"
     img_service = MentorshipImageService()
+    upload_scheduler = ImageUploadScheduler()
     success_url = reverse_lazy("mentorship_session:session_list")
 
     def form_valid(self, form):
@@ -176,12 +142,16 @@ class MentorshipSessionCreateView(ProfileRequiredMixin, CreateView):
 
         image_file = self.request.FILES.get("image")
         if image_file:
-            filename = self.img_service.upload_mentorship_image(
-                mentorship_id=session.id, image_file=image_file
+            # Stored filename is written to image_path once the upload finishes
+            self.upload_scheduler.schedule(
+                session,
+                "image_path",
+                image_file,
+                upload=lambda f: self.img_service.upload_mentorship_image(
+                    mentorship_id=session.id, image_file=f
+                ),
+                validate=self.img_service.validate_image,
             )
-            # Assign only filename - field's upload_to handles the directory
-            self.object.image_path = filename
-            self.object.save()
 
         return redirect(
             reverse(
@@ -201,6 +171,8 @@ class MentorshipSessionUpdateView(ProfileRequiredMixin, UpdateView):
     model = MentorshipSession
     form_class = MentorshipSessionUpdateForm
     template_name = "mentorship_session/create_mentorship_session.html"
+    img_service = MentorshipImageService()
+    upload_scheduler = ImageUploadScheduler()
 
     def form_valid(self, form):
         session = self.get_object()
@@ -214,16 +186,17 @@ class MentorshipSessionUpdateView(ProfileRequiredMixin, UpdateView):
         )
         image_file = self.request.FILES.get("image")
         if image_file:
-            if session.image_path:
-                self.img_service.delete_mentorship_image(session.image_path)
-
-            filename = self.img_service.upload_mentorship_image(
-                mentorship_id=session.id, image_file=image_file
+            # The old image is deleted only after the new one is in place
+            self.upload_scheduler.schedule(
+                session,
+                "image_path",
+                image_file,
+                upload=lambda f: self.img_service.upload_mentorship_image(
+                    mentorship_id=session.id, image_file=f
+                ),
+                delete=self.img_service.delete_mentorship_image,
+                validate=self.img_service.validate_image,
             )
-            # Assign only filename - field's upload_to handles the directory
-            session.image_path = filename
-
-        session.save()
         return redirect(
             reverse(
                 "mentorship_session:sessions_freelancer_list",
@@ -142,4 +142,9 @@ class MicroService(models.Model):
     def get_image_path(self) -> str:
         """Return full image URL or default placeholder."""
         image_service = MicroserviceImageService()
-        return image_service.get_image_url(self.image_path)
\ No newline at end of file
+        return image_service.get_image_url(self.image_path)
+
+    def get_image_set(self):
+        """Return card/detail/placeholder URLs for srcset-capable templates."""
+        image_service = MicroserviceImageService()
+        return image_service.get_image_set(self.image_path)
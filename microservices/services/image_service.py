@@ -1,9 +1,14 @@
+import posixpath
 import uuid
+from typing import Dict, Iterable
 from django.core.files.uploadedfile import UploadedFile
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from core.interfaces.storage_interface import StorageInterface
 from core.factories.storage_factory import StorageFactory
+from core.storage.streaming import sniff_image_type
+from core.storage.url_resolver import ImageURLResolver
+from core.services.image_pipeline import ImageRenditionPipeline, ImageSet
 
 
 class MicroserviceImageService:
@@ -17,34 +22,41 @@ class MicroserviceImageService:
 
     def __init__(self, storage: StorageInterface = None):
         self._storage: StorageInterface = storage or StorageFactory.create_storage()
+        self._url_resolver = ImageURLResolver(self._storage)
+        self._pipeline = ImageRenditionPipeline()
 
     def upload_microservice_image(
         self, microservice_id: uuid.UUID, image_file: UploadedFile
     ) -> str:
         """Upload microservice image and return filename only."""
-        file_extension = image_file.name.split(".")[-1]
-        filename = f"microservice_{microservice_id}_{uuid.uuid4().hex}.{file_extension}"
-        path = f"microservices/{filename}"
+        stem = f"microservice_{microservice_id}_{uuid.uuid4().hex}"
 
-        if not self._is_valid_image(image_file):
-            raise ValueError("Invalid image file")
+        self.validate_image(image_file)
 
         # Storage saves with full path, but return only filename for ImageField
-        self._storage.save(image_file, path)
-        return filename
+        full_path = self._pipeline.store(
+            self._storage, image_file, "microservices", stem
+        )
+        self._url_resolver.invalidate_many(self._pipeline.all_paths(full_path))
+        return posixpath.basename(full_path)
+
+    def validate_image(self, image_file: UploadedFile) -> None:
+        """Check size and type without storing anything. Raises ValueError."""
+        if not self._is_valid_image(image_file):
+            raise ValueError("Invalid image file")
 
     def delete_microservice_image(self, image_path: str) -> None:
         """Delete microservice image from storage."""
         if not image_path:
             return True
         
-        # If it's just a filename, prepend the microservices directory
-        if '/' not in image_path:
-            full_path = f"microservices/{image_path}"
+        paths = self._pipeline.all_paths(self._full_path(image_path))
+        if len(paths) == 1:
+            deleted = self._storage.delete(paths[0])
         else:
-            full_path = image_path
-        
-        return self._storage.delete(full_path)
+            deleted = self._storage.delete_many(paths) > 0
+        self._url_resolver.invalidate_many(paths)
+        return deleted
 
     def get_image_url(self, image_path: str) -> str:
         """
@@ -56,21 +68,69 @@ class MicroserviceImageService:
         if not image_path:
             return self._get_default_image_url()
         
-        # If it's just a filename, prepend the microservices directory
+        full_path = self._full_path(image_path)
+        return self._url_resolver.resolve(full_path, self._get_default_image_url())
+
+    def get_image_urls(self, image_paths: Iterable[str]) -> Dict[str, str]:
+        """
+        Get URLs for several images in a constant number of storage calls.
+        Returns a map keyed by the image_path values passed in.
+        """
+        full_paths = {path: self._full_path(path) for path in image_paths if path}
+        urls = self._url_resolver.resolve_many(
+            full_paths.values(), self._get_default_image_url()
+        )
+        return {path: urls[full_path] for path, full_path in full_paths.items()}
+
+    def get_image_set(self, image_path: str) -> ImageSet:
+        """Get src/srcset/placeholder URLs for a microservice image."""
+        image_set = self.get_image_sets([image_path]).get(image_path)
+        if image_set:
+            return image_set
+        default_url = self._get_default_image_url()
+        return ImageSet(src=default_url, card=default_url, detail=default_url)
+
+    def get_image_sets(self, image_paths: Iterable[str]) -> Dict[str, ImageSet]:
+        """
+        Get image sets for several images in a constant number of storage calls.
+        Returns a map keyed by the image_path values passed in.
+        """
+        full_paths = {path: self._full_path(path) for path in image_paths if path}
+        urls = self._url_resolver.resolve_many(
+            [p for full in full_paths.values() for p in self._pipeline.all_paths(full)],
+            self._get_default_image_url(),
+        )
+        return {
+            path: self._pipeline.build_image_set(full_path, urls)
+            for path, full_path in full_paths.items()
+        }
+
+    def delete_microservice_images(self, image_paths: Iterable[str]) -> int:
+        """Delete several microservice images and their renditions in one bulk call."""
+        paths = [
+            p
+            for path in image_paths
+            if path
+            for p in self._pipeline.all_paths(self._full_path(path))
+        ]
+        if not paths:
+            return 0
+        deleted = self._storage.delete_many(paths)
+        self._url_resolver.invalidate_many(paths)
+        return deleted
+
+    def _full_path(self, image_path: str) -> str:
+        """Prepend the microservices directory when image_path is just a filename."""
         if '/' not in image_path:
-            full_path = f"microservices/{image_path}"
-        else:
-            full_path = image_path
-        
-        if self._storage.exists(full_path):
-            return self._storage.url(full_path)
-        return self._get_default_image_url()
+            return f"microservices/{image_path}"
+        return image_path
 
     def _is_valid_image(self, image_file: UploadedFile) -> bool:
         """Validate file size and content type."""
         return (
             image_file.size <= self.MAX_SIZE
             and image_file.content_type in self.ALLOWED_TYPES
+            and sniff_image_type(image_file) in self.ALLOWED_TYPES
         )
 
     def _get_default_image_url(self) -> str:
@@ -7,7 +7,6 @@ from django.views.generic import (
     DeleteView,
     DetailView,
 )
-from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import gettext_lazy as _
 from core.mixins.views import ProfileRequiredMixin
 from core.mixins.search import SearchFilterMixin
@@ -16,11 +15,13 @@ from ..forms import MicroServiceForm
 from ..models import MicroService, Category
 from ..services.microservices_service import MicroServiceService
 from ..services.image_service import MicroserviceImageService
-from cart.services.cart_service import CartService, WishlistService
+from cart.services.membership_service import CartMembershipService
+from core.services.storage_tasks import ImageUploadScheduler
 
 
 microservice_service = MicroServiceService()
 image_service = MicroserviceImageService()
+upload_scheduler = ImageUploadScheduler()
 
 
 class MicroServiceListView(SearchFilterMixin, ListView):
@@ -45,6 +46,8 @@ class MicroServiceListView(SearchFilterMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Resolve the page's image URLs in one batch so each card hits the cache
+        image_service.get_image_sets(m.image_path for m in context["microservices"])
         # Optional: Add popular categories if needed in template
         context["popular_categories"] = Category.objects.values_list("name", flat=True).order_by("name")
         return context
@@ -88,40 +91,7 @@ class MicroServiceDetailView(DetailView):
         )
         context["is_owner"] = is_owner
 
-        if user.is_authenticated:
-            cart_service = CartService()
-            wishlist_service = WishlistService()
-
-            cart_items = cart_service.list_cart(user)
-            wishlist_items = wishlist_service.list_wishlist(user)
-            ct = ContentType.objects.get_for_model(item)
-
-            cart_item = next(
-                (ci for ci in cart_items if ci.content_type_id == ct.id and ci.object_id == item.id),
-                None,
-            )
-            wishlist_item = next(
-                (wi for wi in wishlist_items if wi.content_type_id == ct.id and wi.object_id == item.id),
-                None,
-            )
-
-            context.update(
-                {
-                    "cart_item": cart_item,
-                    "wishlist_item": wishlist_item,
-                    "in_cart": bool(cart_item),
-                    "in_wishlist": bool(wishlist_item),
-                }
-            )
-        else:
-            context.update(
-                {
-                    "cart_item": None,
-                    "wishlist_item": None,
-                    "in_cart": False,
-                    "in_wishlist": False,
-                }
-            )
+        context.update(CartMembershipService().context(user, item))
 
         return context
 
@@ -141,12 +111,16 @@ class MicroServiceCreateView(ProfileRequiredMixin, CreateView):
 
         image_file = self.request.FILES.get("image")
         if image_file:
-            filename = self.image_service.upload_microservice_image(
-                microservice_id=self.object.id, image_file=image_file
+            # Stored filename is written to image_path once the upload finishes
+            upload_scheduler.schedule(
+                microservice,
+                "image_path",
+                image_file,
+                upload=lambda f: image_service.upload_microservice_image(
+                    microservice_id=microservice.id, image_file=f
+                ),
+                validate=image_service.validate_image,
             )
-            # Assign only filename - field's upload_to handles the directory
-            self.object.image_path = filename
-            self.object.save()
 
         return redirect(
             reverse(
@@ -178,15 +152,17 @@ class MicroServiceUpdateView(ProfileRequiredMixin, UpdateView):
 
         image_file = self.request.FILES.get("image")
         if image_file:
-            if microservice.image_path:
-                image_service.delete_microservice_image(microservice.image_path)
-
-            filename = self.image_service.upload_microservice_image(
-                microservice.id, image_file
+            # The old image is deleted only after the new one is in place
+            upload_scheduler.schedule(
+                microservice,
+                "image_path",
+                image_file,
+                upload=lambda f: image_service.upload_microservice_image(
+                    microservice.id, f
+                ),
+                delete=image_service.delete_microservice_image,
+                validate=image_service.validate_image,
             )
-            # Assign only filename - field's upload_to handles the directory
-            microservice.image_path = filename
-            microservice.save()
 
         return redirect(
             reverse(
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from payments.services.webhook_service import StripeWebhookService
+
+
+class Command(BaseCommand):
+    help = "Process stored Stripe webhook events that have not succeeded yet"
+
+    def handle(self, *args, **options):
+        processed = StripeWebhookService().process_pending()
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} events"))
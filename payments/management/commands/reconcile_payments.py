@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from payments.services.reconciliation import PaymentReconciler
+
+
+class Command(BaseCommand):
+    help = "Sync payment statuses with Stripe Checkout Sessions since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=(
+                "List sessions created in the last N days "
+                "instead of since the checkpoint"
+            ),
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report changes without saving them or moving the checkpoint",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["days"] is not None:
+            since = timezone.now() - timedelta(days=options["days"])
+
+        reconciler = PaymentReconciler(batch_size=options["batch_size"])
+        result = reconciler.run(since=since, dry_run=options["dry_run"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.sessions} sessions checked, {result.matched} matched, "
+                f"{result.updated} payments updated. "
+                f"Next run starts at {result.cursor}."
+            )
+        )
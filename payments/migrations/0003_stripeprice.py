@@ -0,0 +1,73 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:41
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("payments", "0002_alter_payment_options_payment_updated_at_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripePrice",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.UUIDField(verbose_name="object id")),
+                ("version", models.CharField(max_length=64, verbose_name="Version")),
+                (
+                    "unit_amount",
+                    models.PositiveIntegerField(
+                        help_text="Price in the currency's smallest unit (e.g., cents for USD).",
+                        verbose_name="Unit amount",
+                    ),
+                ),
+                ("currency", models.CharField(max_length=10, verbose_name="Currency")),
+                (
+                    "stripe_product_id",
+                    models.CharField(max_length=255, verbose_name="Stripe Product ID"),
+                ),
+                (
+                    "stripe_price_id",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Stripe Price ID"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="content type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stripe Price",
+                "verbose_name_plural": "Stripe Prices",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id", "version"),
+                        name="unique_stripe_price_version",
+                    )
+                ],
+            },
+        ),
+    ]
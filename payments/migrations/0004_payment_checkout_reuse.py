@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0003_stripeprice"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="cart_fingerprint",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Hash of the cart items, quantities and prices checked out.",
+                max_length=64,
+                verbose_name="Cart fingerprint",
+            ),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="checkout_url",
+            field=models.URLField(
+                blank=True,
+                default="",
+                help_text="Stripe-hosted page of the Checkout Session.",
+                max_length=2048,
+                verbose_name="Checkout URL",
+            ),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="expires_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the Stripe Checkout Session expires.",
+                null=True,
+                verbose_name="Expires At",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["user", "cart_fingerprint"],
+                name="payments_pa_user_id_944edc_idx",
+            ),
+        ),
+    ]
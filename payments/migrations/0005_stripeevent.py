@@ -0,0 +1,79 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:51
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0004_payment_checkout_reuse"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripeEvent",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stripe_event_id",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Stripe Event ID"
+                    ),
+                ),
+                ("type", models.CharField(max_length=100, verbose_name="Type")),
+                ("payload", models.JSONField(verbose_name="Payload")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("received", "Received"),
+                            ("processed", "Processed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="received",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, default="", verbose_name="Last error"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Processed At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stripe Event",
+                "verbose_name_plural": "Stripe Events",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="payments_st_status_f12f17_idx",
+                    )
+                ],
+            },
+        ),
+    ]
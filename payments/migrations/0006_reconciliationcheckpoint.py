@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0005_stripeevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReconciliationCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="Name"),
+                ),
+                ("cursor", models.DateTimeField(verbose_name="Cursor")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Reconciliation Checkpoint",
+                "verbose_name_plural": "Reconciliation Checkpoints",
+            },
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
+from django.contrib.contenttypes.models import ContentType
 
 
 class Payment(models.Model):
@@ -60,6 +61,26 @@ class Payment(models.Model):
         verbose_name=_("Currency"),
         help_text=_("ISO 4217 currency code (e.g., usd, eur).")
     )
+    cart_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        verbose_name=_("Cart fingerprint"),
+        help_text=_("Hash of the cart items, quantities and prices checked out.")
+    )
+    checkout_url = models.URLField(
+        max_length=2048,
+        blank=True,
+        default="",
+        verbose_name=_("Checkout URL"),
+        help_text=_("Stripe-hosted page of the Checkout Session.")
+    )
+    expires_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_("Expires At"),
+        help_text=_("When the Stripe Checkout Session expires.")
+    )
     status = models.CharField(
         max_length=50,
         choices=PaymentStatus.choices,
@@ -86,6 +107,7 @@ class Payment(models.Model):
             models.Index(fields=["stripe_session_id"]),
             models.Index(fields=["user", "status"]),
             models.Index(fields=["created_at"]),
+            models.Index(fields=["user", "cart_fingerprint"]),
         ]
 
     def __str__(self) -> str:
@@ -108,4 +130,119 @@ class Payment(models.Model):
 
     def is_failed(self) -> bool:
         """Check if payment failed."""
-        return self.status == self.PaymentStatus.FAILED
\ No newline at end of file
+        return self.status == self.PaymentStatus.FAILED
+
+
+class StripePrice(models.Model):
+    """
+    Stripe Product/Price created for one version of a purchasable.
+
+    The version fingerprints what Stripe stores immutably on a Price or shows
+    from the Product (amount, currency, name, description), so a changed
+    price or title gets a new row and existing rows can be reused as-is.
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name=_("ID")
+    )
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, verbose_name=_("content type")
+    )
+    object_id = models.UUIDField(verbose_name=_("object id"))
+    version = models.CharField(max_length=64, verbose_name=_("Version"))
+    unit_amount = models.PositiveIntegerField(
+        verbose_name=_("Unit amount"),
+        help_text=_("Price in the currency's smallest unit (e.g., cents for USD).")
+    )
+    currency = models.CharField(max_length=10, verbose_name=_("Currency"))
+    stripe_product_id = models.CharField(
+        max_length=255, verbose_name=_("Stripe Product ID")
+    )
+    stripe_price_id = models.CharField(
+        max_length=255, unique=True, verbose_name=_("Stripe Price ID")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+
+    class Meta:
+        verbose_name = _("Stripe Price")
+        verbose_name_plural = _("Stripe Prices")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "version"],
+                name="unique_stripe_price_version",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.stripe_price_id} ({self.unit_amount} {self.currency.upper()})"
+
+
+class StripeEvent(models.Model):
+    """
+    A Stripe webhook event as received, keyed by its Stripe ID.
+
+    Stripe delivers events at least once, so the unique event ID makes
+    redeliveries no-ops and the stored payload lets failed events be
+    processed again later.
+    """
+
+    class EventStatus(models.TextChoices):
+        RECEIVED = "received", _("Received")
+        PROCESSED = "processed", _("Processed")
+        FAILED = "failed", _("Failed")
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name=_("ID")
+    )
+    stripe_event_id = models.CharField(
+        max_length=255, unique=True, verbose_name=_("Stripe Event ID")
+    )
+    type = models.CharField(max_length=100, verbose_name=_("Type"))
+    payload = models.JSONField(verbose_name=_("Payload"))
+    status = models.CharField(
+        max_length=20,
+        choices=EventStatus.choices,
+        default=EventStatus.RECEIVED,
+        verbose_name=_("Status")
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    last_error = models.TextField(blank=True, default="", verbose_name=_("Last error"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    processed_at = models.DateTimeField(
+        blank=True, null=True, verbose_name=_("Processed At")
+    )
+
+    class Meta:
+        verbose_name = _("Stripe Event")
+        verbose_name_plural = _("Stripe Events")
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.stripe_event_id} ({self.type}, {self.status})"
+
+
+class ReconciliationCheckpoint(models.Model):
+    """
+    Where an incremental Stripe reconciliation job should resume.
+
+    The cursor is the creation time from which Stripe objects still have to
+    be listed: everything created before it had reached a final state.
+    """
+
+    name = models.CharField(max_length=100, unique=True, verbose_name=_("Name"))
+    cursor = models.DateTimeField(verbose_name=_("Cursor"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Reconciliation Checkpoint")
+        verbose_name_plural = _("Reconciliation Checkpoints")
+
+    def __str__(self) -> str:
+        return f"{self.name} @ {self.cursor:%Y-%m-%d %H:%M}"
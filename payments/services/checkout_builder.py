@@ -0,0 +1,256 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.db.models import Q
+import stripe
+from cart.services.pricing_service import CartPricingService
+from core.services.storage_tasks import BackgroundStorageExecutor
+from mentorship_session.models import MentorshipSession
+from mentorship_session.services.image_service import MentorshipImageService
+from microservices.models import MicroService
+from microservices.services.image_service import MicroserviceImageService
+from ..models import StripePrice
+from .stripe_client import get_stripe_executor
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SERVICES = {
+    MicroService: MicroserviceImageService,
+    MentorshipSession: MentorshipImageService,
+}
+
+
+@dataclass
+class LineSpec:
+    """Everything Stripe needs to know about one cart line."""
+
+    content_type_id: int
+    object_id: object
+    quantity: int
+    unit_amount: int
+    currency: str
+    name: str
+    description: str
+    image_url: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        raw = "|".join(
+            [str(self.unit_amount), self.currency, self.name, self.description]
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def price_data(self) -> dict:
+        product_data = {"name": self.name}
+        if self.description:
+            product_data["description"] = self.description
+        if self.image_url:
+            product_data["images"] = [self.image_url]
+        return {
+            "currency": self.currency,
+            "unit_amount": self.unit_amount,
+            "product_data": product_data,
+        }
+
+
+@dataclass
+class CheckoutPlan:
+    cart_items: list = field(default_factory=list)
+    line_items: List[dict] = field(default_factory=list)
+    total: Decimal = Decimal("0.00")
+    # Lines sent as inline price_data because no cached Price exists yet
+    uncached: List[LineSpec] = field(default_factory=list)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the cart contents: items, quantities and unit prices."""
+        raw = "|".join(
+            sorted(
+                f"{item.id}:{item.quantity}:{item.unit_price}"
+                for item in self.cart_items
+            )
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @property
+    def line_items_digest(self) -> str:
+        """Identifies the exact line_items sent to Stripe."""
+        raw = json.dumps(self.line_items, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+class CheckoutBuilder:
+    """
+    Builds Stripe Checkout line items for a cart.
+
+    The cart is priced and its purchasables loaded by CartPricingService,
+    image URLs are resolved in one batch per type, and lines whose current
+    version already has a Stripe Price reference that ID. Lines without one
+    are sent as inline price_data, and their Product/Price is created on the
+    Stripe executor so the next checkout can reuse it; building a plan
+    therefore never calls Stripe.
+    """
+
+    def __init__(
+        self,
+        pricing: CartPricingService = None,
+        currency: str = "usd",
+        image_services: Dict[type, object] = None,
+        executor: BackgroundStorageExecutor = None,
+    ):
+        self.executor = executor
+        self.pricing = pricing or CartPricingService()
+        self.currency = currency
+        self.image_services = image_services or {
+            model: service_class() for model, service_class in IMAGE_SERVICES.items()
+        }
+
+    def build(self, user) -> CheckoutPlan:
+        cart = self.pricing.price_cart(user)
+        specs = self._line_specs(cart.items)
+        cached = self._cached_prices(specs)
+
+        plan = CheckoutPlan(cart_items=cart.items, total=cart.total)
+        for spec in specs:
+            price_id = cached.get((spec.content_type_id, spec.object_id, spec.version))
+            if price_id:
+                plan.line_items.append({"price": price_id, "quantity": spec.quantity})
+            else:
+                plan.line_items.append(
+                    {"price_data": spec.price_data(), "quantity": spec.quantity}
+                )
+                plan.uncached.append(spec)
+        return plan
+
+    def schedule_price_sync(self, plan: CheckoutPlan) -> None:
+        """
+        Create the missing Stripe Prices outside the request. Skipped when
+        the Stripe executor is saturated; the next checkout schedules it again.
+        """
+        if not plan.uncached or not getattr(settings, "STRIPE_CACHE_PRICES", True):
+            return
+        specs = list(plan.uncached)
+        executor = self.executor or get_stripe_executor()
+        executor.submit(
+            lambda: self.sync_prices(specs), description="Stripe price sync"
+        )
+
+    def sync_prices(self, specs: List[LineSpec]) -> None:
+        """Create and record a Stripe Product/Price for each spec."""
+        for spec in specs:
+            if StripePrice.objects.filter(
+                content_type_id=spec.content_type_id,
+                object_id=spec.object_id,
+                version=spec.version,
+            ).exists():
+                continue
+            product_id = self._product_id(spec)
+            # The idempotency key makes concurrent syncs share one Price
+            price = stripe.Price.create(
+                product=product_id,
+                unit_amount=spec.unit_amount,
+                currency=spec.currency,
+                idempotency_key=(
+                    f"price-{spec.content_type_id}-{spec.object_id}-{spec.version}"
+                ),
+            )
+            StripePrice.objects.get_or_create(
+                content_type_id=spec.content_type_id,
+                object_id=spec.object_id,
+                version=spec.version,
+                defaults={
+                    "unit_amount": spec.unit_amount,
+                    "currency": spec.currency,
+                    "stripe_product_id": product_id,
+                    "stripe_price_id": price.id,
+                },
+            )
+
+    def _product_id(self, spec: LineSpec) -> str:
+        existing = (
+            StripePrice.objects.filter(
+                content_type_id=spec.content_type_id, object_id=spec.object_id
+            )
+            .order_by("-created_at")
+            .values_list("stripe_product_id", flat=True)
+            .first()
+        )
+        product_data = spec.price_data()["product_data"]
+        if existing:
+            stripe.Product.modify(existing, **product_data)
+            return existing
+        product = stripe.Product.create(
+            **product_data,
+            metadata={
+                "content_type_id": spec.content_type_id,
+                "object_id": str(spec.object_id),
+            },
+        )
+        return product.id
+
+    def _line_specs(self, items) -> List[LineSpec]:
+        image_urls = self._image_urls(items)
+        specs = []
+        for item in items:
+            obj = item.content_object
+            if obj is None:
+                logger.warning(f"CartItem {item.id} has no content_object.")
+                continue
+            image_url = image_urls.get((type(obj), obj.image_path))
+            specs.append(
+                LineSpec(
+                    content_type_id=item.content_type_id,
+                    object_id=item.object_id,
+                    quantity=item.quantity,
+                    unit_amount=int(item.unit_price * 100),  # Convert to cents
+                    currency=self.currency,
+                    name=obj.get_title()[:255],
+                    description=(obj.get_description() or "")[:500],
+                    # Stripe requires HTTPS URLs
+                    image_url=(
+                        image_url
+                        if image_url and image_url.startswith("https://")
+                        else None
+                    ),
+                )
+            )
+        return specs
+
+    def _image_urls(self, items) -> Dict[tuple, str]:
+        """Resolve every line's image URL with one batch call per type."""
+        paths_by_model = {}
+        for item in items:
+            obj = item.content_object
+            if obj is not None and type(obj) in self.image_services:
+                paths_by_model.setdefault(type(obj), set()).add(obj.image_path)
+
+        urls = {}
+        for model, paths in paths_by_model.items():
+            service = self.image_services[model]
+            resolved = service.get_image_urls(p for p in paths if p)
+            for path in paths:
+                urls[(model, path)] = (
+                    resolved.get(path) if path else service.get_image_url(None)
+                )
+        return urls
+
+    def _cached_prices(self, specs: List[LineSpec]) -> Dict[tuple, str]:
+        if not specs:
+            return {}
+        q = Q()
+        for spec in specs:
+            q |= Q(
+                content_type_id=spec.content_type_id,
+                object_id=spec.object_id,
+                version=spec.version,
+            )
+        return {
+            (ct, object_id, version): price_id
+            for ct, object_id, version, price_id in StripePrice.objects.filter(
+                q
+            ).values_list("content_type_id", "object_id", "version", "stripe_price_id")
+        }
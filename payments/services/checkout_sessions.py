@@ -0,0 +1,95 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional, Tuple
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+import stripe
+from ..models import Payment
+from .checkout_builder import CheckoutPlan
+
+logger = logging.getLogger(__name__)
+
+
+class CheckoutSessionService:
+    """
+    Creates Stripe Checkout Sessions and reuses an open one when the same
+    cart is checked out again (double clicks, back-button resubmits).
+
+    Pending payments store a fingerprint of the cart; an unexpired session
+    with the same fingerprint is returned without calling Stripe. Requests
+    that race past that check send the same idempotency key and identical
+    parameters (expires_at is aligned to a time window), so Stripe returns
+    the same session instead of creating a second one. The key also covers
+    the serialized line items, which change once cached Prices replace
+    inline price_data; Stripe rejects a reused key with other parameters.
+    """
+
+    def __init__(self, ttl: int = None, window: int = None, reuse_margin: int = None):
+        self.ttl = ttl or getattr(settings, "CHECKOUT_SESSION_TTL", 30 * 60)
+        self.window = window or getattr(settings, "CHECKOUT_SESSION_WINDOW", 10 * 60)
+        self.reuse_margin = reuse_margin or getattr(
+            settings, "CHECKOUT_SESSION_REUSE_MARGIN", 2 * 60
+        )
+
+    def find_reusable(self, user, fingerprint: str) -> Optional[Payment]:
+        """An open session for the same cart that is not about to expire."""
+        return (
+            Payment.objects.filter(
+                user=user,
+                cart_fingerprint=fingerprint,
+                status=Payment.PaymentStatus.PENDING,
+                expires_at__gt=timezone.now() + timedelta(seconds=self.reuse_margin),
+            )
+            .exclude(checkout_url="")
+            .order_by("-created_at")
+            .first()
+        )
+
+    def create(self, request, plan: CheckoutPlan) -> Tuple[Payment, bool]:
+        """Create the Stripe session and its pending Payment."""
+        user = request.user
+        window_start = int(time.time() // self.window) * self.window
+        # At least ttl seconds from now, and identical within one window
+        expires_at = window_start + self.window + self.ttl
+
+        checkout_session = stripe.checkout.Session.create(
+            payment_method_types=["card"],
+            line_items=plan.line_items,
+            mode="payment",
+            # Stripe fills in the placeholder, so it must not be URL-encoded
+            success_url=request.build_absolute_uri(reverse("payments:success"))
+            + "?session_id={CHECKOUT_SESSION_ID}",
+            cancel_url=request.build_absolute_uri(reverse("payments:cancel")),
+            client_reference_id=str(user.id),
+            metadata={
+                "user_id": str(user.id),
+                "cart_items": ",".join(str(ci.id) for ci in plan.cart_items),
+            },
+            expires_at=expires_at,
+            idempotency_key=(
+                f"checkout-{user.id}-{plan.fingerprint}-"
+                f"{plan.line_items_digest}-{window_start}"
+            ),
+        )
+
+        try:
+            with transaction.atomic():
+                payment = Payment.objects.create(
+                    user=user,
+                    stripe_session_id=checkout_session.id,
+                    stripe_payment_intent=checkout_session.payment_intent,
+                    amount=plan.total,
+                    currency="usd",
+                    status=Payment.PaymentStatus.PENDING,
+                    cart_fingerprint=plan.fingerprint,
+                    checkout_url=checkout_session.url,
+                    expires_at=datetime.fromtimestamp(expires_at, tz=dt_timezone.utc),
+                )
+            return payment, True
+        except IntegrityError:
+            # A concurrent request got the same session back from Stripe
+            logger.info(f"Reusing checkout session {checkout_session.id}")
+            return Payment.objects.get(stripe_session_id=checkout_session.id), False
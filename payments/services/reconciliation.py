@@ -0,0 +1,177 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterable, List, Optional
+from django.db import transaction
+from django.utils import timezone
+import stripe
+from cart.models import CartItem
+from cart.services.counter_service import CartCounterService
+from ..models import Payment, ReconciliationCheckpoint
+from .webhook_service import purchased_items, session_payment_intent
+
+logger = logging.getLogger(__name__)
+
+PAID = ("paid", "no_payment_required")
+
+
+def session_outcome(session: dict) -> Optional[str]:
+    """
+    The final Payment status for a Checkout Session, or None while open.
+
+    A complete but unpaid session is a delayed payment method: it failed
+    unless its (expanded) PaymentIntent is still processing.
+    """
+    if session["status"] == "expired":
+        return Payment.PaymentStatus.CANCELED
+    if session["status"] != "complete":
+        return None
+    if session.get("payment_status") in PAID:
+        return Payment.PaymentStatus.SUCCEEDED
+    payment_intent = session.get("payment_intent")
+    if (
+        isinstance(payment_intent, dict)
+        and payment_intent.get("status") == "processing"
+    ):
+        return None
+    return Payment.PaymentStatus.FAILED
+
+
+@dataclass
+class ReconciliationResult:
+    sessions: int = 0
+    matched: int = 0
+    updated: int = 0
+    cursor: Optional[datetime] = None
+
+
+class PaymentReconciler:
+    """
+    Brings local payments in line with Stripe Checkout Sessions.
+
+    Sessions are listed by creation window with auto-pagination and handled
+    in batches: each batch is matched to payments with one query on the
+    unique stripe_session_id and written back with one bulk_update. The
+    checkpoint then moves to the oldest session that is still open, so the
+    next run only lists sessions that can still change.
+    """
+
+    CHECKPOINT = "stripe_checkout_sessions"
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        initial_window: timedelta = timedelta(days=7),
+        counter_service: CartCounterService = None,
+    ):
+        self.batch_size = batch_size
+        self.initial_window = initial_window
+        self.counters = counter_service or CartCounterService()
+
+    def run(
+        self,
+        since: datetime = None,
+        until: datetime = None,
+        dry_run: bool = False,
+    ) -> ReconciliationResult:
+        until = until or timezone.now()
+        since = since or self.checkpoint() or until - self.initial_window
+        result = ReconciliationResult()
+        oldest_open = None
+
+        sessions = stripe.checkout.Session.list(
+            created={"gte": int(since.timestamp()), "lt": int(until.timestamp())},
+            limit=100,
+            # Needed to tell failed delayed payments from ones still processing
+            expand=["data.payment_intent"],
+        )
+        batch = []
+        for session in sessions.auto_paging_iter():
+            result.sessions += 1
+            if session_outcome(session) is None:
+                created = session["created"]
+                oldest_open = (
+                    created if oldest_open is None else min(oldest_open, created)
+                )
+            batch.append(session)
+            if len(batch) >= self.batch_size:
+                self._apply(batch, result, dry_run)
+                batch = []
+        if batch:
+            self._apply(batch, result, dry_run)
+
+        result.cursor = (
+            datetime.fromtimestamp(oldest_open, tz=dt_timezone.utc)
+            if oldest_open is not None
+            else until
+        )
+        if not dry_run:
+            ReconciliationCheckpoint.objects.update_or_create(
+                name=self.CHECKPOINT, defaults={"cursor": result.cursor}
+            )
+        logger.info(
+            f"Reconciled {result.sessions} sessions, {result.updated} payments "
+            f"updated; next run starts at {result.cursor}"
+        )
+        return result
+
+    def checkpoint(self) -> Optional[datetime]:
+        return (
+            ReconciliationCheckpoint.objects.filter(name=self.CHECKPOINT)
+            .values_list("cursor", flat=True)
+            .first()
+        )
+
+    def _apply(
+        self, sessions: List[dict], result: ReconciliationResult, dry_run: bool
+    ) -> None:
+        payments = Payment.objects.in_bulk(
+            [session["id"] for session in sessions], field_name="stripe_session_id"
+        )
+        now = timezone.now()
+        changed, paid = [], []
+        for session in sessions:
+            payment = payments.get(session["id"])
+            if payment is None:
+                continue
+            result.matched += 1
+            dirty = False
+            status = session_outcome(session)
+            # Only pending payments move; webhooks may already have settled others
+            if status and payment.status == Payment.PaymentStatus.PENDING:
+                payment.status = status
+                dirty = True
+                if status == Payment.PaymentStatus.SUCCEEDED:
+                    paid.append(session)
+            payment_intent = session_payment_intent(session)
+            if payment_intent and payment.stripe_payment_intent != payment_intent:
+                payment.stripe_payment_intent = payment_intent
+                dirty = True
+            if dirty:
+                payment.updated_at = now
+                changed.append(payment)
+
+        result.updated += len(changed)
+        if dry_run or not changed:
+            return
+        with transaction.atomic():
+            Payment.objects.bulk_update(
+                changed, ["status", "stripe_payment_intent", "updated_at"]
+            )
+            self._clear_carts(paid)
+
+    def _clear_carts(self, sessions: Iterable[dict]) -> None:
+        """Remove the purchased items of paid sessions with one DELETE."""
+        user_ids, item_ids = set(), []
+        for session in sessions:
+            user_id, ids = purchased_items(session)
+            if user_id and ids:
+                user_ids.add(user_id)
+                item_ids.extend(ids)
+        if not item_ids:
+            return
+        deleted, _details = CartItem.objects.filter(
+            user_id__in=user_ids, id__in=item_ids
+        ).delete()
+        if deleted:
+            self.counters.invalidate_users(user_ids)
@@ -0,0 +1,83 @@
+import logging
+import threading
+from typing import Optional
+from django.conf import settings
+import stripe
+from core.services.storage_tasks import BackgroundStorageExecutor
+from core.http import (
+    CircuitBreaker,
+    client_options,
+    get_circuit_breaker,
+    get_http_session,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StripeUnavailableError(stripe.error.APIConnectionError):
+    """Stripe calls are short-circuited while its breaker is open."""
+
+
+class CircuitBreakingRequestsClient(stripe.RequestsClient):
+    """
+    Stripe HTTP client on the shared pooled session, behind the "stripe"
+    circuit breaker. Connection errors and 5xx responses count as failures;
+    while the breaker is open requests fail at once with a non-retryable
+    StripeUnavailableError instead of waiting on the network.
+    """
+
+    def __init__(self, breaker: CircuitBreaker = None, **kwargs):
+        super().__init__(**kwargs)
+        self.breaker = breaker or get_circuit_breaker("stripe")
+
+    def _request_internal(self, method, url, headers, post_data, is_streaming):
+        if not self.breaker.allow():
+            raise StripeUnavailableError(
+                "Stripe is temporarily unavailable.", should_retry=False
+            )
+        try:
+            result = super()._request_internal(
+                method, url, headers, post_data, is_streaming
+            )
+        except stripe.error.APIConnectionError:
+            self.breaker.record_failure()
+            raise
+        if result[1] >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+
+def configure_stripe() -> None:
+    """Point the stripe library at our key, retry budget and HTTP client."""
+    options = client_options("stripe")
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe.max_network_retries = getattr(settings, "STRIPE_MAX_NETWORK_RETRIES", 2)
+    stripe.default_http_client = CircuitBreakingRequestsClient(
+        session=get_http_session("stripe"),
+        timeout=(options["connect_timeout"], options["read_timeout"]),
+    )
+
+
+_executor: Optional[BackgroundStorageExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_stripe_executor() -> BackgroundStorageExecutor:
+    """
+    Return the pool for background Stripe API work. It is separate from the
+    storage executor so Stripe calls never compete with image uploads, and
+    jobs are dropped rather than run inline when it is saturated.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BackgroundStorageExecutor(
+                    max_workers=getattr(settings, "STRIPE_ASYNC_WORKERS", 2),
+                    max_pending=getattr(settings, "STRIPE_ASYNC_MAX_PENDING", 32),
+                    inline_when_full=False,
+                    thread_name_prefix="stripe",
+                )
+    return _executor
@@ -0,0 +1,204 @@
+import json
+import logging
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+import stripe
+from cart.models import CartItem
+from cart.services.counter_service import CartCounterService
+from core.services.storage_tasks import BackgroundStorageExecutor, get_storage_executor
+from ..models import Payment, StripeEvent
+
+logger = logging.getLogger(__name__)
+
+
+class StripeWebhookService:
+    """
+    Records verified Stripe webhook events and applies them to payments.
+
+    Each event is stored once by its Stripe ID and processed after the
+    request (STRIPE_WEBHOOK_ASYNC) so the endpoint can acknowledge Stripe
+    immediately. Payments are looked up by stripe_session_id and only move
+    forward from their current status, so redelivered or out-of-order
+    events are harmless.
+    """
+
+    HANDLERS = {
+        "checkout.session.completed": "_session_completed",
+        "checkout.session.async_payment_succeeded": "_session_paid",
+        "checkout.session.async_payment_failed": "_session_failed",
+        "checkout.session.expired": "_session_expired",
+    }
+
+    def __init__(
+        self,
+        executor: BackgroundStorageExecutor = None,
+        counter_service: CartCounterService = None,
+    ):
+        self._executor = executor
+        self.counters = counter_service or CartCounterService()
+
+    @property
+    def is_async(self) -> bool:
+        return getattr(settings, "STRIPE_WEBHOOK_ASYNC", True)
+
+    def verify(self, payload: bytes, signature: str) -> dict:
+        """
+        Check the Stripe-Signature header and return the decoded event.
+        Raises ValueError or stripe.error.SignatureVerificationError.
+        """
+        secret = getattr(settings, "STRIPE_WEBHOOK_SECRET", "")
+        if not secret:
+            raise ValueError("STRIPE_WEBHOOK_SECRET is not configured")
+        stripe.Webhook.construct_event(payload, signature, secret)
+        return json.loads(payload)
+
+    def receive(self, event: dict) -> StripeEvent:
+        """Store event and schedule it unless it was already processed."""
+        record, created = StripeEvent.objects.get_or_create(
+            stripe_event_id=event["id"],
+            defaults={"type": event["type"], "payload": event},
+        )
+        if created or record.status != StripeEvent.EventStatus.PROCESSED:
+            self.schedule(record.pk)
+        else:
+            logger.info(f"Ignoring duplicate Stripe event {record.stripe_event_id}")
+        return record
+
+    def schedule(self, pk) -> None:
+        if not self.is_async:
+            self.process(pk)
+            return
+        executor = self._executor or get_storage_executor()
+        transaction.on_commit(
+            lambda: executor.submit(
+                lambda: self.process(pk), description=f"Stripe event {pk}"
+            )
+        )
+
+    def process(self, pk) -> None:
+        """Apply one stored event; raises on failure so the caller can retry."""
+        error = None
+        with transaction.atomic():
+            record = StripeEvent.objects.select_for_update().get(pk=pk)
+            if record.status == StripeEvent.EventStatus.PROCESSED:
+                return
+            try:
+                with transaction.atomic():
+                    self.handle(record.type, record.payload["data"]["object"])
+            except Exception as exc:
+                error = exc
+            record.attempts += 1
+            if error is None:
+                record.status = StripeEvent.EventStatus.PROCESSED
+                record.processed_at = timezone.now()
+                record.last_error = ""
+            else:
+                record.status = StripeEvent.EventStatus.FAILED
+                record.last_error = str(error)
+            record.save(
+                update_fields=["status", "attempts", "processed_at", "last_error"]
+            )
+        if error is not None:
+            raise error
+
+    def process_pending(self) -> int:
+        """Process every stored event that has not succeeded yet."""
+        processed = 0
+        pending = StripeEvent.objects.exclude(
+            status=StripeEvent.EventStatus.PROCESSED
+        ).values_list("pk", flat=True)
+        for pk in pending:
+            try:
+                self.process(pk)
+                processed += 1
+            except Exception:
+                logger.exception(f"Stripe event {pk} failed again")
+        return processed
+
+    def handle(self, event_type: str, session: dict) -> None:
+        handler = self.HANDLERS.get(event_type)
+        if handler is None:
+            logger.debug(f"Unhandled Stripe event type {event_type}")
+            return
+        getattr(self, handler)(session)
+
+    def _session_completed(self, session: dict) -> None:
+        # Delayed payment methods complete the session before the money arrives
+        if session.get("payment_status") in ("paid", "no_payment_required"):
+            self._session_paid(session)
+
+    def _session_paid(self, session: dict) -> None:
+        payment_intent = session_payment_intent(session)
+        updated = (
+            self._payments(session)
+            .exclude(status=Payment.PaymentStatus.SUCCEEDED)
+            .update(
+                status=Payment.PaymentStatus.SUCCEEDED,
+                stripe_payment_intent=(payment_intent or F("stripe_payment_intent")),
+                updated_at=timezone.now(),
+            )
+        )
+        if updated:
+            self._clear_cart(session)
+            logger.info(f"Payment for session {session['id']} succeeded")
+
+    def _session_failed(self, session: dict) -> None:
+        self._move_pending(session, Payment.PaymentStatus.FAILED)
+
+    def _session_expired(self, session: dict) -> None:
+        self._move_pending(session, Payment.PaymentStatus.CANCELED)
+
+    def _move_pending(self, session: dict, status: str) -> None:
+        self._payments(session).filter(status=Payment.PaymentStatus.PENDING).update(
+            status=status, updated_at=timezone.now()
+        )
+
+    def _payments(self, session: dict):
+        payments = Payment.objects.filter(stripe_session_id=session["id"])
+        if not payments.exists():
+            # The checkout request may not have committed yet; retry later
+            raise Payment.DoesNotExist(f"No payment for session {session['id']}")
+        return payments
+
+    def _clear_cart(self, session: dict) -> None:
+        """Remove the purchased items, keeping anything added since checkout."""
+        user_id, item_ids = purchased_items(session)
+        if not user_id:
+            return
+        items = CartItem.objects.filter(user_id=user_id)
+        if item_ids is not None:
+            items = items.filter(id__in=item_ids)
+        deleted, _details = items.delete()
+        if deleted:
+            self.counters.invalidate_users([user_id])
+            logger.info(f"Cleared {deleted} cart items for user {user_id}")
+
+
+def purchased_items(session: dict) -> Tuple[Optional[str], Optional[List[str]]]:
+    """
+    The user and cart item IDs recorded on a Checkout Session; the IDs are
+    None when the session does not list them.
+    """
+    metadata = session.get("metadata") or {}
+    user_id = metadata.get("user_id") or session.get("client_reference_id")
+    return user_id, _split_ids(metadata.get("cart_items"))
+
+
+def session_payment_intent(session: dict) -> Optional[str]:
+    return _object_id(session.get("payment_intent"))
+
+
+def _object_id(value) -> Optional[str]:
+    # Expandable fields are either an ID or the expanded object
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def _split_ids(value: Optional[str]) -> Optional[list]:
+    if not value:
+        return None
+    return [item_id for item_id in value.split(",") if item_id]
@@ -0,0 +1,167 @@
+import threading
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.test import TestCase
+from cart.services.cart_service import CartService
+from core.services.storage_tasks import BackgroundStorageExecutor
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from mentorship_session.factory_boy.mentorship_factory import (
+    MentorshipSessionFactory,
+)
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+from microservices.models import MicroService
+from payments.models import StripePrice
+from payments.services.checkout_builder import CheckoutBuilder
+
+
+class CheckoutBuilderTest(TestCase):
+    """Tests for checkout line items built from cached Stripe Prices"""
+
+    def setUp(self):
+        """Fill a cart and stub the image services"""
+        self.category = CategoryFactory()
+        self.user = UserFactory()
+        freelancer = FreelancerProfileFactory()
+        self.service = MicroServiceFactory(
+            category=self.category,
+            freelancer=freelancer,
+            price=Decimal("20.00"),
+            image_path=None,
+        )
+        self.session = MentorshipSessionFactory(
+            mentor=freelancer, duration_minutes=10, image_path=None
+        )
+        cart = CartService()
+        cart.add_to_cart(self.user, self.service, quantity=2)
+        cart.add_to_cart(self.user, self.session)
+
+        image_service = MagicMock()
+        image_service.get_image_urls.return_value = {}
+        image_service.get_image_url.return_value = "/static/default.png"
+        self.image_service = image_service
+        self.builder = CheckoutBuilder(
+            image_services={
+                MicroService: image_service,
+                type(self.session): image_service,
+            }
+        )
+
+    def _cache_price(self, spec, price_id):
+        StripePrice.objects.create(
+            content_type_id=spec.content_type_id,
+            object_id=spec.object_id,
+            version=spec.version,
+            unit_amount=spec.unit_amount,
+            currency=spec.currency,
+            stripe_product_id="prod_1",
+            stripe_price_id=price_id,
+        )
+
+    def test_uncached_lines_use_inline_price_data(self):
+        """Test that lines without a cached Price are sent inline"""
+        # Act
+        plan = self.builder.build(self.user)
+
+        # Assert
+        self.assertEqual(plan.total, Decimal("65.00"))
+        self.assertEqual(len(plan.uncached), 2)
+        amounts = sorted(line["price_data"]["unit_amount"] for line in plan.line_items)
+        self.assertEqual(amounts, [2000, 2500])
+
+    def test_cached_price_is_referenced_by_id(self):
+        """Test that a matching price version reuses the Stripe Price ID"""
+        # Arrange
+        spec = next(
+            s for s in self.builder.build(self.user).uncached if s.unit_amount == 2000
+        )
+        self._cache_price(spec, "price_cached")
+
+        # Act
+        plan = self.builder.build(self.user)
+
+        # Assert
+        self.assertIn({"price": "price_cached", "quantity": 2}, plan.line_items)
+        self.assertEqual(len(plan.uncached), 1)
+
+    def test_changed_price_gets_a_new_version(self):
+        """Test that editing the price does not reuse the stale Stripe Price"""
+        # Arrange
+        for spec in self.builder.build(self.user).uncached:
+            self._cache_price(spec, f"price_{spec.unit_amount}")
+        MicroService.objects.filter(pk=self.service.pk).update(price=Decimal("30.00"))
+
+        # Act
+        plan = self.builder.build(self.user)
+
+        # Assert
+        self.assertEqual([spec.unit_amount for spec in plan.uncached], [3000])
+
+    def test_build_runs_constant_queries_and_one_image_batch(self):
+        """Test that building a plan costs a fixed number of queries"""
+        # Arrange
+        for _ in range(4):
+            CartService().add_to_cart(
+                self.user,
+                MicroServiceFactory(
+                    category=self.category,
+                    freelancer=self.service.freelancer,
+                    price=Decimal("1.00"),
+                    image_path="a.png",
+                ),
+            )
+
+        # Act
+        with self.assertNumQueries(4):  # items, two object types, price cache
+            self.builder.build(self.user)
+
+        # Assert
+        self.image_service.get_image_urls.assert_called()
+        self.assertLessEqual(self.image_service.get_image_urls.call_count, 2)
+
+    @patch("payments.services.checkout_builder.stripe")
+    def test_sync_prices_records_stripe_ids(self, stripe_mock):
+        """Test that missing Prices are created once and stored"""
+        # Arrange
+        stripe_mock.Product.create.return_value = MagicMock(id="prod_new")
+        stripe_mock.Price.create.side_effect = [
+            MagicMock(id="price_a"),
+            MagicMock(id="price_b"),
+        ]
+        plan = self.builder.build(self.user)
+
+        # Act
+        self.builder.sync_prices(plan.uncached)
+        self.builder.sync_prices(plan.uncached)
+
+        # Assert
+        self.assertEqual(StripePrice.objects.count(), 2)
+        self.assertEqual(stripe_mock.Price.create.call_count, 2)
+        self.assertTrue(
+            all(
+                "idempotency_key" in c.kwargs
+                for c in stripe_mock.Price.create.mock_calls
+            )
+        )
+
+    def test_price_sync_is_skipped_when_executor_is_saturated(self):
+        """Test that a full Stripe pool drops the sync instead of running it inline"""
+        # Arrange
+        executor = BackgroundStorageExecutor(
+            max_workers=1, max_pending=1, inline_when_full=False
+        )
+        release = threading.Event()
+        self.addCleanup(release.set)
+        executor.submit(release.wait)
+        builder = CheckoutBuilder(
+            image_services=self.builder.image_services, executor=executor
+        )
+        plan = builder.build(self.user)
+
+        # Act
+        with patch.object(builder, "sync_prices") as sync_prices:
+            builder.schedule_price_sync(plan)
+
+        # Assert
+        sync_prices.assert_not_called()
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from cart.services.cart_service import CartService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+from payments.models import Payment, StripePrice
+from payments.services.checkout_builder import CheckoutBuilder, CheckoutPlan
+from payments.services.stripe_client import StripeUnavailableError
+
+
+def fake_session(session_id):
+    session = MagicMock()
+    session.id = session_id
+    session.url = f"https://checkout.stripe.com/c/pay/{session_id}"
+    session.payment_intent = None
+    return session
+
+
+@patch("payments.services.checkout_builder.CheckoutBuilder.schedule_price_sync")
+@patch(
+    "payments.services.checkout_builder.CheckoutBuilder._image_urls", return_value={}
+)
+@patch("payments.services.checkout_sessions.stripe.checkout.Session.create")
+class CheckoutSessionReuseTest(TestCase):
+    """Tests for reusing open Checkout Sessions for an unchanged cart"""
+
+    def setUp(self):
+        """Log in a user with one microservice in the cart"""
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+        self.service = MicroServiceFactory(
+            category=CategoryFactory(),
+            freelancer=FreelancerProfileFactory(),
+            price=Decimal("20.00"),
+            image_path=None,
+        )
+        self.cart = CartService()
+        self.cart.add_to_cart(self.user, self.service)
+        self.url = reverse("payments:checkout")
+
+    def test_second_checkout_reuses_open_session(self, create, *_):
+        """An unchanged cart is redirected to the existing session"""
+        # Arrange
+        create.return_value = fake_session("cs_1")
+        self.client.post(self.url)
+
+        # Act
+        response = self.client.post(self.url)
+
+        # Assert
+        self.assertEqual(create.call_count, 1)
+        self.assertRedirects(
+            response, create.return_value.url, fetch_redirect_response=False
+        )
+        self.assertEqual(Payment.objects.filter(user=self.user).count(), 1)
+
+    def test_changed_cart_creates_new_session(self, create, *_):
+        """A different quantity produces a new fingerprint and session"""
+        # Arrange
+        create.side_effect = [fake_session("cs_1"), fake_session("cs_2")]
+        self.client.post(self.url)
+        self.cart.add_to_cart(self.user, self.service)
+
+        # Act
+        self.client.post(self.url)
+
+        # Assert
+        self.assertEqual(create.call_count, 2)
+        first, second = Payment.objects.filter(user=self.user).order_by("created_at")
+        self.assertNotEqual(first.cart_fingerprint, second.cart_fingerprint)
+
+    def test_expiring_session_is_not_reused(self, create, *_):
+        """Sessions about to expire are replaced instead of reused"""
+        # Arrange
+        create.side_effect = [fake_session("cs_1"), fake_session("cs_2")]
+        self.client.post(self.url)
+        Payment.objects.update(expires_at=timezone.now() + timedelta(seconds=30))
+
+        # Act
+        self.client.post(self.url)
+
+        # Assert
+        self.assertEqual(create.call_count, 2)
+
+    @patch("payments.services.checkout_sessions.time.time", return_value=1_000_000)
+    def test_same_session_from_stripe_is_recorded_once(self, _time, create, *_):
+        """A racing request that gets the same session back reuses its Payment"""
+        # Arrange
+        create.return_value = fake_session("cs_1")
+        self.client.post(self.url)
+        # Hide the payment from the reuse lookup, as a concurrent request would
+        Payment.objects.update(expires_at=timezone.now())
+
+        # Act
+        response = self.client.post(self.url)
+
+        # Assert
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Payment.objects.filter(user=self.user).count(), 1)
+        first_key = create.call_args_list[0].kwargs["idempotency_key"]
+        self.assertEqual(create.call_args_list[1].kwargs["idempotency_key"], first_key)
+
+    @patch("payments.services.checkout_sessions.time.time", return_value=1_000_000)
+    def test_retry_with_cached_prices_uses_new_key(self, _time, create, *_):
+        """Line items that now reference cached Prices get their own key"""
+        # Arrange
+        create.side_effect = [fake_session("cs_1"), fake_session("cs_2")]
+        self.client.post(self.url)
+        Payment.objects.filter(user=self.user).update(
+            status=Payment.PaymentStatus.FAILED
+        )
+        spec = CheckoutBuilder().build(self.user).uncached[0]
+        StripePrice.objects.create(
+            content_type_id=spec.content_type_id,
+            object_id=spec.object_id,
+            version=spec.version,
+            unit_amount=spec.unit_amount,
+            currency=spec.currency,
+            stripe_product_id="prod_1",
+            stripe_price_id="price_1",
+        )
+
+        # Act
+        self.client.post(self.url)
+
+        # Assert
+        first, second = (c.kwargs for c in create.call_args_list)
+        self.assertEqual(second["line_items"], [{"price": "price_1", "quantity": 1}])
+        self.assertNotEqual(first["idempotency_key"], second["idempotency_key"])
+
+    @override_settings(
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+    )
+    def test_unavailable_stripe_shows_fallback_page(self, create, *_):
+        """An open Stripe breaker renders the payments unavailable page"""
+        # Arrange
+        create.side_effect = StripeUnavailableError("down", should_retry=False)
+
+        # Act
+        response = self.client.post(self.url)
+
+        # Assert
+        self.assertEqual(response.status_code, 503)
+        self.assertTemplateUsed(response, "payments/unavailable.html")
+        self.assertFalse(Payment.objects.exists())
+
+
+class CheckoutPlanFingerprintTest(TestCase):
+    """Tests for the cart fingerprint of a checkout plan"""
+
+    def test_fingerprint_ignores_item_order(self):
+        """The fingerprint depends on contents, not ordering"""
+        # Arrange
+        a = MagicMock(id=1, quantity=1, unit_price=Decimal("5.00"))
+        b = MagicMock(id=2, quantity=3, unit_price=Decimal("7.00"))
+
+        # Act / Assert
+        self.assertEqual(
+            CheckoutPlan(cart_items=[a, b]).fingerprint,
+            CheckoutPlan(cart_items=[b, a]).fingerprint,
+        )
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.test import TestCase
+from cart.models import CartItem
+from cart.services.cart_service import CartService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+from payments.factory_boy.payment_factory import PaymentFactory
+from payments.models import Payment, ReconciliationCheckpoint
+from payments.services.reconciliation import PaymentReconciler
+
+NOW = datetime(2025, 1, 10, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def session(session_id, status, payment_status="unpaid", created=NOW, **extra):
+    return {
+        "id": session_id,
+        "status": status,
+        "payment_status": payment_status,
+        "created": int(created.timestamp()),
+        "payment_intent": None,
+        "metadata": {},
+        **extra,
+    }
+
+
+def listing(*sessions):
+    result = MagicMock()
+    result.auto_paging_iter.return_value = iter(sessions)
+    return result
+
+
+@patch("payments.services.reconciliation.stripe.checkout.Session.list")
+class PaymentReconcilerTest(TestCase):
+    """Tests for reconciling payments with Stripe Checkout Sessions"""
+
+    def setUp(self):
+        """Create a user with pending payments"""
+        self.user = UserFactory()
+        self.paid = PaymentFactory(
+            user=self.user, stripe_session_id="cs_paid", status="pending"
+        )
+        self.expired = PaymentFactory(
+            user=self.user, stripe_session_id="cs_expired", status="pending"
+        )
+        self.reconciler = PaymentReconciler(batch_size=1)
+
+    def test_bulk_updates_settled_sessions(self, session_list):
+        """Paid and expired sessions update their pending payments"""
+        # Arrange
+        session_list.return_value = listing(
+            session("cs_paid", "complete", "paid", payment_intent="pi_1"),
+            session("cs_expired", "expired"),
+            session("cs_unknown", "complete", "paid"),
+        )
+
+        # Act
+        result = self.reconciler.run(until=NOW)
+
+        # Assert
+        self.paid.refresh_from_db()
+        self.expired.refresh_from_db()
+        self.assertEqual(self.paid.status, Payment.PaymentStatus.SUCCEEDED)
+        self.assertEqual(self.paid.stripe_payment_intent, "pi_1")
+        self.assertEqual(self.expired.status, Payment.PaymentStatus.CANCELED)
+        self.assertEqual((result.sessions, result.matched, result.updated), (3, 2, 2))
+
+    def test_settled_payments_are_not_downgraded(self, session_list):
+        """A succeeded payment stays succeeded even if its session expired"""
+        # Arrange
+        Payment.objects.filter(pk=self.expired.pk).update(status="succeeded")
+        session_list.return_value = listing(session("cs_expired", "expired"))
+
+        # Act
+        self.reconciler.run(until=NOW)
+
+        # Assert
+        self.expired.refresh_from_db()
+        self.assertEqual(self.expired.status, Payment.PaymentStatus.SUCCEEDED)
+
+    def test_checkpoint_stops_at_oldest_open_session(self, session_list):
+        """The next run resumes from the oldest session that can still change"""
+        # Arrange
+        open_created = NOW - timedelta(hours=3)
+        session_list.return_value = listing(
+            session("cs_paid", "complete", "paid"),
+            session("cs_open", "open", created=open_created),
+        )
+
+        # Act
+        self.reconciler.run(until=NOW)
+        session_list.return_value = listing()
+        self.reconciler.run(until=NOW + timedelta(hours=1))
+
+        # Assert
+        checkpoint = ReconciliationCheckpoint.objects.get()
+        self.assertEqual(checkpoint.cursor, NOW + timedelta(hours=1))
+        second_window = session_list.call_args_list[1].kwargs["created"]
+        self.assertEqual(second_window["gte"], int(open_created.timestamp()))
+
+    def test_failed_delayed_payment_is_final(self, session_list):
+        """Complete but unpaid sessions fail unless their payment is processing"""
+        # Arrange
+        processing = PaymentFactory(
+            user=self.user, stripe_session_id="cs_processing", status="pending"
+        )
+        failed_created = NOW - timedelta(hours=3)
+        processing_created = NOW - timedelta(hours=1)
+        session_list.return_value = listing(
+            session(
+                "cs_paid",
+                "complete",
+                created=failed_created,
+                payment_intent={"id": "pi_1", "status": "requires_payment_method"},
+            ),
+            session(
+                "cs_processing",
+                "complete",
+                created=processing_created,
+                payment_intent={"id": "pi_2", "status": "processing"},
+            ),
+        )
+
+        # Act
+        result = self.reconciler.run(until=NOW)
+
+        # Assert
+        self.paid.refresh_from_db()
+        processing.refresh_from_db()
+        self.assertEqual(self.paid.status, Payment.PaymentStatus.FAILED)
+        self.assertEqual(processing.status, Payment.PaymentStatus.PENDING)
+        self.assertEqual(result.cursor, processing_created)
+
+    def test_dry_run_changes_nothing(self, session_list):
+        """A dry run reports changes without saving them or the checkpoint"""
+        # Arrange
+        session_list.return_value = listing(session("cs_paid", "complete", "paid"))
+
+        # Act
+        result = self.reconciler.run(until=NOW, dry_run=True)
+
+        # Assert
+        self.paid.refresh_from_db()
+        self.assertEqual(result.updated, 1)
+        self.assertEqual(self.paid.status, Payment.PaymentStatus.PENDING)
+        self.assertFalse(ReconciliationCheckpoint.objects.exists())
+
+    def test_paid_sessions_clear_purchased_items(self, session_list):
+        """Cart items listed on a paid session are removed"""
+        # Arrange
+        service = MicroServiceFactory(
+            category=CategoryFactory(),
+            freelancer=FreelancerProfileFactory(),
+            price=Decimal("10.00"),
+            image_path=None,
+        )
+        item = CartService().add_to_cart(self.user, service)
+        metadata = {"user_id": str(self.user.id), "cart_items": str(item.id)}
+        session_list.return_value = listing(
+            session("cs_paid", "complete", "paid", metadata=metadata)
+        )
+
+        # Act
+        self.reconciler.run(until=NOW)
+
+        # Assert
+        self.assertFalse(CartItem.objects.filter(user=self.user).exists())
@@ -0,0 +1,47 @@
+from unittest.mock import Mock
+from django.test import TestCase
+import requests
+import stripe
+from core.http import CircuitBreaker
+from payments.services.stripe_client import (
+    CircuitBreakingRequestsClient,
+    StripeUnavailableError,
+)
+
+
+class CircuitBreakingRequestsClientTest(TestCase):
+    """Tests for the Stripe HTTP client behind a circuit breaker"""
+
+    def setUp(self):
+        """Client on a mocked session with a breaker that opens at once"""
+        self.session = Mock()
+        self.breaker = CircuitBreaker("stripe", failure_threshold=1)
+        self.client = CircuitBreakingRequestsClient(
+            breaker=self.breaker, session=self.session, timeout=(1, 2)
+        )
+
+    def test_connection_errors_open_the_breaker(self):
+        """Test that later requests fail fast without touching the network"""
+        # Arrange
+        self.session.request.side_effect = requests.exceptions.ConnectTimeout()
+        with self.assertRaises(stripe.error.APIConnectionError):
+            self.client.request("get", "https://api.stripe.com/v1/prices", {})
+
+        # Act / Assert
+        with self.assertRaises(StripeUnavailableError):
+            self.client.request("get", "https://api.stripe.com/v1/prices", {})
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_uses_shared_session_and_timeout(self):
+        """Test that requests go through the given session with its timeout"""
+        # Arrange
+        self.session.request.return_value = Mock(
+            content=b"{}", status_code=200, headers={}
+        )
+
+        # Act
+        self.client.request("get", "https://api.stripe.com/v1/prices", {})
+
+        # Assert
+        self.assertEqual(self.session.request.call_args.kwargs["timeout"], (1, 2))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
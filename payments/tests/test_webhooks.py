@@ -0,0 +1,168 @@
+import hashlib
+import hmac
+import json
+import time
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from cart.models import CartItem
+from cart.services.cart_service import CartService
+from core.factory_boy.freelancer_factory import FreelancerProfileFactory
+from core.factory_boy.user_factory import UserFactory
+from microservices.factory_boy.category_factory import CategoryFactory
+from microservices.factory_boy.microservice_factory import MicroServiceFactory
+from payments.factory_boy.payment_factory import PaymentFactory
+from payments.models import Payment, StripeEvent
+from payments.services.webhook_service import StripeWebhookService
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SECRET = "whsec_test"
+
+
+def load_event(name, **session):
+    event = json.loads((FIXTURES / f"{name}.json").read_text())
+    event["data"]["object"].update(session)
+    return event
+
+
+def sign(payload: bytes, secret: str = SECRET) -> str:
+    """Build a Stripe-Signature header the way Stripe does."""
+    timestamp = int(time.time())
+    signed = f"{timestamp}.".encode() + payload
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET, STRIPE_WEBHOOK_ASYNC=False)
+class StripeWebhookTest(TestCase):
+    """Tests for the Stripe webhook endpoint and event processing"""
+
+    def setUp(self):
+        """Create a pending payment for a cart with one microservice"""
+        self.user = UserFactory()
+        service = MicroServiceFactory(
+            category=CategoryFactory(),
+            freelancer=FreelancerProfileFactory(),
+            price=Decimal("20.00"),
+            image_path=None,
+        )
+        self.item = CartService().add_to_cart(self.user, service)
+        self.payment = PaymentFactory(
+            user=self.user,
+            stripe_session_id="cs_test_a1b2c3",
+            stripe_payment_intent=None,
+            status=Payment.PaymentStatus.PENDING,
+        )
+        self.url = reverse("payments:webhook")
+        self.metadata = {"user_id": str(self.user.id), "cart_items": str(self.item.id)}
+
+    def post_event(self, event, signature=None):
+        payload = json.dumps(event).encode()
+        return self.client.post(
+            self.url,
+            data=payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature or sign(payload),
+        )
+
+    def test_completed_session_marks_payment_succeeded(self):
+        """A paid session completes the payment and clears the purchased items"""
+        # Arrange
+        event = load_event("checkout_session_completed", metadata=self.metadata)
+
+        # Act
+        response = self.post_event(event)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.PaymentStatus.SUCCEEDED)
+        self.assertEqual(self.payment.stripe_payment_intent, "pi_3QtestIntent")
+        self.assertFalse(CartItem.objects.filter(user=self.user).exists())
+        self.assertEqual(StripeEvent.objects.get().status, "processed")
+
+    def test_invalid_signature_is_rejected(self):
+        """Events signed with another secret are not stored"""
+        # Arrange
+        event = load_event("checkout_session_completed", metadata=self.metadata)
+        payload = json.dumps(event).encode()
+
+        # Act
+        response = self.post_event(event, signature=sign(payload, "whsec_other"))
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StripeEvent.objects.exists())
+
+    def test_redelivered_event_is_applied_once(self):
+        """A duplicate delivery does not touch the payment again"""
+        # Arrange
+        event = load_event("checkout_session_completed", metadata=self.metadata)
+        counters = MagicMock()
+        service = StripeWebhookService(counter_service=counters)
+        service.receive(event)
+
+        # Act
+        service.receive(event)
+
+        # Assert
+        self.assertEqual(StripeEvent.objects.count(), 1)
+        counters.invalidate_users.assert_called_once()
+
+    def test_expired_session_does_not_cancel_paid_payment(self):
+        """An expiry arriving after success leaves the payment succeeded"""
+        # Arrange
+        self.post_event(
+            load_event("checkout_session_completed", metadata=self.metadata)
+        )
+
+        # Act
+        self.post_event(load_event("checkout_session_expired", metadata=self.metadata))
+
+        # Assert
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.PaymentStatus.SUCCEEDED)
+
+    def test_event_for_unknown_session_can_be_retried(self):
+        """Events arriving before their payment are kept for a retry"""
+        # Arrange
+        event = load_event("checkout_session_expired", id="cs_test_unknown")
+        service = StripeWebhookService()
+
+        # Act
+        with self.assertRaises(Payment.DoesNotExist):
+            service.receive(event)
+        PaymentFactory(
+            user=self.user, stripe_session_id="cs_test_unknown", status="pending"
+        )
+        processed = service.process_pending()
+
+        # Assert
+        record = StripeEvent.objects.get()
+        self.assertEqual(processed, 1)
+        self.assertEqual((record.status, record.attempts), ("processed", 2))
+
+    @override_settings(
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+    )
+    def test_success_page_reads_local_state(self):
+        """The success page shows the stored payment without calling Stripe"""
+        # Arrange
+        self.client.force_login(self.user)
+
+        # Act
+        response = self.client.get(
+            reverse("payments:success"), {"session_id": "cs_test_a1b2c3"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["payment"], self.payment)
+        self.assertContains(response, "confirming your payment")
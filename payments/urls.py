@@ -1,5 +1,10 @@
 from django.urls import path
-from .views import CreateCheckoutSessionView, PaymentSuccessView, PaymentCancelView
+from .views import (
+    CreateCheckoutSessionView,
+    PaymentSuccessView,
+    PaymentCancelView,
+    StripeWebhookView,
+)
 
 app_name = "payments"
 
@@ -7,4 +12,5 @@ urlpatterns = [
     path("checkout/", CreateCheckoutSessionView.as_view(), name="checkout"),
     path("success/", PaymentSuccessView.as_view(), name="success"),
     path("cancel/", PaymentCancelView.as_view(), name="cancel"),
+    path("webhook/", StripeWebhookView.as_view(), name="webhook"),
 ]
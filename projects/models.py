@@ -36,6 +36,11 @@ class Project(models.Model):
         image_service = ProjectImageService()
         return image_service.get_image_url(self.image_path)
 
+    def get_image_set(self):
+        """Return card/detail/placeholder URLs for srcset-capable templates."""
+        image_service = ProjectImageService()
+        return image_service.get_image_set(self.image_path)
+
 
 class ProjectAssignment(models.Model):
     class ProjectAssignmentStatus(models.TextChoices):
@@ -105,4 +110,4 @@ class ProjectApplication(models.Model):
         verbose_name_plural = _("project applications")
 
     def __str__(self):
-        return f"Application from {self.freelancer.user.email} to {self.project.title} ({self.get_status_display()})"
\ No newline at end of file
+        return f"Application from {self.freelancer.user.email} to {self.project.title} ({self.get_status_display()})"
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core.services.image_pipeline import ImageRenditionPipeline
+from core.storage.local_storage import LocalStorage
+from projects.factory_boy.project_factory import ProjectFactory
+from projects.models import Project
+from projects.services.image_service import ProjectImageService
+from projects.views.views import ProjectListView
+
+
+@override_settings(
+    PROFILE_STORAGE_TYPE="local",
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+)
+class ProjectListViewTest(TestCase):
+    """Tests for the project cards on the public project list"""
+
+    def setUp(self):
+        """Local storage holding one processed image and its renditions"""
+        pipeline = ImageRenditionPipeline()
+        self.image_path = "project_card-rv1.jpg"
+        for path in pipeline.all_paths(f"projects/{self.image_path}"):
+            default_storage.save(path, ContentFile(b"img"))
+        self.image_service = patch.object(
+            ProjectListView, "image_service", ProjectImageService(LocalStorage())
+        )
+        self.image_service.start()
+        self.addCleanup(self.image_service.stop)
+
+    def test_cards_render_image_sets(self):
+        """Test that project cards get a src and srcset, or the placeholder"""
+        # Arrange
+        ProjectFactory(status=Project.ProjectStatus.CREATED, image_path=self.image_path)
+        ProjectFactory(status=Project.ProjectStatus.CREATED, image_path=None)
+
+        # Act
+        response = self.client.get(reverse("projects:projects_list"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'src=""')
+        self.assertContains(response, "project_card-rv1_card.webp 480w")
+        self.assertContains(response, 'src="/static/core/images/default_project.png"')
@@ -12,6 +12,7 @@ from django.views import View
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from core.mixins import ProfileRequiredMixin
+from core.services.storage_tasks import ImageUploadScheduler
 from ..models import Project, ProjectAssignment, ProjectApplication
 from ..repositories.project_repository import (
     ProjectRepository,
@@ -51,6 +52,7 @@ class ProjectListView(SearchFilterMixin, ListView):
     category_field = None
     paginate_by = 12
     ordering = ["-created_at"]
+    image_service = ProjectImageService()
 
     def get_queryset(self):
         qs = project_service.list_projects()
@@ -66,6 +68,8 @@ class ProjectListView(SearchFilterMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Resolve the page's image URLs in one batch so each card hits the cache
+        self.image_service.get_image_sets(p.image_path for p in context["projects"])
         user = self.request.user
         is_owner_map = {}
         has_applied_map = {}
@@ -103,6 +107,7 @@ class ProjectCreateView(ProfileRequiredMixin, CreateView):
     template_name = "projects/project_form.html"
     success_url = reverse_lazy("projects:projects_client_list")
     image_service = ProjectImageService()
+    upload_scheduler = ImageUploadScheduler()
 
     def form_valid(self, form):
         client_profile = self.request.user.client_profile
@@ -111,10 +116,17 @@ class ProjectCreateView(ProfileRequiredMixin, CreateView):
 
         image_file = self.request.FILES.get("image")
         if image_file:
-            filename = self.image_service.upload_project_image(self.object.id, image_file)
-            # Assign only filename - field's upload_to handles the directory
-            self.object.image_path = filename
-            self.object.save()
+            project = self.object
+            # Stored filename is written to image_path once the upload finishes
+            self.upload_scheduler.schedule(
+                project,
+                "image_path",
+                image_file,
+                upload=lambda f: self.image_service.upload_project_image(
+                    project.id, f
+                ),
+                validate=self.image_service.validate_image,
+            )
 
         return redirect(
             reverse(
@@ -135,20 +147,26 @@ class ProjectUpdateView(ProfileRequiredMixin, UpdateView):
     template_name = "projects/project_form.html"
     success_url = reverse_lazy("projects:projects_list")
     image_service = ProjectImageService()
+    upload_scheduler = ImageUploadScheduler()
 
     def form_valid(self, form):
-        project = form.save(commit=False)
+        project = form.save()
 
         image_file = self.request.FILES.get("image")
         if image_file:
-            if project.image_path:
-                self.image_service.delete_project_image(project.image_path)
-
-            filename = self.image_service.upload_project_image(project.id, image_file)
-            # Assign only filename - field's upload_to handles the directory
-            project.image_path = filename
+            # Saved first so the finished upload is not overwritten by the form.
+            # The old image is deleted only after the new one is in place.
+            self.upload_scheduler.schedule(
+                project,
+                "image_path",
+                image_file,
+                upload=lambda f: self.image_service.upload_project_image(
+                    project.id, f
+                ),
+                delete=self.image_service.delete_project_image,
+                validate=self.image_service.validate_image,
+            )
 
-        project.save()
         return redirect(reverse("projects:projects_list"))
 
     def get_context_data(self, **kwargs):